@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the solver's hot functions.
+
+Each benchmark is timed over representative game states (opening,
+mid-game with about 1000 candidates, end-game with about 10), results are
+written as JSON, and can be compared against a stored baseline. A second
+group times filtering, pattern codes and solve() at every supported word
+length on synthetic word lists.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Sequence
+
+from patterns import format_feedback, get_pattern_code, pattern_codes
+from wordle_solver import WordleSolver
+
+# Representative constraint states, as keyword arguments for filter_words()/solve()
+STATES = {
+    "opening": {},
+    # After LARES came back all gray: 1001 candidates on the default list
+    "midgame": {"incorrect_letters": ["l", "a", "r", "e", "s"]},
+    # ...and PUDGY came back gray-gray-green-gray-green: 10 candidates
+    "endgame": {
+        "correct_positions": {2: "d", 4: "y"},
+        "incorrect_letters": ["l", "a", "r", "e", "s", "p", "u", "g"],
+    },
+}
+
+
+# Word lengths covered by the per-length benchmarks
+LENGTHS = (4, 5, 6, 7, 8)
+# Size of the synthetic word list generated for each length
+SYNTHETIC_WORDS = 3000
+# Approximate English letter frequencies (percent), used to draw synthetic words
+_LETTER_WEIGHTS = {
+    "a": 8.2, "b": 1.5, "c": 2.8, "d": 4.3, "e": 12.7, "f": 2.2, "g": 2.0,
+    "h": 6.1, "i": 7.0, "j": 0.2, "k": 0.8, "l": 4.0, "m": 2.4, "n": 6.7,
+    "o": 7.5, "p": 1.9, "q": 0.1, "r": 6.0, "s": 6.3, "t": 9.1, "u": 2.8,
+    "v": 1.0, "w": 2.4, "x": 0.2, "y": 2.0, "z": 0.1,
+}
+
+
+def synthetic_words(word_length: int, count: int = SYNTHETIC_WORDS) -> List[str]:
+    """Deterministic list of distinct pseudo-words with English letter frequencies."""
+    rng = random.Random(word_length)
+    letters = list(_LETTER_WEIGHTS)
+    weights = list(_LETTER_WEIGHTS.values())
+    words: Dict[str, None] = {}
+    while len(words) < count:
+        words["".join(rng.choices(letters, weights, k=word_length))] = None
+    return list(words)
+
+
+def time_call(func: Callable[[], object], repeat: int, min_time: float) -> Dict[str, float]:
+    """
+    Time a callable, timeit-style.
+
+    The number of calls per sample is doubled until one sample takes at
+    least min_time, then repeat samples are taken.
+
+    Returns:
+        Per-call seconds: best and median sample, plus calls per sample
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "number": number,
+    }
+
+
+def build_benchmarks(solver: WordleSolver, words_file: str) -> Dict[str, Callable[[], object]]:
+    """Create the named benchmark callables for a loaded solver."""
+    benchmarks: Dict[str, Callable[[], object]] = {
+        "load_words": lambda: solver._load_words(words_file),
+    }
+    for state, constraints in STATES.items():
+        possible = solver.filter_words(**constraints)
+        guess = possible[0]
+        answers = possible[:1000]
+        benchmarks[f"filter_words[{state}]"] = (
+            lambda constraints=constraints: solver.filter_words(**constraints)
+        )
+        benchmarks[f"get_guess_pattern[{state}]"] = (
+            lambda guess=guess, answers=answers: [
+                solver._get_guess_pattern(guess, answer) for answer in answers
+            ]
+        )
+        benchmarks[f"calculate_elimination_score[{state}]"] = (
+            lambda guess=guess, possible=possible: solver.calculate_elimination_score(
+                guess, possible
+            )
+        )
+        benchmarks[f"calculate_word_probability[{state}]"] = (
+            lambda possible=possible: [
+                solver.calculate_word_probability(word) for word in possible
+            ]
+        )
+        benchmarks[f"frequency_scores[{state}]"] = (
+            lambda possible=possible: solver.frequency_scores(possible)
+        )
+        benchmarks[f"solve[{state}]"] = (
+            lambda constraints=constraints: solver.solve(**constraints)
+        )
+    return benchmarks
+
+
+def build_length_benchmarks(solver: WordleSolver) -> Dict[str, Callable[[], object]]:
+    """
+    Create the per-length benchmark callables for a solver on a synthetic list.
+
+    The mid-game state is the feedback of the first word played against
+    the second one.
+    """
+    length = solver.word_length
+    words = solver.words
+    guess = words[0]
+    feedback = [(guess, format_feedback(get_pattern_code(guess, words[1]), length))]
+    return {
+        f"filter_words[length={length}]": lambda: solver.filter_feedback(feedback),
+        f"pattern_codes[length={length}]": lambda: pattern_codes(guess, words),
+        f"solve[length={length}]": lambda: solver.solve(feedback=feedback),
+    }
+
+
+def run_benchmarks(
+    words_file: str = "words.csv",
+    repeat: int = 5,
+    min_time: float = 0.2,
+    only: List[str] | None = None,
+    lengths: Sequence[int] = (),
+) -> Dict:
+    """
+    Run the benchmark suite.
+
+    Args:
+        words_file: Word list to benchmark against
+        repeat: Number of timing samples per benchmark
+        min_time: Minimum duration of one sample in seconds
+        only: Substrings selecting a subset of benchmarks by name
+        lengths: Word lengths to also benchmark on synthetic word lists
+
+    Returns:
+        Machine-readable results with environment metadata
+    """
+    # Disable the result cache so repeated solve() calls are really timed
+    solver = WordleSolver(words_file, cache_size=0)
+    benchmarks = build_benchmarks(solver, words_file)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for length in lengths:
+            path = os.path.join(tmpdir, f"words{length}.csv")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("\n".join(synthetic_words(length)) + "\n")
+            length_solver = WordleSolver(path, cache_size=0, word_length=length)
+            benchmarks.update(build_length_benchmarks(length_solver))
+
+        results = {}
+        for name, func in benchmarks.items():
+            if only and not any(pattern in name for pattern in only):
+                continue
+            results[name] = time_call(func, repeat, min_time)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "words_file": words_file,
+            "word_count": len(solver.words),
+            "timestamp": time.time(),
+        },
+        "results": results,
+    }
+
+
+def compare_results(current: Dict, baseline: Dict, threshold: float) -> List[Dict]:
+    """
+    Compare results against a baseline.
+
+    A benchmark regresses when its best time is more than threshold (a
+    fraction, e.g. 0.25 for 25%) slower than the baseline's.
+
+    Returns:
+        One entry per benchmark present in both runs, with the time ratio
+        and whether it regressed
+    """
+    comparisons = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or base["min"] <= 0:
+            continue
+        ratio = result["min"] / base["min"]
+        comparisons.append({
+            "name": name,
+            "baseline": base["min"],
+            "current": result["min"],
+            "ratio": ratio,
+            "regressed": ratio > 1 + threshold,
+        })
+    return comparisons
+
+
+def format_seconds(seconds: float) -> str:
+    """Format a duration with a readable unit."""
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Wordle solver hot paths')
+    parser.add_argument('--words', default='words.csv',
+                       help='Path to CSV file containing possible words (default: words.csv)')
+    parser.add_argument('--repeat', type=int, default=5,
+                       help='Timing samples per benchmark (default: 5)')
+    parser.add_argument('--min-time', type=float, default=0.2,
+                       help='Minimum seconds per sample (default: 0.2)')
+    parser.add_argument('--lengths', default=','.join(map(str, LENGTHS)),
+                       help='Comma-separated word lengths to benchmark on synthetic word lists '
+                            '(default: %(default)s; empty to skip)')
+    parser.add_argument('--only', action='append',
+                       help='Only run benchmarks whose name contains this (repeatable)')
+    parser.add_argument('--output',
+                       help='Write results as JSON to this file')
+    parser.add_argument('--baseline',
+                       help='Compare against results stored in this JSON file')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                       help='Allowed slowdown before a benchmark counts as a regression '
+                            '(default: 0.25 = 25%%)')
+    parser.add_argument('--save-baseline', action='store_true',
+                       help='Write the results to the --baseline file instead of comparing')
+
+    args = parser.parse_args()
+
+    lengths = [int(length) for length in args.lengths.split(',') if length.strip()]
+    current = run_benchmarks(args.words, args.repeat, args.min_time, args.only, lengths)
+    for name, result in current["results"].items():
+        print(f"{name:45s} {format_seconds(result['min']):>12s}  "
+              f"(median {format_seconds(result['median'])})")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(current, file, indent=2)
+
+    if args.baseline and args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(current, file, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        comparisons = compare_results(current, baseline, args.threshold)
+        print(f"\nComparison against {args.baseline} (threshold {args.threshold:.0%}):")
+        for entry in comparisons:
+            flag = "REGRESSION" if entry["regressed"] else "ok"
+            print(f"{entry['name']:45s} {entry['ratio']:6.2f}x  {flag}")
+        if any(entry["regressed"] for entry in comparisons):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
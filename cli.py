@@ -4,8 +4,14 @@ Command-line interface for the Wordle solver.
 """
 
 import argparse
+import json
 import sys
-from wordle_solver import WordleSolver
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from constraints import parse_feedback_history
+from game_session import GameSession
+from streaming import stream_candidates
+from wordle_solver import OBJECTIVES, WORD_LENGTHS, WordleSolver
 
 
 def parse_positions(positions_str):
@@ -47,18 +53,194 @@ def parse_wrong_positions(wrong_positions_str):
     return wrong_positions
 
 
-def main():
-    parser = argparse.ArgumentParser(description='Wordle Solver - Find the best word guesses')
+def parse_batch_request(request, default_max_results):
+    """Convert one JSON batch request into keyword arguments for solve()."""
+    if not isinstance(request, dict):
+        raise ValueError("request must be a JSON object")
+    objective = request.get('objective', 'elimination')
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective {objective!r}; use one of {OBJECTIVES}")
+    depth = int(request.get('depth', 1))
+    if depth < 1:
+        raise ValueError(f"depth must be at least 1, got {depth}")
+    return {
+        'correct_positions': {
+            int(pos): letter.lower()
+            for pos, letter in request.get('correct_positions', {}).items()
+        },
+        'correct_letters': [letter.lower() for letter in request.get('correct_letters', [])],
+        'incorrect_letters': [letter.lower() for letter in request.get('incorrect_letters', [])],
+        'wrong_positions': {
+            letter.lower(): set(positions)
+            for letter, positions in request.get('wrong_positions', {}).items()
+        },
+        'max_results': int(request.get('max_results', default_max_results)),
+        'use_elimination_scoring': bool(request.get('use_elimination_scoring', True)),
+        'exhaustive': request.get('exhaustive'),
+        'feedback': parse_batch_feedback(request.get('feedback')),
+        'probes': bool(request.get('probes', False)),
+        'hard_mode': bool(request.get('hard_mode', False)),
+        'objective': objective,
+        'depth': depth,
+    }
+
+
+def parse_batch_feedback(feedback):
+    """Accept batch feedback as 'crane:bygbb,...' or as [["crane", "bygbb"], ...]."""
+    if not feedback:
+        return None
+    if isinstance(feedback, str):
+        return parse_feedback_history(feedback)
+    return [(guess, pattern) for guess, pattern in feedback]
+
+
+def solve_batch_line(solver, line_number, line, default_max_results):
+    """Solve one JSONL batch line and return the JSON result line."""
+    request_id = line_number
+    try:
+        request = json.loads(line)
+        if isinstance(request, dict):
+            request_id = request.get('id', line_number)
+        kwargs = parse_batch_request(request, default_max_results)
+        results = solver.solve(**kwargs)
+        response = {
+            'id': request_id,
+            'results': [{'word': word, 'score': score} for word, score in results],
+        }
+    except Exception as e:  # one failing line must not end the batch
+        response = {'id': request_id, 'error': str(e)}
+    return json.dumps(response)
+
+
+_batch_solver = None
+
+
+def _init_batch_worker(words_file, pattern_cache, answers_file=None, word_length=5):
+    """Load one solver per batch worker process."""
+    global _batch_solver
+    _batch_solver = WordleSolver(words_file, pattern_cache=pattern_cache,
+                                 answers_file=answers_file, word_length=word_length)
+
+
+def _solve_batch_worker(line_number, line, default_max_results):
+    """Solve a batch line with the worker's solver."""
+    return solve_batch_line(_batch_solver, line_number, line, default_max_results)
+
+
+def iter_batch_lines(source):
+    """Yield (line_number, line) for the non-blank lines of a batch input."""
+    for line_number, line in enumerate(source, 1):
+        if line.strip():
+            yield line_number, line
+
+
+def run_batch(args, output=sys.stdout):
+    """
+    Answer one JSON constraint object per input line with one JSON result line.
+
+    Lines are read lazily and at most a fixed window of requests is in
+    flight, so memory stays bounded however long the input is. With several
+    workers, results are written as they complete unless --ordered is given.
+    """
+    source = sys.stdin if args.batch == '-' else open(args.batch, encoding='utf-8')
+    try:
+        lines = iter_batch_lines(source)
+        if args.workers <= 1:
+            solver = WordleSolver(args.words, pattern_cache=args.pattern_cache,
+                                  answers_file=args.answers, word_length=args.length)
+            for line_number, line in lines:
+                print(solve_batch_line(solver, line_number, line, args.max_results), file=output)
+            solver.close()
+            return
+
+        window = args.workers * 4
+        with ProcessPoolExecutor(args.workers, initializer=_init_batch_worker,
+                                 initargs=(args.words, args.pattern_cache, args.answers,
+                                           args.length)) as executor:
+            pending = deque() if args.ordered else set()
+            for line_number, line in lines:
+                future = executor.submit(_solve_batch_worker, line_number, line, args.max_results)
+                if args.ordered:
+                    pending.append(future)
+                    if len(pending) >= window:
+                        print(pending.popleft().result(), file=output)
+                else:
+                    pending.add(future)
+                    if len(pending) >= window:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            print(future.result(), file=output)
+            if args.ordered:
+                for future in pending:
+                    print(future.result(), file=output)
+            else:
+                for future in wait(pending).done:
+                    print(future.result(), file=output)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+def serve_main(argv):
+    """Run the 'serve' subcommand: a local HTTP service with a warm solver."""
+    from server import run_server
+
+    parser = argparse.ArgumentParser(prog='cli.py serve',
+                                     description='Serve solver queries over local HTTP')
+    parser.add_argument('--words', default='words.csv',
+                       help='Path to CSV file containing possible words (default: words.csv)')
+    parser.add_argument('--answers',
+                       help='Path to CSV file of possible answers, when smaller than --words')
+    parser.add_argument('--length', type=int, default=5, choices=WORD_LENGTHS,
+                       help='Word length, from 4 to 8 (default: 5)')
+    parser.add_argument('--pattern-cache',
+                       help='Directory for the precomputed pattern table (built on first use)')
+    parser.add_argument('--host', default='127.0.0.1',
+                       help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080,
+                       help='Port to listen on (default: 8080)')
+    parser.add_argument('--threads', type=int, default=4,
+                       help='Threads used for scoring requests (default: 4)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of processes used for scoring (default: 1)')
+
+    args = parser.parse_args(argv)
+    solver = WordleSolver(args.words, pattern_cache=args.pattern_cache, workers=args.workers,
+                          answers_file=args.answers, word_length=args.length)
+    run_server(solver, args.host, args.port, args.threads)
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ['serve']:
+        serve_main(argv[1:])
+        return
+
+    parser = argparse.ArgumentParser(description='Wordle Solver - Find the best word guesses',
+                                     epilog='Run "cli.py serve --help" for the HTTP service.')
     parser.add_argument('--words', default='words.csv', 
                        help='Path to CSV file containing possible words (default: words.csv)')
+    parser.add_argument('--answers',
+                       help='Path to CSV file of possible answers; --words then only lists '
+                            'allowed guesses')
+    parser.add_argument('--opening-book',
+                       help='Opening book file built by opening_book.py '
+                            '(default: the book next to --words, if any)')
+    parser.add_argument('--length', type=int, default=5, choices=WORD_LENGTHS,
+                       help='Word length, from 4 to 8 (default: 5)')
     parser.add_argument('--correct-positions', 
-                       help='Correct letters in correct positions (green). Format: 0:a,2:r,4:e')
+                       help='Correct letters in correct positions (green), positions '
+                            'counted from 0. Format: 0:a,2:r,4:e')
     parser.add_argument('--correct-letters', 
                        help='Correct letters in wrong positions (yellow). Format: a,b,c')
     parser.add_argument('--incorrect-letters', 
                        help='Incorrect letters (gray). Format: x,y,z')
     parser.add_argument('--wrong-positions', 
                        help='Letters in wrong positions. Format: a:1,3;b:0,2')
+    parser.add_argument('--feedback',
+                       help='Guesses with their feedback (g=green, y=yellow, b=gray). '
+                            'Format: crane:bygbb,slate:bbgbg')
     parser.add_argument('--max-results', type=int, default=20,
                        help='Maximum number of results to show (default: 20)')
     parser.add_argument('--best-only', action='store_true',
@@ -69,16 +251,70 @@ def main():
                        help='Run in interactive mode')
     parser.add_argument('--frequency-scoring', action='store_true',
                        help='Use letter frequency scoring instead of elimination scoring')
+    parser.add_argument('--pattern-cache',
+                       help='Directory for the precomputed pattern table (built on first use)')
+    parser.add_argument('--exhaustive', action='store_true', default=None,
+                       help='Score every possible word exactly instead of pre-filtering large sets')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of processes used for scoring (default: 1)')
+    parser.add_argument('--probes', action='store_true',
+                       help='Also rank guesses that can no longer be the answer')
+    parser.add_argument('--hard-mode', action='store_true',
+                       help='Only suggest guesses that use every revealed hint')
+    parser.add_argument('--objective', choices=OBJECTIVES, default='elimination',
+                       help='Ranking objective: expected eliminations or the worst-case '
+                            'remaining candidates (default: elimination)')
+    parser.add_argument('--depth', type=int, default=1,
+                       help='Guesses searched per line of play; 2 or more ranks by expected '
+                            'guesses to solve (default: 1)')
+    parser.add_argument('--board', action='append', metavar='FEEDBACK',
+                       help='Feedback history of one board of a multi-board game '
+                            '(repeat per board). Format: crane:bygbb,slate:bbgbg')
+    parser.add_argument('--profile', action='store_true',
+                       help='Print per-phase timings and counters after solving')
+    parser.add_argument('--stream', action='store_true',
+                       help='Stream --words through the constraints in chunks instead of loading '
+                            'it, for word lists too large to fit in memory')
+    parser.add_argument('--batch', nargs='?', const='-', metavar='FILE',
+                       help='Read one JSON constraint object per line from FILE (or stdin) '
+                            'and write one JSON result per line')
+    parser.add_argument('--ordered', action='store_true',
+                       help='In batch mode, write results in input order')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        run_batch(args)
+        return
+    
+    # Parse command line arguments
+    correct_positions = parse_positions(args.correct_positions)
+    correct_letters = parse_letters(args.correct_letters)
+    incorrect_letters = parse_letters(args.incorrect_letters)
+    wrong_positions = parse_wrong_positions(args.wrong_positions)
+    try:
+        feedback = parse_feedback_history(args.feedback) if args.feedback else None
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
     
+    # With --stream, only the words satisfying the constraints are loaded
+    words = None
+    if args.stream:
+        words = stream_candidates(args.words, correct_positions, correct_letters,
+                                  incorrect_letters, wrong_positions, feedback, args.length)
+
     # Initialize solver
-    solver = WordleSolver(args.words)
+    solver = WordleSolver(args.words, pattern_cache=args.pattern_cache, workers=args.workers,
+                          profiling=args.profile, answers_file=args.answers,
+                          word_length=args.length, opening_book=args.opening_book,
+                          words=words)
     
     if args.stats:
         stats = solver.get_stats()
         print("Word List Statistics:")
         print(f"  Total words: {stats['total_words']}")
+        print(f"  Possible answers: {stats['total_answers']}")
         print(f"  Unique letters: {stats['unique_letters']}")
         print(f"  Average word length: {stats['avg_word_length']:.1f}")
         return
@@ -87,79 +323,127 @@ def main():
         run_interactive(solver)
         return
     
-    # Parse command line arguments
-    correct_positions = parse_positions(args.correct_positions)
-    correct_letters = parse_letters(args.correct_letters)
-    incorrect_letters = parse_letters(args.incorrect_letters)
-    wrong_positions = parse_wrong_positions(args.wrong_positions)
-    
+    if args.board:
+        run_boards(solver, args)
+        return
+
     # Solve
     use_elimination = not args.frequency_scoring
     if args.best_only:
         results = solver.solve(correct_positions, correct_letters, incorrect_letters, 
-                             wrong_positions, max_results=1, use_elimination_scoring=use_elimination)
+                             wrong_positions, max_results=1, use_elimination_scoring=use_elimination,
+                             exhaustive=args.exhaustive, feedback=feedback, probes=args.probes,
+                             hard_mode=args.hard_mode, objective=args.objective,
+                             depth=args.depth)
         if results:
             print(f"Best guess: {results[0][0].upper()}")
         else:
             print("No valid words found with given constraints.")
     else:
         results = solver.solve(correct_positions, correct_letters, incorrect_letters, 
-                             wrong_positions, args.max_results, use_elimination_scoring=use_elimination)
+                             wrong_positions, args.max_results, use_elimination_scoring=use_elimination,
+                             exhaustive=args.exhaustive, feedback=feedback, probes=args.probes,
+                             hard_mode=args.hard_mode, objective=args.objective,
+                             depth=args.depth)
         
         if results:
-            score_type = "elimination score" if use_elimination else "frequency score"
+            lookahead = use_elimination and args.depth > 1 and not args.hard_mode
+            if lookahead:
+                score_type = f"expected guesses, depth {args.depth}"
+            else:
+                score_type = "elimination score" if use_elimination else "frequency score"
             print(f"Top {len(results)} possibilities (ranked by {score_type}):")
             for i, (word, score) in enumerate(results, 1):
-                if use_elimination:
+                if lookahead:
+                    print(f"{i:2d}. {word.upper()} (solves in {score:.3f} guesses on average)")
+                elif use_elimination:
                     print(f"{i:2d}. {word.upper()} (eliminates {score:.1f} words)")
                 else:
                     print(f"{i:2d}. {word.upper()} (score: {score:.2e})")
         else:
             print("No valid words found with given constraints.")
 
+    if args.profile and solver.last_profile is not None:
+        print("\nProfile:")
+        print(solver.last_profile.format())
+
+
+def run_boards(solver, args):
+    """Rank guesses jointly across the boards of a multi-board game."""
+    from multi_board import solve_boards
+
+    try:
+        boards = [{'feedback': parse_feedback_history(board)} for board in args.board]
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    results = solve_boards(solver, boards, 1 if args.best_only else args.max_results,
+                           args.exhaustive)
+    if not results:
+        print("No valid words found with given constraints.")
+    elif args.best_only:
+        print(f"Best guess: {results[0][0].upper()}")
+    else:
+        print(f"Top {len(results)} guesses across {len(boards)} boards "
+              f"(ranked by summed elimination score):")
+        for i, (word, score) in enumerate(results, 1):
+            print(f"{i:2d}. {word.upper()} (eliminates {score:.1f} words)")
 
-def run_interactive(solver):
-    """Run the solver in interactive mode."""
+
+def run_interactive(solver, max_results=10):
+    """
+    Run the solver in interactive mode.
+
+    One game is kept across turns. While the player enters the feedback to
+    a guess, the next turn is ranked in the background for the likeliest
+    feedback to the top recommendation, so those answers appear at once.
+    """
     print("=== Wordle Solver Interactive Mode ===")
-    print("Enter your constraints. Leave blank to skip a constraint type.")
-    print("Positions are numbered 0-4 (left to right).")
-    print()
-    
+    print("After each guess, enter it with its feedback, one letter per position:")
+    print("g (green), y (yellow), b (gray), e.g. crane:bygbb.")
+    print("Enter 'new' to start another puzzle, or leave blank to quit.")
+
+    session = None
     while True:
-        print("\n--- New Wordle Puzzle ---")
-        
-        # Get correct positions (green letters)
-        correct_pos_input = input("Correct positions (green letters, format: 0:a,2:r): ").strip()
-        correct_positions = parse_positions(correct_pos_input) if correct_pos_input else {}
-        
-        # Get correct letters in wrong positions (yellow letters)
-        correct_letters_input = input("Correct letters in wrong positions (yellow, format: a,b,c): ").strip()
-        correct_letters = parse_letters(correct_letters_input) if correct_letters_input else []
-        
-        # Get incorrect letters (gray letters)
-        incorrect_letters_input = input("Incorrect letters (gray, format: x,y,z): ").strip()
-        incorrect_letters = parse_letters(incorrect_letters_input) if incorrect_letters_input else []
+        if session is None:
+            print("\n--- New Wordle Puzzle ---")
+            session = GameSession(solver)
+        results = session.best_guesses(max_results)
 
-        # Get wrong positions for yellow letters
-        wrong_pos_input = input("Wrong positions for yellow letters (format: a:1,3;b:0,2): ").strip()
-        wrong_positions = parse_wrong_positions(wrong_pos_input) if wrong_pos_input else {}
-        
-        # Solve
-        results = solver.solve(correct_positions, correct_letters, incorrect_letters, 
-                             wrong_positions, max_results=10, use_elimination_scoring=True)
-        
         if results:
             print(f"\nTop {len(results)} possibilities (ranked by elimination score):")
             for i, (word, score) in enumerate(results, 1):
                 print(f"{i:2d}. {word.upper()} (eliminates {score:.1f} words)")
+            session.speculate(results[0][0], max_results=max_results)
         else:
             print("No valid words found with given constraints.")
-        
-        # Ask if user wants to continue
-        continue_input = input("\nSolve another puzzle? (y/n): ").strip().lower()
-        if continue_input != 'y' and continue_input != 'yes':
+
+        while True:
+            line = input(f"\nGuess {len(session.history) + 1} and feedback: ").strip().lower()
+            if not line or line == "new":
+                break
+            try:
+                history = parse_feedback_history(line)
+                if len(history) != 1:
+                    raise ValueError("Enter one guess with its feedback, e.g. crane:bygbb")
+                session.add_feedback(*history[0])
+            except ValueError as e:
+                print(f"Error: {e}")
+                continue
             break
-    
+
+        if not line or line == "new":
+            session.cancel_speculation()
+            if not line:
+                break
+            session = None
+        elif session.is_solved:
+            print(f"\nSolved in {len(session.history)} guesses!")
+            continue_input = input("\nSolve another puzzle? (y/n): ").strip().lower()
+            if continue_input != 'y' and continue_input != 'yes':
+                break
+            session = None
+
     print("Thanks for using Wordle Solver!")
 
 
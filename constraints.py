@@ -0,0 +1,256 @@
+"""
+Compile raw (guess, feedback) history into a canonical word predicate.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Set, Tuple
+
+from patterns import GRAY, GREEN, YELLOW, parse_feedback
+
+
+class FeedbackConstraints:
+    """
+    Canonical constraints derived from Wordle feedback.
+
+    A word matches when it has the fixed letter at every fixed position,
+    none of the banned letters at each banned position, and between
+    min_counts[letter] and max_counts[letter] copies of each letter.
+    Redundant entries are removed, so two histories implying the same set
+    of answers usually compile to equal constraints.
+    """
+
+    def __init__(
+        self,
+        word_length: int = 5,
+        fixed: Dict[int, str] | None = None,
+        banned: Dict[int, Set[str]] | None = None,
+        min_counts: Dict[str, int] | None = None,
+        max_counts: Dict[str, int] | None = None,
+    ):
+        self.word_length = word_length
+        self.fixed = dict(fixed or {})
+        self.banned = {pos: set(letters) for pos, letters in (banned or {}).items()}
+        self.min_counts = dict(min_counts or {})
+        self.max_counts = dict(max_counts or {})
+        self._canonicalize()
+
+    def _canonicalize(self) -> None:
+        """Tighten counts and drop entries implied by other entries."""
+        for pos, letter in self.fixed.items():
+            if letter in self.banned.get(pos, ()):
+                # Fixed and banned at one position: nothing can match. The
+                # ban is dropped below, so record the contradiction as a count
+                self.max_counts[letter] = 0
+        for letter, count in Counter(self.fixed.values()).items():
+            self.min_counts[letter] = max(self.min_counts.get(letter, 0), count)
+        self.min_counts = {
+            letter: count for letter, count in self.min_counts.items() if count > 0
+        }
+        self.max_counts = {
+            letter: count
+            for letter, count in self.max_counts.items()
+            if count < self.word_length
+        }
+        # A letter whose every allowed copy is already fixed cannot appear
+        # anywhere else, so its per-position bans carry no information
+        fixed_counts = Counter(self.fixed.values())
+        banned = {}
+        for pos, letters in self.banned.items():
+            if pos in self.fixed:
+                continue
+            letters = {
+                letter
+                for letter in letters
+                if self.max_counts.get(letter) not in (0, fixed_counts[letter])
+            }
+            if letters:
+                banned[pos] = letters
+        self.banned = banned
+
+    @property
+    def is_satisfiable(self) -> bool:
+        """False when the constraints contradict each other."""
+        if any(self.min_counts[letter] > count for letter, count in self.max_counts.items()
+               if letter in self.min_counts):
+            return False
+        return sum(self.min_counts.values()) <= self.word_length
+
+    def key(self) -> Tuple:
+        """Hashable canonical form of the constraints."""
+        return (
+            self.word_length,
+            tuple(sorted(self.fixed.items())),
+            tuple(sorted((pos, tuple(sorted(letters))) for pos, letters in self.banned.items())),
+            tuple(sorted(self.min_counts.items())),
+            tuple(sorted(self.max_counts.items())),
+        )
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, FeedbackConstraints) and self.key() == other.key()
+
+    def __hash__(self) -> int:
+        return hash(self.key())
+
+    def __repr__(self) -> str:
+        return (
+            f"FeedbackConstraints(fixed={self.fixed}, banned={self.banned}, "
+            f"min_counts={self.min_counts}, max_counts={self.max_counts})"
+        )
+
+    def matches(self, word: str) -> bool:
+        """Check whether a single word satisfies the constraints."""
+        if len(word) != self.word_length:
+            return False
+        for pos, letter in self.fixed.items():
+            if word[pos] != letter:
+                return False
+        for pos, letters in self.banned.items():
+            if word[pos] in letters:
+                return False
+        counts = Counter(word)
+        for letter, count in self.min_counts.items():
+            if counts[letter] < count:
+                return False
+        for letter, count in self.max_counts.items():
+            if counts[letter] > count:
+                return False
+        return True
+
+    def merge(self, other: "FeedbackConstraints") -> "FeedbackConstraints":
+        """
+        Combine two constraint sets into one that requires both.
+
+        A ban from one side on the letter the other side fixes at that
+        position makes the result unsatisfiable.
+        """
+        banned = {pos: set(letters) for pos, letters in self.banned.items()}
+        for pos, letters in other.banned.items():
+            banned.setdefault(pos, set()).update(letters)
+        min_counts = dict(self.min_counts)
+        for letter, count in other.min_counts.items():
+            min_counts[letter] = max(min_counts.get(letter, 0), count)
+        max_counts = dict(self.max_counts)
+        for letter, count in other.max_counts.items():
+            max_counts[letter] = min(max_counts.get(letter, count), count)
+        fixed = dict(self.fixed)
+        for pos, letter in other.fixed.items():
+            if fixed.setdefault(pos, letter) != letter:
+                # Two different letters at one position: nothing can match
+                max_counts[letter] = 0
+        return FeedbackConstraints(self.word_length, fixed, banned, min_counts, max_counts)
+
+
+def compile_feedback(
+    history: Iterable[Tuple[str, str]], word_length: int = 5
+) -> FeedbackConstraints:
+    """
+    Compile (guess, feedback) pairs into canonical constraints.
+
+    Duplicate letters follow the game's rules exactly: the number of green
+    and yellow copies of a letter in one guess is a lower bound on its count,
+    and any gray copy of that letter makes the bound exact.
+
+    Args:
+        history: Pairs such as ("crane", "bygbb"), with feedback using g/y/b
+        word_length: Length of every word
+
+    Returns:
+        FeedbackConstraints accepting exactly the consistent answers
+    """
+    fixed: Dict[int, str] = {}
+    banned: Dict[int, Set[str]] = {}
+    min_counts: Dict[str, int] = {}
+    max_counts: Dict[str, int] = {}
+    conflicts: List[str] = []
+
+    for guess, feedback in history:
+        guess = guess.lower()
+        if len(guess) != word_length or len(feedback) != word_length:
+            raise ValueError(
+                f"Guess {guess!r} and feedback {feedback!r} must both have "
+                f"{word_length} letters"
+            )
+        code = parse_feedback(feedback)
+        found: Counter = Counter()
+        grayed: Set[str] = set()
+        for pos, letter in enumerate(guess):
+            code, digit = divmod(code, 3)
+            if digit == GREEN:
+                if fixed.setdefault(pos, letter) != letter:
+                    conflicts.append(letter)
+                found[letter] += 1
+            elif digit == YELLOW:
+                banned.setdefault(pos, set()).add(letter)
+                found[letter] += 1
+            elif digit == GRAY:
+                banned.setdefault(pos, set()).add(letter)
+                grayed.add(letter)
+        for letter, count in found.items():
+            min_counts[letter] = max(min_counts.get(letter, 0), count)
+        for letter in grayed:
+            count = found[letter]
+            max_counts[letter] = min(max_counts.get(letter, count), count)
+
+    for letter in conflicts:
+        max_counts[letter] = 0
+    return FeedbackConstraints(word_length, fixed, banned, min_counts, max_counts)
+
+
+def compile_hints(
+    correct_positions: Dict[int, str] | None = None,
+    correct_letters: List[str] | None = None,
+    incorrect_letters: List[str] | None = None,
+    wrong_positions: Dict[str, Set[int]] | None = None,
+    word_length: int = 5,
+) -> FeedbackConstraints:
+    """
+    Compile the solver's four constraint types into canonical constraints.
+
+    The rules are those of WordleSolver.filter_words: every green and
+    yellow copy of a letter counts towards its minimum, and a gray letter
+    caps the count just below the known copies plus its gray copies (or
+    at zero when nothing else reveals it).
+
+    Returns:
+        FeedbackConstraints accepting exactly the words filter_words accepts
+    """
+    correct_positions = correct_positions or {}
+    correct_letters = list(correct_letters or [])
+    wrong_positions = wrong_positions or {}
+
+    banned: Dict[int, Set[str]] = {}
+    for letter, positions in wrong_positions.items():
+        for pos in positions:
+            banned.setdefault(pos, set()).add(letter)
+    green_counts = Counter(correct_positions.values())
+    yellow_counts = Counter(correct_letters)
+    min_counts = dict(green_counts + yellow_counts)
+    for letter in wrong_positions:
+        min_counts[letter] = max(min_counts.get(letter, 0), 1)
+    max_counts: Dict[str, int] = {}
+    for letter, count in Counter(incorrect_letters or []).items():
+        if letter not in min_counts:
+            max_counts[letter] = 0
+        else:
+            max_counts[letter] = count + green_counts[letter] + yellow_counts[letter] - 1
+    for pos, letter in correct_positions.items():
+        if letter in banned.get(pos, ()):
+            # Green and yellow at one position: nothing can match
+            max_counts[letter] = 0
+    return FeedbackConstraints(word_length, dict(correct_positions), banned, min_counts,
+                               max_counts)
+
+
+def parse_feedback_history(history_str: str) -> List[Tuple[str, str]]:
+    """Parse a string like 'crane:bygbb,slate:bbgbg' into (guess, feedback) pairs."""
+    history = []
+    for pair in history_str.split(","):
+        pair = pair.strip()
+        if not pair:
+            continue
+        guess, sep, feedback = pair.partition(":")
+        guess, feedback = guess.strip().lower(), feedback.strip().lower()
+        if not sep or not guess or len(guess) != len(feedback):
+            raise ValueError(f"Invalid feedback entry {pair!r}. Use format like 'crane:bygbb'")
+        history.append((guess, feedback))
+    return history
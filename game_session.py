@@ -0,0 +1,231 @@
+"""
+Incremental game state on top of WordleSolver.
+"""
+
+import threading
+from typing import Dict, List, Tuple
+
+from patterns import all_green_code, parse_feedback
+from wordle_solver import WordleSolver
+
+
+class GameSession:
+    """
+    One game in progress, narrowed turn by turn from (guess, feedback) pairs.
+
+    Only the surviving candidates are ever re-examined. The candidates are
+    partitioned by feedback only for the guess actually played (or
+    speculated on), in one pattern pass, and the part matching the actual
+    feedback becomes the next candidate set.
+
+    While the player is deciding, speculate() ranks the next turn in a
+    background thread for the likeliest feedback to a guess. When the
+    feedback that arrives is one of those, the next best_guesses() call
+    returns the precomputed ranking at once.
+    """
+
+    def __init__(self, solver: WordleSolver):
+        """
+        Start a new game.
+
+        Args:
+            solver: Solver providing the word list and scoring
+        """
+        self.solver = solver
+        self.candidates: List[str] = list(solver.answers)
+        self.history: List[Tuple[str, str]] = []
+        self._partitions: Dict[str, Dict[int, List[str]]] = {}
+        self._speculation: _Speculation | None = None
+        self._prepared: Tuple | None = None
+        self.speculation_hits = 0
+        self.speculation_misses = 0
+
+    @property
+    def is_solved(self) -> bool:
+        """True once a guess has been answered with all greens."""
+        return bool(self.history) and parse_feedback(self.history[-1][1]) == all_green_code(
+            len(self.history[-1][1])
+        )
+
+    def best_guesses(
+        self, max_results: int = 20, use_elimination_scoring: bool = True
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank the current candidates.
+
+        Returns:
+            List of tuples (word, score) sorted by score (highest first)
+        """
+        if not self.candidates:
+            return []
+        prepared, self._prepared = self._prepared, None
+        if prepared is not None and prepared[:2] == (max_results, use_elimination_scoring):
+            return prepared[2]
+        if not self.history:
+            results = self.solver.solve(
+                max_results=max_results, use_elimination_scoring=use_elimination_scoring
+            )
+        else:
+            results = self.solver.rank_candidates(
+                self.candidates, max_results, use_elimination_scoring
+            )
+        return results
+
+    def best_guess(self) -> str | None:
+        """Get the single best guess for the current state."""
+        if self.solver.strategy_tree is not None:
+            node = self.solver.strategy_tree.lookup(self.history)
+            if node is not None:
+                return node[0]
+        results = self.best_guesses(max_results=1)
+        return results[0][0] if results else None
+
+    def add_feedback(self, guess: str, feedback: str) -> List[str]:
+        """
+        Apply the feedback received for a guess and narrow the candidates.
+
+        Args:
+            guess: The word that was played
+            feedback: Feedback string, one of g/y/b per letter (e.g. "bygbb")
+
+        Returns:
+            The remaining candidate words
+
+        Raises:
+            ValueError: If the guess or feedback has the wrong length
+        """
+        guess = guess.lower()
+        if len(guess) != self.solver.word_length:
+            raise ValueError(f"Guess {guess!r} must have {self.solver.word_length} letters")
+        if len(feedback) != len(guess):
+            raise ValueError(f"Feedback {feedback!r} does not match guess {guess!r}")
+        code = parse_feedback(feedback)
+        speculation, self._speculation = self._speculation, None
+        self._prepared = None
+        if speculation is not None:
+            self._prepared = speculation.finish(guess, code)
+            if self._prepared is None:
+                self.speculation_misses += 1
+            else:
+                self.speculation_hits += 1
+        partition = self._partitions.get(guess)
+        if partition is None:
+            partition = self._partition(guess)
+        self.candidates = partition.get(code, [])
+        self.history.append((guess, feedback.lower()))
+        self._partitions = {}
+        return self.candidates
+
+    def speculate(
+        self,
+        guess: str,
+        branches: int = 4,
+        max_results: int = 20,
+        use_elimination_scoring: bool = True,
+    ) -> None:
+        """
+        Start ranking the next turn in the background, as best_guesses()
+        would, for the feedback to guess that leaves the most candidates.
+
+        Every answer is equally likely, so these are the likeliest feedback
+        patterns. Any earlier speculation is cancelled.
+
+        Args:
+            guess: The word about to be played
+            branches: Number of feedback patterns to precompute
+            max_results: max_results of the best_guesses() call to answer
+            use_elimination_scoring: Scoring of the best_guesses() call to answer
+        """
+        self.cancel_speculation()
+        guess = guess.lower()
+        partition = self._partitions.get(guess)
+        if partition is None:
+            partition = self._partitions[guess] = self._partition(guess)
+        solved = all_green_code(len(guess))
+        buckets = sorted(
+            ((code, bucket) for code, bucket in partition.items() if code != solved),
+            key=lambda item: -len(item[1]),
+        )[:branches]
+        self._speculation = _Speculation(
+            self, guess, buckets, max_results, use_elimination_scoring
+        )
+
+    def cancel_speculation(self) -> None:
+        """Stop background work for the next turn; branches in progress are dropped."""
+        if self._speculation is not None:
+            self._speculation.cancel()
+            self._speculation = None
+
+    def _partition(self, guess: str) -> Dict[int, List[str]]:
+        """Group the current candidates by the feedback they would give to guess."""
+        partition: Dict[int, List[str]] = {}
+        codes = self.solver.get_pattern_codes(guess, self.candidates)
+        for word, code in zip(self.candidates, codes):
+            partition.setdefault(code, []).append(word)
+        return partition
+
+
+class _Speculation:
+    """
+    Next-turn rankings of a session for a few feedback patterns of one guess,
+    computed by a daemon thread, biggest candidate set first.
+
+    Ranking a branch cannot be interrupted; cancelling stops the thread
+    before its next branch.
+    """
+
+    def __init__(
+        self,
+        session: GameSession,
+        guess: str,
+        buckets: List[Tuple[int, List[str]]],
+        max_results: int,
+        use_elimination_scoring: bool,
+    ):
+        self.guess = guess
+        self._session = session
+        self._buckets = buckets
+        self._max_results = max_results
+        self._use_elimination_scoring = use_elimination_scoring
+        self._ready: Dict[int, Tuple] = {}
+        self._running: int | None = None
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Rank each branch as best_guesses() would after its feedback."""
+        session = self._session
+        for code, bucket in self._buckets:
+            with self._lock:
+                if self._cancelled.is_set():
+                    return
+                self._running = code
+            results = session.solver.rank_candidates(
+                bucket, self._max_results, self._use_elimination_scoring
+            )
+            with self._lock:
+                self._ready[code] = (self._max_results, self._use_elimination_scoring, results)
+                self._running = None
+
+    def cancel(self) -> None:
+        """Start no further branches."""
+        self._cancelled.set()
+
+    def finish(self, guess: str, code: int) -> Tuple | None:
+        """
+        Cancel the remaining work and return the prepared next turn for
+        the actual feedback, waiting if that branch is being ranked.
+
+        Returns:
+            (max_results, use_elimination_scoring, results), or
+            None when the branch was not precomputed
+        """
+        with self._lock:
+            self._cancelled.set()
+            running = guess == self.guess and self._running == code
+        if running:
+            self._thread.join()
+        with self._lock:
+            return self._ready.get(code) if guess == self.guess else None
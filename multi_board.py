@@ -0,0 +1,115 @@
+"""
+Joint guess scoring for multi-board variants (Quordle, Octordle, ...).
+
+Every board receives the same guesses, so a guess's feedback is computed
+once against the union of all boards' candidates and each board reads its
+own codes out of that single result.
+"""
+
+from collections import Counter
+from operator import itemgetter
+from typing import Dict, List, Tuple
+
+from constraints import FeedbackConstraints
+from patterns import all_green_code, expected_elimination, parse_feedback
+from wordle_solver import WordleSolver
+
+# Boards with at most this many candidates contribute all of them as guesses,
+# since guessing one may solve that board outright
+_SMALL_BOARD = 5
+
+
+def board_mask(solver: WordleSolver, board: Dict) -> int:
+    """
+    Resolve one board's constraints to a bitmask of its candidate answers.
+
+    Args:
+        board: Keyword arguments as accepted by solve(): correct_positions,
+            correct_letters, incorrect_letters, wrong_positions and feedback
+    """
+    return solver._constraint_mask(
+        board.get("correct_positions"),
+        board.get("correct_letters"),
+        board.get("incorrect_letters"),
+        board.get("wrong_positions"),
+    ) & solver._feedback_mask(board.get("feedback"))
+
+
+def is_solved(board: Dict) -> bool:
+    """True when a board's feedback history contains an all-green answer."""
+    feedback = board.get("feedback")
+    if not feedback or isinstance(feedback, FeedbackConstraints):
+        return False
+    return any(
+        parse_feedback(pattern) == all_green_code(len(pattern)) for _, pattern in feedback
+    )
+
+
+def solve_boards(
+    solver: WordleSolver,
+    boards: List[Dict],
+    max_results: int = 20,
+    exhaustive: bool | None = None,
+) -> List[Tuple[str, float]]:
+    """
+    Rank guesses by their summed elimination score over all unsolved boards.
+
+    Args:
+        solver: Solver providing the word list, index and pattern codes
+        boards: One dict of solve() constraint arguments per board; boards
+            already answered with all greens are skipped
+        max_results: Maximum number of results to return
+        exhaustive: If True, score every candidate of every board exactly
+            instead of pre-filtering a large union down to the top 30 by
+            frequency. Defaults to True when a pattern table is loaded.
+
+    Returns:
+        List of tuples (word, summed elimination score) sorted by score
+        (highest first)
+    """
+    if exhaustive is None:
+        exhaustive = solver.pattern_table is not None
+
+    # Boards with the same candidates are scored once and weighted
+    board_counts = Counter(board_mask(solver, board) for board in boards if not is_solved(board))
+    board_counts.pop(0, None)
+    if not board_counts:
+        return []
+    if set(board_counts) == {solver._answer_mask} and not exhaustive:
+        # Every board is still at the opening position
+        boards_left = board_counts[solver._answer_mask]
+        return [
+            (word, score * boards_left)
+            for word, score in solver.solve(max_results=max_results)
+        ]
+
+    union_mask = 0
+    for mask in board_counts:
+        union_mask |= mask
+    union = solver._mask_to_words(union_mask)
+    position = {word: i for i, word in enumerate(union)}
+    board_words = [(solver._mask_to_words(mask), count) for mask, count in board_counts.items()]
+    gathers = [
+        (itemgetter(*[position[word] for word in words]), len(words), count)
+        for words, count in board_words
+        if len(words) > 1
+    ]
+
+    candidates = union
+    if not exhaustive and len(union) > 1000:
+        candidates = solver._top_by_frequency(union, 30)
+        for words, _ in board_words:
+            if len(words) <= _SMALL_BOARD:
+                candidates.extend(words)
+        candidates = list(dict.fromkeys(candidates))
+
+    scores = []
+    for guess in candidates:
+        codes = solver.get_pattern_codes(guess, union)
+        score = 0.0
+        for gather, total, count in gathers:
+            score += count * expected_elimination(gather(codes), total)
+        scores.append((guess, score))
+    scores.sort(key=lambda x: x[1], reverse=True)
+    return scores[:max_results]
+
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Offline precomputation of the first two turns for a word list.
+
+The book stores the exact ranking of the best openers for the loaded word
+list, and for the top few of them the exact ranking of second guesses after
+every first-turn feedback. WordleSolver loads it lazily and answers opening
+and second-turn solve() calls from it instead of scoring, which is where
+scoring is most expensive.
+
+Binary layout (little-endian):
+    header: magic "WSOB", version u8, word length u8, results per entry u16,
+            entry count u32, sha256 of the word list (32 bytes),
+            sha256 of the answer list (32 bytes)
+    entry:  opener index u32 (0xFFFFFFFF for the opening ranking),
+            feedback code u16, result count u16,
+            then per result: guess index u32, score f64
+"""
+
+import argparse
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from patterns import all_green_code, parse_feedback, word_list_hash
+from wordle_solver import WORD_LENGTHS, WordleSolver
+
+_MAGIC = b"WSOB"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBBHI32s32s")
+_ENTRY = struct.Struct("<IHH")
+_RESULT = struct.Struct("<Id")
+_OPENING = 0xFFFFFFFF
+
+# Key of an entry: None for the opening, (opener, feedback code) for turn two
+BookKey = Tuple[str, int] | None
+
+
+def opening_book_path(words_file: str, word_length: int = 5) -> str:
+    """Return the default book path for a word list file loaded at a word length."""
+    if word_length == 5:
+        return words_file + ".book"
+    return f"{words_file}.{word_length}.book"
+
+
+_worker_solver = None
+
+
+def _init_worker(
+    words_file: str, pattern_cache: str | None, answers_file: str | None, word_length: int
+) -> None:
+    """Load one solver per build worker."""
+    global _worker_solver
+    _worker_solver = WordleSolver(words_file, pattern_cache=pattern_cache,
+                                  answers_file=answers_file, word_length=word_length)
+
+
+def _rank_openers(guesses: List[str], results: int) -> List[Tuple[str, float]]:
+    """Find the best openers among a slice of the answer list in a worker."""
+    solver = _worker_solver
+    return solver._top_k_scores(guesses, solver.answers, results)
+
+
+def _rank_replies(candidates: List[str], results: int) -> List[Tuple[str, float]]:
+    """Rank second guesses for one first-turn feedback bucket in a worker."""
+    return _worker_solver.rank_candidates(candidates, results, exhaustive=True)
+
+
+def build_book(
+    words_file: str,
+    answers_file: str | None = None,
+    pattern_cache: str | None = None,
+    openers: int = 20,
+    reply_openers: int = 5,
+    results: int = 20,
+    workers: int = 1,
+    word_length: int = 5,
+) -> Tuple[WordleSolver, Dict[BookKey, List[Tuple[str, float]]]]:
+    """
+    Compute the opening book for a word list.
+
+    Every ranking is exact: each candidate guess is scored against every
+    remaining answer, as with exhaustive=True. With several workers the
+    opener ranking is split into slices of the answer list, and the
+    second-turn rankings into feedback buckets, each on its own process.
+
+    Args:
+        words_file: Path to CSV file containing possible words
+        answers_file: Path to CSV file of possible answers, if separate
+        pattern_cache: Directory for the precomputed pattern table
+        openers: Number of openers kept in the opening ranking
+        reply_openers: Number of the best openers whose second turn is computed
+        results: Number of guesses kept per second-turn ranking
+        workers: Number of processes used for scoring
+        word_length: Word length, from 4 to 8
+
+    Returns:
+        The solver used for the build, and the rankings by book key
+    """
+    solver = WordleSolver(words_file, pattern_cache=pattern_cache,
+                          answers_file=answers_file, word_length=word_length)
+    answers = solver.answers
+    solved = all_green_code(word_length)
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(
+            workers, initializer=_init_worker,
+            initargs=(words_file, pattern_cache, answers_file, word_length),
+        )
+    try:
+        if executor is None:
+            opening = solver.rank_candidates(answers, openers, exhaustive=True)
+        else:
+            # Each slice keeps its own best openers; ties go to the earlier
+            # word, as in a full stable sort
+            step = -(-len(answers) // workers)
+            slices = [answers[i : i + step] for i in range(0, len(answers), step)]
+            opening = [
+                pair
+                for ranking in executor.map(_rank_openers, slices, [openers] * len(slices))
+                for pair in ranking
+            ]
+            opening.sort(key=lambda x: (-x[1], solver._answer_index[x[0]]))
+            opening = opening[:openers]
+        book: Dict[BookKey, List[Tuple[str, float]]] = {None: opening}
+
+        for opener, _ in opening[:reply_openers]:
+            partition: Dict[int, List[str]] = {}
+            for word, code in zip(answers, solver.get_pattern_codes(opener, answers)):
+                partition.setdefault(code, []).append(word)
+            partition.pop(solved, None)
+            codes = sorted(partition)
+            buckets = [partition[code] for code in codes]
+            if executor is None:
+                rankings = [solver.rank_candidates(bucket, results, exhaustive=True)
+                            for bucket in buckets]
+            else:
+                rankings = executor.map(_rank_replies, buckets, [results] * len(buckets))
+            for code, ranking in zip(codes, rankings):
+                book[(opener, code)] = ranking
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return solver, book
+
+
+def serialize_book(
+    book: Dict[BookKey, List[Tuple[str, float]]],
+    words: List[str],
+    answers: List[str],
+    results: int,
+) -> bytes:
+    """Encode book rankings in the binary format described above."""
+    word_index = {word: i for i, word in enumerate(words)}
+    word_length = len(words[0]) if words else 0
+    chunks = [
+        _HEADER.pack(
+            _MAGIC, _VERSION, word_length, results, len(book),
+            bytes.fromhex(word_list_hash(words)), bytes.fromhex(word_list_hash(answers)),
+        )
+    ]
+    # The opening first, then second turns by opener and code
+    keys = sorted(book, key=lambda key: (-1, 0) if key is None else (word_index[key[0]], key[1]))
+    for key in keys:
+        ranking = book[key]
+        opener, code = (_OPENING, 0) if key is None else (word_index[key[0]], key[1])
+        chunks.append(_ENTRY.pack(opener, code, len(ranking)))
+        for word, score in ranking:
+            chunks.append(_RESULT.pack(word_index[word], score))
+    return b"".join(chunks)
+
+
+class OpeningBook:
+    """Precomputed opening and second-turn rankings, read in full at load."""
+
+    def __init__(self, path: str, words: List[str], answers: List[str]):
+        """
+        Read a book file built for the given word and answer lists.
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a book for these lists
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{path} is not an opening book file")
+        magic, version, word_length, results, entry_count, words_digest, answers_digest = (
+            _HEADER.unpack_from(data, 0)
+        )
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not an opening book file")
+        if (
+            words_digest.hex() != word_list_hash(words)
+            or answers_digest.hex() != word_list_hash(answers)
+        ):
+            raise ValueError(f"{path} was built for a different word list")
+        self.word_length = word_length
+        self.results = results
+
+        self._rankings: Dict[BookKey, List[Tuple[str, float]]] = {}
+        offset = _HEADER.size
+        for _ in range(entry_count):
+            opener, code, count = _ENTRY.unpack_from(data, offset)
+            offset += _ENTRY.size
+            ranking = [
+                (words[index], score)
+                for index, score in _RESULT.iter_unpack(
+                    data[offset : offset + count * _RESULT.size]
+                )
+            ]
+            offset += count * _RESULT.size
+            self._rankings[None if opener == _OPENING else (words[opener], code)] = ranking
+        if offset != len(data):
+            raise ValueError(f"{path} is truncated or corrupt")
+
+    @property
+    def openers(self) -> List[str]:
+        """Openers whose second turn is in the book, best first."""
+        with_replies = {key[0] for key in self._rankings if key is not None}
+        return [word for word, _ in self._rankings.get(None, []) if word in with_replies]
+
+    def lookup(
+        self, history: List[Tuple[str, str]], max_results: int
+    ) -> List[Tuple[str, float]] | None:
+        """
+        Look up the ranking after a feedback history of at most one turn.
+
+        Returns:
+            The best max_results guesses with their elimination scores, or
+            None when the book cannot answer: the history is longer than one
+            turn, its opener is not in the book, or more results are wanted
+            than were stored
+        """
+        if len(history) > 1 or max_results > self.results:
+            return None
+        if not history:
+            key = None
+        else:
+            guess, feedback = history[0]
+            if len(feedback) != self.word_length:
+                return None
+            try:
+                key = (guess.lower(), parse_feedback(feedback))
+            except ValueError:
+                return None
+        ranking = self._rankings.get(key)
+        if ranking is None:
+            return None
+        return ranking[:max(max_results, 0)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Precompute the best openers and second guesses for a word list')
+    parser.add_argument('--words', default='words.csv',
+                       help='Path to CSV file containing possible words (default: words.csv)')
+    parser.add_argument('--answers',
+                       help='Path to CSV file of possible answers (default: every word)')
+    parser.add_argument('--output',
+                       help='Path of the book file to write (default: next to the word list, '
+                            'where the solver looks for it)')
+    parser.add_argument('--pattern-cache',
+                       help='Directory for the precomputed pattern table')
+    parser.add_argument('--openers', type=int, default=20,
+                       help='Number of openers to rank (default: 20)')
+    parser.add_argument('--reply-openers', type=int, default=5,
+                       help='Number of the best openers whose second turn is computed '
+                            '(default: 5)')
+    parser.add_argument('--results', type=int, default=20,
+                       help='Guesses kept per second-turn ranking (default: 20)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of processes used for scoring (default: 1)')
+    parser.add_argument('--length', type=int, default=5, choices=WORD_LENGTHS,
+                       help='Word length, from 4 to 8 (default: 5)')
+
+    args = parser.parse_args()
+
+    solver, book = build_book(args.words, args.answers, args.pattern_cache, args.openers,
+                              args.reply_openers, args.results, args.workers, args.length)
+    # Entries are served for up to the smaller of the two ranking lengths
+    results = min(args.openers, args.results)
+    data = serialize_book(book, solver.words, solver.answers, results)
+    output = args.output or opening_book_path(args.words, args.length)
+    with open(output, "wb") as file:
+        file.write(data)
+    print(f"Wrote {len(book)} rankings ({len(data)} bytes) to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Process-pool backend for scoring guess candidates on several cores.
+
+Word data lives in one shared memory block that every worker attaches to
+at startup, and the pattern table (when there is one) is memory-mapped
+from its cache file by each worker, so neither is ever pickled per task.
+The pool is started once and reused for every scoring call.
+"""
+
+import multiprocessing
+import weakref
+from array import array
+from multiprocessing import shared_memory
+from operator import itemgetter
+from typing import List
+
+from patterns import PatternTable, expected_elimination, pattern_codes
+from word_matrix import WordMatrix, packed_text
+
+# Per-process state installed by _init_worker
+_worker_words = None
+_worker_answers = None
+_worker_table = None
+
+
+def _init_worker(
+    shm_name: str, word_count: int, answer_count: int, word_length: int, table_path
+):
+    """Attach a worker process to the shared word lists and pattern table."""
+    global _worker_words, _worker_answers, _worker_table
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_words = WordMatrix(shm.buf, word_count, word_length)
+    # Keep the block attached for the lifetime of the worker
+    _worker_words.shm = shm
+    _worker_answers = _worker_words
+    if answer_count:
+        _worker_answers = WordMatrix(
+            shm.buf[word_count * word_length :], answer_count, word_length
+        )
+    if table_path is not None:
+        _worker_table = PatternTable(_worker_words, table_path, _worker_answers)
+
+
+def _score_chunk(guess_indices: bytes, answer_indices: bytes) -> List[float]:
+    """Score a chunk of guesses against the candidate answers of one call."""
+    guesses = array("I", guess_indices)
+    answers = array("I", answer_indices)
+    total_words = len(answers)
+    if _worker_table is not None:
+        gather = itemgetter(*answers) if total_words > 1 else lambda row: (row[answers[0]],)
+        return [
+            expected_elimination(gather(_worker_table.row(guess)), total_words)
+            for guess in guesses
+        ]
+    possible_words = [_worker_answers[i] for i in answers]
+    return [
+        expected_elimination(pattern_codes(_worker_words[guess], possible_words), total_words)
+        for guess in guesses
+    ]
+
+
+def _shutdown(pool, shm) -> None:
+    """Stop the workers and free the shared word block."""
+    pool.terminate()
+    pool.join()
+    shm.close()
+    shm.unlink()
+
+
+class ScoringPool:
+    """A reusable pool of worker processes sharing one word list."""
+
+    def __init__(
+        self,
+        words: List[str],
+        workers: int,
+        table_path: str | None = None,
+        answers: List[str] | None = None,
+    ):
+        """
+        Start the worker processes.
+
+        Args:
+            words: Guess list indexed by the guess indices of each call
+            workers: Number of worker processes
+            table_path: Pattern table file for the word list, if one exists
+            answers: Answer list indexed by the answer indices of each call,
+                when it is not the guess list itself
+        """
+        self.workers = workers
+        word_length = len(words[0]) if words else 0
+        if answers is words:
+            answers = None
+        packed = packed_text(words).encode("ascii")
+        if answers is not None:
+            packed += packed_text(answers).encode("ascii")
+        self._shm = shared_memory.SharedMemory(create=True, size=max(len(packed), 1))
+        self._shm.buf[: len(packed)] = packed
+        self._pool = multiprocessing.Pool(
+            workers,
+            initializer=_init_worker,
+            initargs=(
+                self._shm.name,
+                len(words),
+                len(answers) if answers is not None else 0,
+                word_length,
+                table_path,
+            ),
+        )
+        self._finalizer = weakref.finalize(self, _shutdown, self._pool, self._shm)
+
+    def elimination_scores(
+        self, guess_indices: List[int], answer_indices: List[int]
+    ) -> List[float]:
+        """
+        Score guesses against candidate answers, split across the workers.
+
+        Returns:
+            Elimination scores in the order of guess_indices
+        """
+        answers = array("I", answer_indices).tobytes()
+        chunk_size = max(1, -(-len(guess_indices) // (self.workers * 4)))
+        tasks = [
+            (array("I", guess_indices[i : i + chunk_size]).tobytes(), answers)
+            for i in range(0, len(guess_indices), chunk_size)
+        ]
+        scores = []
+        for chunk_scores in self._pool.starmap(_score_chunk, tasks):
+            scores.extend(chunk_scores)
+        return scores
+
+    def close(self) -> None:
+        """Stop the workers and release shared memory."""
+        self._finalizer()
@@ -0,0 +1,282 @@
+"""
+Integer feedback-pattern codes and the precomputed guess x answer pattern table.
+
+A pattern is encoded base-3 with one digit per position (gray=0, yellow=1,
+green=2, position 0 is the least significant digit). Patterns of words up to
+5 letters fit in a single byte (3^5 = 243); longer words, up to 10 letters,
+use 16-bit codes.
+"""
+
+import hashlib
+import mmap
+import os
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence
+
+from word_matrix import packed_text
+
+GRAY = 0
+YELLOW = 1
+GREEN = 2
+
+_TABLE_MAGIC = b"WSPT"
+_TABLE_VERSION = 3
+_HEADER_SIZE = 16
+
+
+def all_green_code(word_length: int = 5) -> int:
+    """Return the code of the pattern where every position is green."""
+    return 3**word_length - 1
+
+
+def code_size(word_length: int) -> int:
+    """Number of bytes per pattern code for a word length (1 or 2)."""
+    if 3**word_length <= 1 << 8:
+        return 1
+    if 3**word_length <= 1 << 16:
+        return 2
+    raise ValueError(f"Words of {word_length} letters are not supported")
+
+
+_FEEDBACK_DIGITS = {"b": GRAY, "y": YELLOW, "g": GREEN}
+_DIGIT_FEEDBACK = "byg"
+
+
+def parse_feedback(feedback: str) -> int:
+    """
+    Convert a feedback string such as "bygbb" to its pattern code.
+
+    Each character is 'g' (green), 'y' (yellow) or 'b' (gray, also accepted
+    as 'x', '.' or '-'), case-insensitive.
+    """
+    code = 0
+    weight = 1
+    for char in feedback.lower():
+        if char in "x.-":
+            char = "b"
+        if char not in _FEEDBACK_DIGITS:
+            raise ValueError(f"Invalid feedback character {char!r} in {feedback!r}")
+        code += _FEEDBACK_DIGITS[char] * weight
+        weight *= 3
+    return code
+
+
+def format_feedback(code: int, word_length: int = 5) -> str:
+    """Convert a pattern code back to its feedback string, e.g. "bygbb"."""
+    chars = []
+    for _ in range(word_length):
+        code, digit = divmod(code, 3)
+        chars.append(_DIGIT_FEEDBACK[digit])
+    return "".join(chars)
+
+
+def get_pattern_code(guess: str, answer: str) -> int:
+    """
+    Compute the base-3 feedback code for a guess against an answer.
+
+    Duplicate letters are handled the same way as the game: greens are
+    assigned first, then yellows left to right while unmatched copies remain.
+    """
+    remaining = [a for g, a in zip(guess, answer) if g != a]
+    code = 0
+    weight = 1
+    for g, a in zip(guess, answer):
+        if g == a:
+            code += GREEN * weight
+        elif g in remaining:
+            code += YELLOW * weight
+            remaining.remove(g)
+        weight *= 3
+    return code
+
+
+def projection_keys(guess: str, answers: Sequence[str]) -> List[str]:
+    """
+    Project answers onto the letters of a guess.
+
+    Every letter not in the guess becomes '.'. The feedback pattern only
+    depends on this projection, so answers with the same projection always
+    share a pattern, though different projections may share one too.
+    """
+    word_length = len(guess)
+    guess_letters = set(guess)
+    projection = {
+        code: "." for code in range(ord("a"), ord("z") + 1) if chr(code) not in guess_letters
+    }
+    projected = packed_text(answers).translate(projection)
+    return [projected[i : i + word_length] for i in range(0, len(projected), word_length)]
+
+
+def pattern_codes(guess: str, answers: Sequence[str]) -> Sequence[int]:
+    """
+    Compute the feedback codes of one guess against many answers.
+
+    Answers are first projected onto the letters of the guess (see
+    projection_keys). Projections repeat heavily, so each distinct one is
+    evaluated only once.
+
+    Returns:
+        bytes for words of up to 5 letters, an array of unsigned 16-bit codes
+        for longer words
+    """
+    word_length = len(guess)
+    if not answers:
+        return b"" if code_size(word_length) == 1 else array("H")
+    keys = projection_keys(guess, answers)
+    cache: Dict[str, int] = {}
+    for key in set(keys):
+        cache[key] = get_pattern_code(guess, key)
+    if code_size(word_length) == 1:
+        return bytes(map(cache.__getitem__, keys))
+    return array("H", map(cache.__getitem__, keys))
+
+
+def expected_elimination(codes: Iterable[int], total_words: int) -> float:
+    """
+    Expected number of answers a guess eliminates, given its feedback codes.
+
+    Args:
+        codes: Feedback code of the guess against each possible answer
+        total_words: Number of possible answers (the length of codes)
+    """
+    if total_words <= 1:
+        return 0.0
+    pattern_counts = Counter(codes)
+    expected_remaining = (
+        sum(count * count for count in pattern_counts.values()) / total_words
+    )
+    return total_words - expected_remaining
+
+
+def word_list_hash(words: Sequence[str]) -> str:
+    """Return a stable hash identifying an ordered word list."""
+    digest = hashlib.sha256()
+    for word in words:
+        digest.update(word.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+class PatternTable:
+    """
+    Precomputed feedback codes for every (guess, answer) pair of a word list.
+
+    The table is stored row-major (one row per guess, one code per answer,
+    of one or two bytes depending on the word length) in a cache file named after the hash of the guess and answer lists, and
+    memory-mapped on later loads so every process on the machine shares the
+    same pages. The answers may be a smaller list than the guesses, in which
+    case the table is only guesses x answers in size.
+    """
+
+    def __init__(self, words: Sequence[str], path: str, answers: Sequence[str] | None = None):
+        """
+        Memory-map an existing table file.
+
+        Args:
+            words: The guess list the table was built for, in row order
+            path: Path to the table file
+            answers: The answer list, in column order (defaults to words)
+        """
+        self.words = words
+        self.answers = words if answers is None else answers
+        self.path = path
+        self.size = len(self.answers)
+        self.code_size = code_size(len(words[0]) if words else 5)
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = self._mmap[:_HEADER_SIZE]
+        if (
+            header[:4] != _TABLE_MAGIC
+            or header[4] != _TABLE_VERSION
+            or header[5] != self.code_size
+            or int.from_bytes(header[8:12], "little") != len(words)
+            or int.from_bytes(header[12:16], "little") != self.size
+            or len(self._mmap) != _HEADER_SIZE + len(words) * self.size * self.code_size
+        ):
+            self.close()
+            raise ValueError(f"{path} is not a pattern table for this word list")
+        self._view = memoryview(self._mmap)[_HEADER_SIZE:]
+        self._codes = self._view.cast("H") if self.code_size == 2 else self._view
+
+    @staticmethod
+    def cache_path(
+        words: Sequence[str], cache_dir: str, answers: Sequence[str] | None = None
+    ) -> str:
+        """Return the cache file path for a guess list and answer list."""
+        digest = word_list_hash(words)[:16]
+        if answers is not None and answers is not words:
+            digest += "-" + word_list_hash(answers)[:16]
+        return os.path.join(cache_dir, f"patterns-{digest}.bin")
+
+    @classmethod
+    def build(
+        cls, words: Sequence[str], path: str, answers: Sequence[str] | None = None
+    ) -> None:
+        """
+        Compute the full table for a guess list and write it to path.
+
+        Rows are streamed to a temporary file which is renamed into place, so
+        concurrent builders never observe a partially written table.
+        """
+        if answers is None:
+            answers = words
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        width = code_size(len(words[0]) if words else 5)
+        header = (
+            bytes([*_TABLE_MAGIC, _TABLE_VERSION, width, 0, 0])
+            + len(words).to_bytes(4, "little")
+            + len(answers).to_bytes(4, "little")
+        )
+        try:
+            with open(tmp_path, "wb") as file:
+                file.write(header)
+                for guess in words:
+                    file.write(pattern_codes(guess, answers))
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def load_or_build(
+        cls, words: Sequence[str], cache_dir: str, answers: Sequence[str] | None = None
+    ) -> "PatternTable":
+        """
+        Load the cached table for a word list, building it first if needed.
+
+        Args:
+            words: Guess list (also the answer list unless answers is given)
+            cache_dir: Directory holding pattern table files
+            answers: Separate answer list, a subset of words
+
+        Returns:
+            A memory-mapped PatternTable
+        """
+        path = cls.cache_path(words, cache_dir, answers)
+        if os.path.exists(path):
+            try:
+                return cls(words, path, answers)
+            except ValueError:
+                pass
+        cls.build(words, path, answers)
+        return cls(words, path, answers)
+
+    def row(self, guess_index: int) -> memoryview:
+        """Return the codes of one guess against every answer, without copying."""
+        start = guess_index * self.size
+        return self._codes[start : start + self.size]
+
+    def close(self) -> None:
+        """Release the memory map and file handle."""
+        for name in ("_codes", "_view"):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+                setattr(self, name, None)
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
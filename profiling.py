@@ -0,0 +1,68 @@
+"""
+Per-phase timing and counters for one solve() call.
+"""
+
+import time
+from typing import Dict, List, Tuple
+
+
+class SolveProfile:
+    """
+    Wall time, candidate counts and pattern evaluations per solve() phase.
+
+    Phases are recorded in the order they ran. Each phase records the number
+    of candidates going in and coming out, e.g. the filter phase goes from
+    the full word list to the possible answers.
+    """
+
+    def __init__(self):
+        self.phases: List[Tuple[str, float, int, int]] = []
+        self.pattern_evaluations = 0
+        self.pruned_guesses = 0
+        self.cache_hit = False
+        self._start = time.perf_counter()
+        self._phase_start = self._start
+
+    def phase(self, name: str, candidates_in: int, candidates_out: int) -> None:
+        """Close the current phase, timed from the end of the previous one."""
+        now = time.perf_counter()
+        self.phases.append((name, now - self._phase_start, candidates_in, candidates_out))
+        self._phase_start = now
+
+    @property
+    def total_time(self) -> float:
+        """Wall time from the start of the call to the end of the last phase."""
+        return self._phase_start - self._start
+
+    def as_dict(self) -> Dict:
+        """Structured form of the profile, suitable for JSON."""
+        return {
+            "total_seconds": self.total_time,
+            "cache_hit": self.cache_hit,
+            "pattern_evaluations": self.pattern_evaluations,
+            "pruned_guesses": self.pruned_guesses,
+            "phases": [
+                {
+                    "name": name,
+                    "seconds": seconds,
+                    "candidates_in": candidates_in,
+                    "candidates_out": candidates_out,
+                }
+                for name, seconds, candidates_in, candidates_out in self.phases
+            ],
+        }
+
+    def format(self) -> str:
+        """Human-readable table of the profile."""
+        lines = [f"{'phase':<12} {'time (ms)':>10} {'in':>8} {'out':>8}"]
+        for name, seconds, candidates_in, candidates_out in self.phases:
+            lines.append(
+                f"{name:<12} {seconds * 1000:>10.3f} {candidates_in:>8} {candidates_out:>8}"
+            )
+        lines.append(f"{'total':<12} {self.total_time * 1000:>10.3f}")
+        lines.append(f"pattern evaluations: {self.pattern_evaluations}")
+        if self.pruned_guesses:
+            lines.append(f"guesses pruned by bounds: {self.pruned_guesses}")
+        if self.cache_hit:
+            lines.append("served from result cache")
+        return "\n".join(lines)
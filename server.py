@@ -0,0 +1,220 @@
+"""
+Local asyncio HTTP service around one warm WordleSolver.
+
+Endpoints (JSON in, JSON out):
+    GET  /stats        word list statistics, answered on the event loop
+    POST /solve        body as in batch mode, returns ranked results
+    POST /best-guess   body as in batch mode, returns the single best guess
+
+Scoring runs on a thread pool so slow requests never block the event loop,
+and identical requests arriving while one is already being computed wait
+for that computation instead of starting another.
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Tuple
+
+from cli import parse_batch_request
+from wordle_solver import WordleSolver
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+_MAX_BODY = 1024 * 1024
+_BEST_GUESS_ARGS = (
+    "correct_positions",
+    "correct_letters",
+    "incorrect_letters",
+    "wrong_positions",
+    "feedback",
+    "hard_mode",
+)
+
+
+class HTTPError(Exception):
+    """An error answered with a JSON body and the given status code."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class WordleServer:
+    """Minimal HTTP/1.1 server answering solver queries."""
+
+    def __init__(self, solver: WordleSolver, threads: int = 4, default_max_results: int = 20):
+        """
+        Args:
+            solver: Warm solver shared by every request
+            threads: Size of the thread pool used for scoring
+            default_max_results: max_results used when a request omits it
+        """
+        self.solver = solver
+        self.default_max_results = default_max_results
+        self._executor = ThreadPoolExecutor(threads)
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self._server: asyncio.AbstractServer | None = None
+        self.computations = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> Tuple[str, int]:
+        """
+        Start listening.
+
+        Returns:
+            The bound (host, port); pass port 0 to pick a free port
+        """
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self) -> None:
+        """Serve until cancelled."""
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop listening and shut down the thread pool."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=False)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer requests on one connection until it is closed."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "malformed request line"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" and (
+                    version == "HTTP/1.1" or connection == "keep-alive"
+                )
+                try:
+                    length = int(headers.get("content-length") or 0)
+                    if length < 0:
+                        raise ValueError
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "invalid Content-Length"}, False)
+                    break
+                if length > _MAX_BODY:
+                    await self._respond(writer, 413, {"error": "request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, payload = 200, await self.dispatch(method, path, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:  # keep serving other requests
+                    status, payload = 500, {"error": str(e)}
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(
+        self, writer: asyncio.StreamWriter, status: int, payload: Dict, keep_alive: bool
+    ) -> None:
+        """Write one JSON response."""
+        body = json.dumps(payload).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> Dict:
+        """Route one request and return its JSON payload."""
+        path = path.split("?", 1)[0].rstrip("/")
+        if path == "/stats":
+            if method != "GET":
+                raise HTTPError(405, "use GET for /stats")
+            return self.solver.get_stats()
+        if path not in ("/solve", "/best-guess"):
+            raise HTTPError(404, f"unknown endpoint {path}")
+        if method != "POST":
+            raise HTTPError(405, f"use POST for {path}")
+
+        try:
+            request = json.loads(body or b"{}")
+            kwargs = parse_batch_request(request, self.default_max_results)
+        except (ValueError, TypeError, AttributeError) as e:
+            raise HTTPError(400, str(e))
+        key = (path, _canonical(kwargs))
+        if path == "/best-guess":
+            constraints = {name: kwargs[name] for name in _BEST_GUESS_ARGS}
+            guess = await self._coalesced(
+                key, lambda: self.solver.get_best_guess(**constraints)
+            )
+            return {"guess": guess}
+        results = await self._coalesced(key, lambda: self.solver.solve(**kwargs))
+        return {"results": [{"word": word, "score": score} for word, score in results]}
+
+    async def _coalesced(self, key: Tuple, compute: Callable):
+        """Run compute on the thread pool, sharing one run between identical requests."""
+        future = self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            self.computations += 1
+            future = loop.run_in_executor(self._executor, compute)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+
+def _canonical(value):
+    """Hashable, order-insensitive form of parsed request arguments."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _canonical(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset, list)):
+        return tuple(sorted((_canonical(v) for v in value), key=repr))
+    if isinstance(value, tuple):
+        return tuple(_canonical(v) for v in value)
+    return value
+
+
+def run_server(solver: WordleSolver, host: str, port: int, threads: int) -> None:
+    """Serve until interrupted."""
+
+    async def serve():
+        server = WordleServer(solver, threads)
+        bound_host, bound_port = await server.start(host, port)
+        print(f"Serving on http://{bound_host}:{bound_port}")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
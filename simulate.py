@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Full-game simulation over the answer list.
+
+Every game is played by get_best_guess() against one answer, feeding back
+the true feedback after each guess, until it is solved or runs out of
+guesses. Games run on a pool of processes, each with its own solver, and
+per-game results are streamed as they finish. The summary (guess-count
+distribution, failure rate, per-turn latency percentiles and throughput)
+can be compared against a stored baseline, which makes a run an
+acceptance gate for both the quality and the speed of a solver change.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+from patterns import all_green_code, format_feedback, get_pattern_code
+from wordle_solver import WORD_LENGTHS, WordleSolver
+
+# Per-turn latency percentiles reported
+PERCENTILES = (50, 90, 99)
+
+_worker_solver = None
+
+
+def play_game(
+    solver: WordleSolver, answer: str, max_guesses: int = 6, hard_mode: bool = False
+) -> Dict:
+    """
+    Play one game with the solver's best guess at every turn.
+
+    Returns:
+        Dict with the answer, the guesses played, whether the game was
+        solved, the seconds each get_best_guess() call took and whether
+        each was answered from the solver's result cache
+    """
+    solved = all_green_code(len(answer))
+    history = []
+    turn_seconds = []
+    turn_cached = []
+    is_solved = False
+    while len(history) < max_guesses:
+        hits = solver.cache_info()["hits"]
+        start = time.perf_counter()
+        guess = solver.get_best_guess(feedback=history, hard_mode=hard_mode)
+        turn_seconds.append(time.perf_counter() - start)
+        turn_cached.append(solver.cache_info()["hits"] > hits)
+        if guess is None:
+            break
+        code = get_pattern_code(guess, answer)
+        history.append((guess, format_feedback(code, len(answer))))
+        if code == solved:
+            is_solved = True
+            break
+    return {
+        "answer": answer,
+        "guesses": [guess for guess, _ in history],
+        "solved": is_solved,
+        "turn_seconds": turn_seconds,
+        "turn_cached": turn_cached,
+    }
+
+
+def _init_worker(
+    words_file: str, pattern_cache: str | None, answers_file: str | None, word_length: int
+) -> None:
+    """Load one solver per simulation worker."""
+    global _worker_solver
+    _worker_solver = WordleSolver(words_file, pattern_cache=pattern_cache,
+                                  answers_file=answers_file, word_length=word_length)
+
+
+def _play_worker(answer: str, max_guesses: int, hard_mode: bool) -> Dict:
+    """Play one game with the worker's solver."""
+    return play_game(_worker_solver, answer, max_guesses, hard_mode)
+
+
+def sample_answers(answers: Sequence[str], sample: int | None, seed: int = 0) -> List[str]:
+    """A reproducible random subset of the answers in list order, or all of them."""
+    if sample is None or sample >= len(answers):
+        return list(answers)
+    chosen = sorted(random.Random(seed).sample(range(len(answers)), sample))
+    return [answers[i] for i in chosen]
+
+
+def simulate(
+    answers: Iterable[str],
+    words_file: str = "words.csv",
+    answers_file: str | None = None,
+    pattern_cache: str | None = None,
+    word_length: int = 5,
+    workers: int = 1,
+    max_guesses: int = 6,
+    hard_mode: bool = False,
+    solver: WordleSolver | None = None,
+) -> Iterator[Dict]:
+    """
+    Play a game against each answer and yield the results as games finish.
+
+    With one worker, games are played in this process (on solver when one
+    is given). With more, each worker process loads its own solver, and at
+    most a small window of games is in flight so results stream steadily.
+
+    Returns:
+        Iterator over play_game() results, in completion order
+    """
+    if workers <= 1:
+        if solver is None:
+            solver = WordleSolver(words_file, pattern_cache=pattern_cache,
+                                  answers_file=answers_file, word_length=word_length)
+        for answer in answers:
+            yield play_game(solver, answer, max_guesses, hard_mode)
+        return
+
+    window = workers * 4
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(words_file, pattern_cache, answers_file,
+                                       word_length)) as executor:
+        pending = set()
+        for answer in answers:
+            pending.add(executor.submit(_play_worker, answer, max_guesses, hard_mode))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in wait(pending).done:
+            yield future.result()
+
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    """Nearest-rank percentile of values (0.0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+
+def _latency(turn_seconds: Sequence[float]) -> Dict[str, float]:
+    """Latency percentiles and maximum of a set of turns."""
+    latency = {f"p{percent}": percentile(turn_seconds, percent) for percent in PERCENTILES}
+    latency["max"] = max(turn_seconds, default=0.0)
+    return latency
+
+
+def summarize(games: Iterable[Dict], seconds: float, max_guesses: int = 6) -> Dict:
+    """
+    Aggregate game results.
+
+    Args:
+        games: play_game() results
+        seconds: Wall time of the whole run
+        max_guesses: Guess limit the games were played with
+
+    Returns:
+        Dict with the number of games, the guess-count distribution of
+        solved games, the failure count and rate, the mean guesses of
+        solved games, per-turn latency percentiles in seconds and the
+        throughput in games per second. Turns answered from the result
+        cache are counted and timed apart (cached_turns,
+        cached_turn_latency), so turn_latency covers computed turns only.
+    """
+    distribution = {count: 0 for count in range(1, max_guesses + 1)}
+    failures = 0
+    turn_seconds = []
+    cached_seconds = []
+    for game in games:
+        for elapsed, cached in zip(game["turn_seconds"], game["turn_cached"]):
+            (cached_seconds if cached else turn_seconds).append(elapsed)
+        if game["solved"]:
+            distribution[len(game["guesses"])] += 1
+        else:
+            failures += 1
+    solved = sum(distribution.values())
+    total = solved + failures
+    return {
+        "games": total,
+        "distribution": distribution,
+        "failures": failures,
+        "failure_rate": failures / total if total else 0.0,
+        "mean_guesses": (
+            sum(count * number for count, number in distribution.items()) / solved
+            if solved else 0.0
+        ),
+        "turns": len(turn_seconds),
+        "turn_latency": _latency(turn_seconds),
+        "cached_turns": len(cached_seconds),
+        "cached_turn_latency": _latency(cached_seconds),
+        "seconds": seconds,
+        "games_per_second": total / seconds if seconds > 0 else 0.0,
+    }
+
+
+def compare_summaries(current: Dict, baseline: Dict, threshold: float) -> List[Dict]:
+    """
+    Compare a summary against a baseline summary of the same games.
+
+    Quality regresses on any increase in mean guesses or failure rate;
+    speed regresses when throughput drops, or the median latency of
+    computed (uncached) turns grows, by more than threshold (a fraction, e.g. 0.25 for 25%).
+
+    Returns:
+        One entry per metric, with both values and whether it regressed
+    """
+    metrics = (
+        ("mean_guesses", current["mean_guesses"], baseline["mean_guesses"], 0.0, True),
+        ("failure_rate", current["failure_rate"], baseline["failure_rate"], 0.0, True),
+        ("games_per_second", current["games_per_second"], baseline["games_per_second"],
+         threshold, False),
+        ("turn_latency_p50", current["turn_latency"]["p50"], baseline["turn_latency"]["p50"],
+         threshold, True),
+    )
+    comparisons = []
+    for name, value, base, tolerance, lower_is_better in metrics:
+        if lower_is_better:
+            regressed = value > base * (1 + tolerance) + 1e-12
+        else:
+            regressed = value < base * (1 - tolerance) - 1e-12
+        comparisons.append({
+            "name": name, "baseline": base, "current": value, "regressed": regressed
+        })
+    return comparisons
+
+
+def format_summary(summary: Dict) -> str:
+    """Human-readable report of a summary."""
+    games = summary["games"]
+    lines = [f"{games} games, {summary['failures']} failed "
+             f"({summary['failure_rate']:.2%}), mean {summary['mean_guesses']:.4f} guesses"]
+    width = max(summary["distribution"].values(), default=0)
+    for count, number in summary["distribution"].items():
+        bar = "#" * (round(40 * number / width) if width else 0)
+        lines.append(f"{count:>6} {number:>7}  {bar}")
+    lines.append(f"{'failed':>6} {summary['failures']:>7}")
+    for label, turns, latency in (
+        ("computed", summary["turns"], summary["turn_latency"]),
+        ("cached", summary["cached_turns"], summary["cached_turn_latency"]),
+    ):
+        lines.append(f"{turns} {label} turns: " + ", ".join(
+            f"{name} {seconds * 1000:.2f} ms" for name, seconds in latency.items()
+        ))
+    lines.append(f"{summary['turns'] + summary['cached_turns']} turns in "
+                 f"{summary['seconds']:.2f} s, {summary['games_per_second']:.2f} games/s")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Play the solver against every answer and report game length and speed')
+    parser.add_argument('--words', default='words.csv',
+                       help='Path to CSV file containing possible words (default: words.csv)')
+    parser.add_argument('--answers',
+                       help='Path to CSV file of possible answers (default: every word)')
+    parser.add_argument('--length', type=int, default=5, choices=WORD_LENGTHS,
+                       help='Word length, from 4 to 8 (default: 5)')
+    parser.add_argument('--pattern-cache',
+                       help='Directory for the precomputed pattern table')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of processes playing games (default: 1)')
+    parser.add_argument('--sample', type=int,
+                       help='Play against this many randomly chosen answers (default: all)')
+    parser.add_argument('--seed', type=int, default=0,
+                       help='Random seed for --sample (default: 0)')
+    parser.add_argument('--max-guesses', type=int, default=6,
+                       help='Guesses allowed before a game counts as failed (default: 6)')
+    parser.add_argument('--hard-mode', action='store_true',
+                       help='Play every game in hard mode')
+    parser.add_argument('--games',
+                       help="Stream one JSON line per finished game to this file ('-' for stdout)")
+    parser.add_argument('--output',
+                       help='Write the summary as JSON to this file')
+    parser.add_argument('--baseline',
+                       help='Compare against a summary stored in this JSON file')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                       help='Allowed slowdown before speed counts as a regression '
+                            '(default: 0.25 = 25%%)')
+    parser.add_argument('--save-baseline', action='store_true',
+                       help='Write the summary to the --baseline file instead of comparing')
+
+    args = parser.parse_args()
+
+    solver = WordleSolver(args.words, pattern_cache=args.pattern_cache,
+                          answers_file=args.answers, word_length=args.length)
+    answers = sample_answers(solver.answers, args.sample, args.seed)
+    if args.workers > 1:
+        solver.close()
+        solver = None
+
+    stream = None
+    if args.games:
+        stream = sys.stdout if args.games == '-' else open(args.games, 'w', encoding='utf-8')
+    results = []
+    start = time.perf_counter()
+    try:
+        for game in simulate(answers, args.words, args.answers, args.pattern_cache,
+                             args.length, args.workers, args.max_guesses, args.hard_mode,
+                             solver):
+            results.append(game)
+            if stream is not None:
+                print(json.dumps(game), file=stream, flush=True)
+    finally:
+        if stream is not None and stream is not sys.stdout:
+            stream.close()
+    summary = summarize(results, time.perf_counter() - start, args.max_guesses)
+    summary["meta"] = {
+        "words_file": args.words,
+        "answers_file": args.answers,
+        "sample": args.sample,
+        "seed": args.seed,
+        "hard_mode": args.hard_mode,
+        "workers": args.workers,
+    }
+    print(format_summary(summary))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(summary, file, indent=2)
+
+    if args.baseline and args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(summary, file, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        comparisons = compare_summaries(summary, baseline, args.threshold)
+        print(f"\nComparison against {args.baseline} (threshold {args.threshold:.0%}):")
+        for entry in comparisons:
+            flag = "REGRESSION" if entry["regressed"] else "ok"
+            print(f"{entry['name']:20s} {entry['baseline']:>12.4f} -> {entry['current']:>12.4f}  "
+                  f"{flag}")
+        if any(entry["regressed"] for entry in comparisons):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
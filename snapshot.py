@@ -0,0 +1,164 @@
+"""
+Binary snapshot of a loaded word list, its frequency counts and bitset index.
+
+A snapshot is written next to the source word list and is only used while
+the SHA-256 of the source file still matches the one recorded in it.
+
+Layout (little-endian):
+    header: magic "WSNP", version u8, word length u8, reserved u16,
+            word count u32, mask count u32, sha256 of the source (32 bytes)
+    words:  word count * word length ASCII bytes
+    counts: 26 u32 letter counts, then word length * 26 u32 position counts
+    masks:  per mask: kind u8 (0 = position, 1 = count), position or count u8,
+            letter u8, then the mask as ceil(word count / 8) bytes
+"""
+
+import hashlib
+import os
+import struct
+from array import array
+from typing import Dict, List, Tuple
+
+from word_matrix import WordMatrix, packed_text
+
+_MAGIC = b"WSNP"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBBHII32s")
+_MASK_HEADER = struct.Struct("<BBB")
+_POSITION_MASK = 0
+_COUNT_MASK = 1
+_ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+
+def snapshot_path(words_file: str, word_length: int = 5) -> str:
+    """Return the snapshot path for a word list file loaded at a word length."""
+    if word_length == 5:
+        return words_file + ".snapshot"
+    return f"{words_file}.{word_length}.snapshot"
+
+
+def source_digest(words_file: str) -> bytes:
+    """SHA-256 of the raw contents of a word list file."""
+    with open(words_file, "rb") as file:
+        return hashlib.sha256(file.read()).digest()
+
+
+def write_snapshot(
+    path: str,
+    digest: bytes,
+    words: List[str],
+    position_masks: Dict[int, Dict[str, int]],
+    count_masks: Dict[str, List[int]],
+) -> bool:
+    """
+    Write a snapshot atomically.
+
+    Returns:
+        False when the word list cannot be snapshotted (non a-z letters or
+        mixed lengths) or the file cannot be written
+    """
+    word_length = len(words[0]) if words else 0
+    packed = packed_text(words)
+    if len(packed) != word_length * len(words) or packed.strip(_ALPHABET):
+        return False
+
+    letter_counts = array("I", (packed.count(letter) for letter in _ALPHABET))
+    position_counts = array("I")
+    for pos in range(word_length):
+        column = packed[pos::word_length]
+        position_counts.extend(column.count(letter) for letter in _ALPHABET)
+
+    mask_size = (len(words) + 7) // 8
+    masks = []
+    for pos, letter_masks in position_masks.items():
+        for letter, mask in letter_masks.items():
+            masks.append((_POSITION_MASK, pos, letter, mask))
+    for letter, letter_masks in count_masks.items():
+        for count, mask in enumerate(letter_masks[1:], 1):
+            masks.append((_COUNT_MASK, count, letter, mask))
+
+    chunks = [
+        _HEADER.pack(_MAGIC, _VERSION, word_length, 0, len(words), len(masks), digest),
+        packed.encode("ascii"),
+        letter_counts.tobytes(),
+        position_counts.tobytes(),
+    ]
+    for kind, number, letter, mask in masks:
+        chunks.append(_MASK_HEADER.pack(kind, number, ord(letter)))
+        chunks.append(mask.to_bytes(mask_size, "little"))
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as file:
+            file.write(b"".join(chunks))
+        os.replace(tmp_path, path)
+    except OSError:
+        return False
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return True
+
+
+def read_snapshot(path: str, digest: bytes) -> Dict | None:
+    """
+    Load a snapshot in a single read.
+
+    Returns:
+        None when the snapshot is missing, unreadable or stale; otherwise a
+        dict with words (a WordMatrix over the file's letters), letter_counts,
+        position_counts, position_masks and count_masks
+    """
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except OSError:
+        return None
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, word_length, _, word_count, mask_count, stored_digest = (
+        _HEADER.unpack_from(data, 0)
+    )
+    if magic != _MAGIC or version != _VERSION or stored_digest != digest:
+        return None
+
+    offset = _HEADER.size
+    words = WordMatrix(data[offset : offset + word_count * word_length], word_count, word_length)
+    offset += word_count * word_length
+
+    counts = array("I")
+    counts.frombytes(data[offset : offset + 4 * 26 * (1 + word_length)])
+    offset += 4 * 26 * (1 + word_length)
+    letter_counts = dict(zip(_ALPHABET, counts[:26]))
+    position_counts = {
+        pos: dict(zip(_ALPHABET, counts[26 * (pos + 1) : 26 * (pos + 2)]))
+        for pos in range(word_length)
+    }
+
+    mask_size = (word_count + 7) // 8
+    position_masks: Dict[int, Dict[str, int]] = {}
+    count_mask_entries: List[Tuple[str, int, int]] = []
+    for _ in range(mask_count):
+        kind, number, letter_code = _MASK_HEADER.unpack_from(data, offset)
+        offset += _MASK_HEADER.size
+        mask = int.from_bytes(data[offset : offset + mask_size], "little")
+        offset += mask_size
+        if kind == _POSITION_MASK:
+            position_masks.setdefault(number, {})[chr(letter_code)] = mask
+        else:
+            count_mask_entries.append((chr(letter_code), number, mask))
+    if offset != len(data) or len(words.data) != word_count * word_length:
+        return None
+
+    all_mask = (1 << word_count) - 1
+    count_masks: Dict[str, List[int]] = {}
+    for letter, number, mask in sorted(count_mask_entries):
+        count_masks.setdefault(letter, [all_mask]).append(mask)
+
+    return {
+        "words": words,
+        "letter_counts": letter_counts,
+        "position_counts": position_counts,
+        "position_masks": position_masks,
+        "count_masks": count_masks,
+    }
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Offline precomputation of the solver's full decision tree for one opener.
+
+Building walks every reachable game state (the opener, then the solver's
+best guess for every feedback path) and serializes the result to a compact
+binary file. Loading the file lets WordleSolver answer get_best_guess for
+any on-tree feedback history by walking a few nodes, with no scoring.
+
+Binary layout (little-endian):
+    header: magic "WSST", version u8, word length u8, reserved u16,
+            node count u32, word count u32, sha256 of the word list (32 bytes),
+            sha256 of the answer list (32 bytes)
+    node:   guess index u32, remaining candidates u32, child count u16,
+            then per child (sorted by code): feedback code u16, node offset u32
+The root node starts right after the header.
+"""
+
+import argparse
+import mmap
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from patterns import all_green_code, parse_feedback, word_list_hash
+from wordle_solver import WORD_LENGTHS, WordleSolver
+
+_MAGIC = b"WSST"
+_VERSION = 2
+_HEADER = struct.Struct("<4sBBHII32s32s")
+_NODE = struct.Struct("<IIH")
+_CHILD = struct.Struct("<HI")
+
+
+def _build_node(solver: WordleSolver, guess: str, candidates: List[str]) -> Dict:
+    """Recursively build the subtree for a state where guess is played next."""
+    node = {"guess": guess, "remaining": len(candidates), "children": {}}
+    partition: Dict[int, List[str]] = {}
+    for word, code in zip(candidates, solver.get_pattern_codes(guess, candidates)):
+        partition.setdefault(code, []).append(word)
+    solved = all_green_code(len(guess))
+    for code, bucket in sorted(partition.items()):
+        if code == solved:
+            continue
+        next_guess = solver.rank_candidates(bucket, max_results=1)[0][0]
+        node["children"][code] = _build_node(solver, next_guess, bucket)
+    return node
+
+
+_worker_solver = None
+
+
+def _init_worker(
+    words_file: str,
+    pattern_cache: str | None,
+    word_length: int = 5,
+    answers_file: str | None = None,
+) -> None:
+    """Load one solver per build worker."""
+    global _worker_solver
+    _worker_solver = WordleSolver(words_file, pattern_cache=pattern_cache,
+                                  answers_file=answers_file, word_length=word_length)
+
+
+def _build_subtree(candidates: List[str]) -> Dict:
+    """Build the subtree for one first-turn feedback bucket in a worker."""
+    guess = _worker_solver.rank_candidates(candidates, max_results=1)[0][0]
+    return _build_node(_worker_solver, guess, candidates)
+
+
+def build_tree(
+    words_file: str,
+    opener: str,
+    pattern_cache: str | None = None,
+    workers: int = 1,
+    word_length: int = 5,
+    answers_file: str | None = None,
+) -> Tuple[WordleSolver, Dict]:
+    """
+    Walk the full decision tree for an opener.
+
+    Subtrees below the first guess are independent, so with several workers
+    each first-turn feedback bucket is built in its own process. With an
+    answers file, the tree covers that answer pool.
+
+    Returns:
+        The solver used for the root, and the tree as nested dicts
+    """
+    solver = WordleSolver(words_file, pattern_cache=pattern_cache,
+                          answers_file=answers_file, word_length=word_length)
+    opener = opener.lower()
+    if opener not in solver._word_index:
+        raise ValueError(f"Opener {opener!r} is not in the word list")
+    if workers <= 1:
+        return solver, _build_node(solver, opener, list(solver.answers))
+
+    root = {"guess": opener, "remaining": len(solver.answers), "children": {}}
+    partition: Dict[int, List[str]] = {}
+    for word, code in zip(solver.answers, solver.get_pattern_codes(opener, solver.answers)):
+        partition.setdefault(code, []).append(word)
+    partition.pop(all_green_code(len(opener)), None)
+    codes = sorted(partition)
+    with ProcessPoolExecutor(
+        workers,
+        initializer=_init_worker,
+        initargs=(words_file, pattern_cache, word_length, answers_file),
+    ) as executor:
+        subtrees = executor.map(_build_subtree, [partition[code] for code in codes])
+        for code, subtree in zip(codes, subtrees):
+            root["children"][code] = subtree
+    return solver, root
+
+
+def serialize_tree(root: Dict, words: List[str], answers: List[str] | None = None) -> bytes:
+    """
+    Encode a tree of nested dicts in the binary format described above.
+
+    answers is the answer pool the tree was built for, when it is not words.
+    """
+    if answers is None:
+        answers = words
+    word_index = {word: i for i, word in enumerate(words)}
+    nodes: List[Dict] = []
+    offsets: List[int] = []
+    offset = _HEADER.size
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        offsets.append(offset)
+        offset += _NODE.size + _CHILD.size * len(node["children"])
+        stack.extend(node["children"][code] for code in sorted(node["children"], reverse=True))
+    offset_of = {id(node): node_offset for node, node_offset in zip(nodes, offsets)}
+
+    word_length = len(words[0]) if words else 0
+    chunks = [
+        _HEADER.pack(
+            _MAGIC, _VERSION, word_length, 0, len(nodes), len(words),
+            bytes.fromhex(word_list_hash(words)), bytes.fromhex(word_list_hash(answers)),
+        )
+    ]
+    for node in nodes:
+        children = sorted(node["children"].items())
+        chunks.append(_NODE.pack(word_index[node["guess"]], node["remaining"], len(children)))
+        for code, child in children:
+            chunks.append(_CHILD.pack(code, offset_of[id(child)]))
+    return b"".join(chunks)
+
+
+class StrategyTree:
+    """A memory-mapped precomputed strategy tree."""
+
+    def __init__(self, path: str, words: List[str], answers: List[str] | None = None):
+        """
+        Open a tree file built for the given word and answer lists.
+
+        Raises:
+            ValueError: If the file is not a tree for these lists, or is
+                truncated or corrupt
+        """
+        if answers is None:
+            answers = words
+        self.words = words
+        with open(path, "rb") as file:
+            try:
+                self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                raise ValueError(f"{path} is not a strategy tree file") from None
+        try:
+            self._check(path, words, answers)
+        except ValueError:
+            self._data.close()
+            raise
+
+    def _check(self, path: str, words: List[str], answers: List[str]) -> None:
+        """Validate the header and walk the node table once."""
+        data = self._data
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{path} is not a strategy tree file")
+        magic, version, word_length, _, node_count, word_count, words_digest, answers_digest = (
+            _HEADER.unpack_from(data, 0)
+        )
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a strategy tree file")
+        if (
+            word_count != len(words)
+            or words_digest.hex() != word_list_hash(words)
+            or answers_digest.hex() != word_list_hash(answers)
+        ):
+            raise ValueError(f"{path} was built for a different word list")
+
+        offset = _HEADER.size
+        for _ in range(node_count):
+            if offset + _NODE.size > len(data):
+                raise ValueError(f"{path} is truncated or corrupt")
+            guess_index, _, child_count = _NODE.unpack_from(data, offset)
+            offset += _NODE.size + child_count * _CHILD.size
+            if guess_index >= word_count or offset > len(data):
+                raise ValueError(f"{path} is truncated or corrupt")
+        if node_count == 0 or offset != len(data):
+            raise ValueError(f"{path} is truncated or corrupt")
+        self.node_count = node_count
+        self.word_length = word_length
+
+    @property
+    def opener(self) -> str:
+        """The first guess of the tree."""
+        return self.words[_NODE.unpack_from(self._data, _HEADER.size)[0]]
+
+    def lookup(self, history: List[Tuple[str, str]]) -> Tuple[str, int] | None:
+        """
+        Walk the tree along a (guess, feedback) history.
+
+        Returns:
+            (next guess, remaining candidates), or None when the history leaves
+            the tree (a different guess was played, or feedback of the wrong
+            length) or the game is solved
+        """
+        offset = _HEADER.size
+        for guess, feedback in history:
+            if len(feedback) != self.word_length:
+                return None
+            guess_index, _, child_count = _NODE.unpack_from(self._data, offset)
+            if self.words[guess_index] != guess.lower():
+                return None
+            offset = self._child(offset, child_count, parse_feedback(feedback))
+            if offset is None:
+                return None
+        guess_index, remaining, _ = _NODE.unpack_from(self._data, offset)
+        return self.words[guess_index], remaining
+
+    def _child(self, offset: int, child_count: int, code: int) -> int | None:
+        """Binary-search a node's sorted children for a feedback code."""
+        base = offset + _NODE.size
+        low, high = 0, child_count
+        while low < high:
+            mid = (low + high) // 2
+            child_code, child_offset = _CHILD.unpack_from(self._data, base + mid * _CHILD.size)
+            if child_code == code:
+                return child_offset
+            if child_code < code:
+                low = mid + 1
+            else:
+                high = mid
+        return None
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._data.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Precompute the full Wordle strategy tree for an opener')
+    parser.add_argument('--words', default='words.csv',
+                       help='Path to CSV file containing possible words (default: words.csv)')
+    parser.add_argument('--answers',
+                       help='Path to CSV file of possible answers (default: every word)')
+    parser.add_argument('--opener', required=True,
+                       help='First guess of every game')
+    parser.add_argument('--output', required=True,
+                       help='Path of the binary tree file to write')
+    parser.add_argument('--pattern-cache',
+                       help='Directory for the precomputed pattern table')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of processes used to build subtrees (default: 1)')
+    parser.add_argument('--length', type=int, default=5, choices=WORD_LENGTHS,
+                       help='Word length, from 4 to 8 (default: 5)')
+
+    args = parser.parse_args()
+
+    solver, root = build_tree(args.words, args.opener, args.pattern_cache, args.workers,
+                              args.length, args.answers)
+    data = serialize_tree(root, solver.words, solver.answers)
+    with open(args.output, "wb") as file:
+        file.write(data)
+    node_count = _HEADER.unpack_from(data, 0)[4]
+    print(f"Wrote {node_count} nodes ({len(data)} bytes) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
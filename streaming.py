@@ -0,0 +1,116 @@
+"""
+Generator pipeline for word lists too large to load.
+
+A word list is read row by row, validated, grouped into chunks and each
+chunk is filtered with one compiled regular expression, so memory holds a
+single chunk plus the words that survive the constraints. WordleSolver
+loads its word list through the same reading and validation stages.
+"""
+
+import csv
+import re
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from constraints import FeedbackConstraints, compile_feedback, compile_hints
+
+# Words validated and filtered together
+CHUNK_SIZE = 65536
+
+
+def valid_words(words: Iterable[str], word_length: int = 5) -> Iterator[str]:
+    """Lower-case words, keeping only alphabetic ones of the given length."""
+    for word in words:
+        word = word.strip().lower()
+        if len(word) == word_length and word.isalpha():
+            yield word
+
+
+def iter_words(words_file: str, word_length: int = 5) -> Iterator[str]:
+    """
+    Stream the valid words of a CSV word list (first column of each row).
+
+    Raises:
+        FileNotFoundError: On the first next() if words_file does not exist
+    """
+    with open(words_file, "r", newline="", encoding="utf-8") as file:
+        yield from valid_words((row[0] for row in csv.reader(file) if row), word_length)
+
+
+def chunked(words: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[List[str]]:
+    """Group a word stream into lists of at most chunk_size words."""
+    words = iter(words)
+    while True:
+        chunk = list(islice(words, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def constraint_pattern(constraints: FeedbackConstraints) -> re.Pattern:
+    """
+    Compile constraints into a regular expression matching exactly the
+    words they accept (use fullmatch).
+
+    Letter counts become lookaheads at the start of the word, fixed and
+    banned letters one atom per position.
+    """
+    parts = []
+    for letter, count in sorted(constraints.min_counts.items()):
+        letter = re.escape(letter)
+        parts.append(f"(?=(?:[^{letter}]*{letter}){{{count}}})")
+    for letter, count in sorted(constraints.max_counts.items()):
+        letter = re.escape(letter)
+        parts.append(f"(?!(?:[^{letter}]*{letter}){{{count + 1}}})")
+    for pos in range(constraints.word_length):
+        if pos in constraints.fixed:
+            parts.append(re.escape(constraints.fixed[pos]))
+        elif constraints.banned.get(pos):
+            letters = "".join(re.escape(letter) for letter in sorted(constraints.banned[pos]))
+            parts.append(f"[^{letters}]")
+        else:
+            parts.append(".")
+    return re.compile("".join(parts))
+
+
+def filter_chunks(
+    chunks: Iterable[List[str]], constraints: FeedbackConstraints
+) -> Iterator[List[str]]:
+    """Yield the words of each chunk that satisfy the constraints."""
+    if not constraints.is_satisfiable:
+        return
+    match = constraint_pattern(constraints).fullmatch
+    for chunk in chunks:
+        yield list(filter(match, chunk))
+
+
+def stream_candidates(
+    words_file: str,
+    correct_positions: Dict[int, str] | None = None,
+    correct_letters: List[str] | None = None,
+    incorrect_letters: List[str] | None = None,
+    wrong_positions: Dict[str, Set[int]] | None = None,
+    feedback: FeedbackConstraints | List[Tuple[str, str]] | None = None,
+    word_length: int = 5,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[str]:
+    """
+    Stream the words of a word list that satisfy the constraints.
+
+    Takes the constraints of WordleSolver.filter_words plus raw or compiled
+    feedback, with the same rules, without ever holding more than one
+    chunk of the list.
+
+    Returns:
+        Iterator over the matching words, in list order
+    """
+    constraints = compile_hints(
+        correct_positions, correct_letters, incorrect_letters, wrong_positions, word_length
+    )
+    if feedback is not None:
+        if not isinstance(feedback, FeedbackConstraints):
+            feedback = compile_feedback(feedback, word_length)
+        constraints = constraints.merge(feedback)
+    chunks = chunked(iter_words(words_file, word_length), chunk_size)
+    for survivors in filter_chunks(chunks, constraints):
+        yield from survivors
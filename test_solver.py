@@ -3,8 +3,52 @@
 Test suite for the Wordle solver.
 """
 
+import argparse
+import asyncio
+import contextlib
+import http.client
+import io
+import threading
+import time
+import tracemalloc
+import json
+import os
+import random
+import tempfile
 import unittest
+from collections import Counter
+from unittest import mock
+import benchmarks
+import cli
+import simulate
+import wordle_solver
+from constraints import compile_feedback, compile_hints, parse_feedback_history
+from game_session import GameSession
+from multi_board import solve_boards
+from opening_book import OpeningBook, build_book, opening_book_path, serialize_book
+from server import WordleServer
+from snapshot import snapshot_path
+from streaming import (CHUNK_SIZE, chunked, constraint_pattern, iter_words,
+                       stream_candidates)
+from strategy_tree import build_tree, serialize_tree
 from wordle_solver import WordleSolver
+from word_matrix import WordMatrix, pack_words
+from patterns import (GREEN, YELLOW, PatternTable, format_feedback, get_pattern_code,
+                      parse_feedback, pattern_codes)
+
+
+def write_word_list(directory, words):
+    """Write a small word list CSV for tests and return its path."""
+    path = os.path.join(directory, "words.csv")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("\n".join(words) + "\n")
+    return path
+
+
+SAMPLE_WORDS = [
+    "crane", "slate", "poppy", "glass", "arise", "roate", "speed", "abide",
+    "erase", "steal", "lease", "geese", "eerie", "tares", "siege", "nanny",
+]
 
 
 class TestWordleSolver(unittest.TestCase):
@@ -97,6 +141,26 @@ class TestWordleSolver(unittest.TestCase):
             if len(word) > 3:
                 self.assertNotEqual(word[3], 's')
     
+    def test_bitset_filter_matches_scan(self):
+        """Test that the bitset index agrees with the per-word constraint check."""
+        cases = [
+            ({2: 'a'}, ['r', 'e'], ['c', 'n'], {'r': {1}, 'e': {4}}),
+            ({0: 'p'}, [], ['o', 'y'], {'p': {1, 2, 3}}),
+            ({}, ['e', 'e'], ['e'], {}),
+            ({1: 'e'}, [], ['e', 's'], {'s': {0}}),
+            ({}, [], [], {}),
+        ]
+        for correct_positions, correct_letters, incorrect_letters, wrong_positions in cases:
+            expected = [
+                word for word in self.solver.words
+                if self.solver._satisfies_constraints(
+                    word, correct_positions, correct_letters,
+                    incorrect_letters, wrong_positions)
+            ]
+            results = self.solver.filter_words(
+                correct_positions, correct_letters, incorrect_letters, wrong_positions)
+            self.assertEqual(results, expected)
+
     def test_probability_calculation(self):
         """Test probability calculation."""
         # Test that probabilities are calculated
@@ -226,5 +290,1378 @@ class TestSpecificScenarios(unittest.TestCase):
                         self.assertNotEqual(word[pos], 'p')
 
 
+class TestPatternTable(unittest.TestCase):
+    """Test integer pattern codes and the memory-mapped pattern table."""
+
+    def setUp(self):
+        """Set up a small word list and cache directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.words_file = write_word_list(self.tmpdir.name, SAMPLE_WORDS)
+        self.cache_dir = os.path.join(self.tmpdir.name, "cache")
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.tmpdir.cleanup()
+
+    def test_codes_match_string_patterns(self):
+        """Pattern codes encode the same feedback as _get_guess_pattern."""
+        solver = WordleSolver(self.words_file)
+        digits = {'gray': 0, 'yellow': 1, 'green': 2}
+        for guess in SAMPLE_WORDS:
+            codes = pattern_codes(guess, SAMPLE_WORDS)
+            for answer, code in zip(SAMPLE_WORDS, codes):
+                pattern = solver._get_guess_pattern(guess, answer)
+                expected = sum(digits[p] * 3 ** i for i, p in enumerate(pattern))
+                self.assertEqual(code, expected)
+                self.assertEqual(get_pattern_code(guess, answer), expected)
+
+    def test_table_is_cached_and_reused(self):
+        """The table is built once, then memory-mapped on later loads."""
+        solver = WordleSolver(self.words_file, pattern_cache=self.cache_dir)
+        path = PatternTable.cache_path(solver.words, self.cache_dir)
+        self.assertTrue(os.path.exists(path))
+        mtime = os.path.getmtime(path)
+        solver.close()
+
+        solver = WordleSolver(self.words_file, pattern_cache=self.cache_dir)
+        self.assertEqual(os.path.getmtime(path), mtime)
+        for i, guess in enumerate(solver.words):
+            self.assertEqual(bytes(solver.pattern_table.row(i)),
+                             pattern_codes(guess, solver.words))
+        solver.close()
+
+    def test_table_scores_match_direct_scores(self):
+        """Elimination scores are identical with and without the table."""
+        direct = WordleSolver(self.words_file)
+        cached = WordleSolver(self.words_file, pattern_cache=self.cache_dir)
+        subset = ["slate", "steal", "tares", "lease"]
+        for guess in SAMPLE_WORDS:
+            self.assertEqual(direct.calculate_elimination_score(guess, subset),
+                             cached.calculate_elimination_score(guess, subset))
+        self.assertEqual(direct.solve(incorrect_letters=['o']),
+                         cached.solve(incorrect_letters=['o']))
+        cached.close()
+
+    def test_exhaustive_ranking_is_exact(self):
+        """Exhaustive mode scores every possible word with the exact score."""
+        solver = WordleSolver(self.words_file, pattern_cache=self.cache_dir)
+        possible = solver.filter_words(incorrect_letters=['o'])
+        expected = sorted(
+            ((word, solver.calculate_elimination_score(word, possible)) for word in possible),
+            key=lambda x: x[1], reverse=True)
+        results = solver.solve(incorrect_letters=['o'], max_results=len(possible),
+                               exhaustive=True)
+        self.assertEqual(results, expected)
+        solver.close()
+
+
+class TestParallelScoring(unittest.TestCase):
+    """Test the multi-process scoring backend."""
+
+    def test_parallel_matches_serial(self):
+        """Scores from the worker pool match single-process scores."""
+        serial = WordleSolver("words.csv")
+        parallel = WordleSolver("words.csv", workers=2)
+        constraints = dict(correct_positions={1: 'a'}, correct_letters=['e'],
+                           incorrect_letters=['s', 'r'])
+        expected = serial.solve(**constraints, max_results=50)
+        self.assertEqual(parallel.solve(**constraints, max_results=50), expected)
+        # The pool is started once and reused
+        pool = parallel._scoring_pool
+        self.assertIsNotNone(pool)
+        self.assertEqual(parallel.solve(**constraints, max_results=50), expected)
+        self.assertIs(parallel._scoring_pool, pool)
+        parallel.close()
+        self.assertIsNone(parallel._scoring_pool)
+
+    def test_one_pool_across_threads(self):
+        """Threads asking for the pool at the same time share one."""
+        solver = WordleSolver("words.csv", workers=2)
+        started = []
+
+        def slow_pool(*args):
+            time.sleep(0.1)
+            pool = mock.Mock(workers=args[1])
+            started.append(pool)
+            return pool
+
+        with mock.patch.object(wordle_solver, "ScoringPool", side_effect=slow_pool):
+            pools = []
+            threads = [threading.Thread(target=lambda: pools.append(solver._get_scoring_pool(2)))
+                       for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(started), 1)
+        self.assertTrue(all(pool is started[0] for pool in pools))
+        solver.close()
+
+
+class TestGameSession(unittest.TestCase):
+    """Test incremental turn-by-turn narrowing."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.solver = WordleSolver("words.csv")
+
+    def test_feedback_round_trip(self):
+        """Feedback strings convert to pattern codes and back."""
+        self.assertEqual(parse_feedback("bygbg"), get_pattern_code("crane", "roate"))
+        self.assertEqual(format_feedback(parse_feedback("GYB.x")), "gybbb")
+        with self.assertRaises(ValueError):
+            parse_feedback("bygbq")
+
+    def test_session_narrows_to_answer(self):
+        """Playing the recommended guesses converges on the answer."""
+        answer = "glass"
+        session = GameSession(self.solver)
+        for _ in range(10):
+            guess = session.best_guess()
+            feedback = format_feedback(get_pattern_code(guess, answer))
+            remaining = session.add_feedback(guess, feedback)
+            self.assertIn(answer, remaining)
+            expected = [word for word in self.solver.words
+                        if all(get_pattern_code(g, word) == parse_feedback(f)
+                               for g, f in session.history)]
+            self.assertEqual(remaining, expected)
+            if session.is_solved:
+                break
+        self.assertTrue(session.is_solved)
+        self.assertEqual(session.candidates, [answer])
+
+    def test_unranked_guess(self):
+        """Feedback for a guess that was never ranked is still applied."""
+        session = GameSession(self.solver)
+        remaining = session.add_feedback("crane", "bbgyb")
+        for word in remaining:
+            self.assertEqual(get_pattern_code("crane", word), parse_feedback("bbgyb"))
+
+    def test_rejects_wrong_length_guess(self):
+        """A guess of the wrong length is rejected and leaves the session unchanged."""
+        session = GameSession(self.solver)
+        with self.assertRaises(ValueError):
+            session.add_feedback("abcd", "bbbb")
+        self.assertEqual(session.history, [])
+        self.assertEqual(len(session.candidates), len(self.solver.answers))
+
+    def test_one_partition_per_turn(self):
+        """Only the guess actually played is partitioned, once per turn."""
+        session = GameSession(self.solver)
+        with mock.patch.object(self.solver, "get_pattern_codes",
+                               wraps=self.solver.get_pattern_codes) as codes:
+            for _ in range(2):
+                guess = session.best_guesses(max_results=10)[0][0]
+                self.assertEqual(session._partitions, {})
+                calls = codes.call_count
+                session.add_feedback(guess, format_feedback(get_pattern_code(guess, "glass")))
+                self.assertEqual(codes.call_count, calls + 1)
+
+    def next_turn(self, guess, code):
+        """Ranking of the turn after guess got feedback code, without speculation."""
+        session = GameSession(self.solver)
+        session.add_feedback(guess, format_feedback(code))
+        return session.best_guesses(max_results=10)
+
+    def test_speculation_hit(self):
+        """Feedback on a precomputed branch is answered from the background ranking."""
+        session = GameSession(self.solver)
+        guess = session.best_guesses(max_results=10)[0][0]
+        session.speculate(guess, branches=2, max_results=10)
+        partition = session._partitions[guess]
+        likeliest = max(partition, key=lambda code: len(partition[code]))
+        session._speculation._thread.join()
+        session.add_feedback(guess, format_feedback(likeliest))
+        self.assertEqual((session.speculation_hits, session.speculation_misses), (1, 0))
+        self.assertIsNotNone(session._prepared)
+        self.assertEqual(session.best_guesses(max_results=10), self.next_turn(guess, likeliest))
+        self.assertIsNone(session._prepared)
+
+    def test_speculation_miss(self):
+        """Other feedback cancels the background work and is scored normally."""
+        session = GameSession(self.solver)
+        session.best_guesses(max_results=10)
+        session.speculate("crane", branches=1, max_results=10)
+        code = get_pattern_code("crane", "slate")
+        session.add_feedback("crane", format_feedback(code))
+        self.assertEqual(session.speculation_misses, 1)
+        self.assertEqual(session.best_guesses(max_results=10), self.next_turn("crane", code))
+
+    def test_interactive_game(self):
+        """Interactive mode keeps one game across turns until it is solved."""
+        answer = "glass"
+        output = io.StringIO()
+
+        def play(prompt):
+            print(prompt, file=output)
+            if prompt.startswith("\nSolve another"):
+                return "n"
+            guess = output.getvalue().split("\n 1. ")[-1].split()[0].lower()
+            return f"{guess}:{format_feedback(get_pattern_code(guess, answer))}"
+
+        with mock.patch("builtins.input", play), contextlib.redirect_stdout(output):
+            cli.run_interactive(self.solver)
+        self.assertIn("Solved in", output.getvalue())
+        self.assertNotIn("Error", output.getvalue())
+
+
+class TestFeedbackConstraints(unittest.TestCase):
+    """Test compiling raw guess feedback into constraints."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.solver = WordleSolver("words.csv")
+
+    def consistent_words(self, history):
+        return [word for word in self.solver.words
+                if all(get_pattern_code(guess, word) == parse_feedback(feedback)
+                       for guess, feedback in history)]
+
+    def test_exact_duplicate_semantics(self):
+        """Filtering keeps exactly the words that would give the same feedback."""
+        games = [
+            ("geese", ["crane", "speed", "eerie"]),
+            ("poppy", ["apple", "puppy"]),
+            ("abide", ["erase", "eerie", "added"]),
+            ("glass", ["sassy", "slate"]),
+        ]
+        for answer, guesses in games:
+            history = [(guess, format_feedback(get_pattern_code(guess, answer)))
+                       for guess in guesses]
+            expected = self.consistent_words(history)
+            self.assertIn(answer, expected)
+            self.assertEqual(self.solver.filter_feedback(history), expected)
+            constraints = compile_feedback(history)
+            self.assertEqual([w for w in self.solver.words if constraints.matches(w)], expected)
+
+    def test_exact_count(self):
+        """A gray copy of a yellow letter caps its count."""
+        constraints = compile_feedback([("eerie", "ybbbb")])
+        self.assertEqual(constraints.min_counts["e"], 1)
+        self.assertEqual(constraints.max_counts["e"], 1)
+        self.assertEqual(constraints.max_counts["r"], 0)
+        for word in self.solver.filter_feedback(constraints):
+            self.assertEqual(word.count("e"), 1)
+            self.assertNotEqual(word[0], "e")
+
+    def test_canonical_form(self):
+        """Equivalent histories compile to equal constraints."""
+        a = compile_feedback([("crane", "bbgbb"), ("slate", "bbgbb")])
+        b = compile_feedback([("slate", "bbgbb"), ("crane", "bbgbb")])
+        self.assertEqual(a, b)
+        self.assertNotIn(2, a.banned)
+        self.assertNotIn("c", a.banned.get(0, set()))
+
+    def test_fixed_letter_banned_at_its_position(self):
+        """A green letter later reported yellow at the same position matches nothing."""
+        history = [("crane", "gbbbb"), ("cloth", "ybbbb")]
+        self.assertEqual(self.consistent_words(history), [])
+        constraints = compile_feedback(history)
+        self.assertFalse(constraints.is_satisfiable)
+        self.assertEqual(self.solver.filter_feedback(history), [])
+        self.assertFalse(any(constraints.matches(word) for word in self.solver.words))
+
+    def test_solve_with_feedback(self):
+        """solve() and get_best_guess() accept raw feedback."""
+        history = parse_feedback_history("crane:bygbb")
+        possible = set(self.solver.filter_feedback(history))
+        results = self.solver.solve(feedback=history, max_results=5)
+        self.assertTrue(results)
+        for word, _ in results:
+            self.assertIn(word, possible)
+        self.assertEqual(self.solver.get_best_guess(feedback=history), results[0][0])
+        with self.assertRaises(ValueError):
+            parse_feedback_history("crane:byg")
+
+
+class TestStrategyTree(unittest.TestCase):
+    """Test the precomputed strategy tree."""
+
+    def setUp(self):
+        """Build a tree for a small word list."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.words_file = write_word_list(self.tmpdir.name, SAMPLE_WORDS)
+        self.tree_file = os.path.join(self.tmpdir.name, "tree.bin")
+        solver, root = build_tree(self.words_file, "crane")
+        with open(self.tree_file, "wb") as file:
+            file.write(serialize_tree(root, solver.words))
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.tmpdir.cleanup()
+
+    def test_tree_plays_every_answer(self):
+        """Walking the tree solves every answer and matches live scoring."""
+        live = WordleSolver(self.words_file)
+        solver = WordleSolver(self.words_file, strategy_tree=self.tree_file)
+        self.assertEqual(solver.strategy_tree.opener, "crane")
+        for answer in solver.words:
+            history = []
+            for _ in range(len(SAMPLE_WORDS)):
+                guess = solver.get_best_guess(feedback=history)
+                if history:
+                    self.assertEqual(guess, live.get_best_guess(feedback=history))
+                feedback = format_feedback(get_pattern_code(guess, answer))
+                history.append((guess, feedback))
+                if guess == answer:
+                    break
+            self.assertEqual(history[-1][0], answer)
+        solver.close()
+
+    def test_off_tree_history_falls_back(self):
+        """Histories the tree does not cover are scored normally."""
+        solver = WordleSolver(self.words_file, strategy_tree=self.tree_file)
+        self.assertIsNone(solver.strategy_tree.lookup([("slate", "bbbbb")]))
+        self.assertIsNone(solver.strategy_tree.lookup([("crane", "bbbb")]))
+        self.assertIsNone(solver.strategy_tree.lookup([("crane", "bbbbbb")]))
+        history = [("slate", format_feedback(get_pattern_code("slate", "poppy")))]
+        self.assertEqual(solver.get_best_guess(feedback=history), "poppy")
+        solver.close()
+
+    def test_rejects_other_word_list(self):
+        """A tree cannot be loaded for a different word list."""
+        other = write_word_list(tempfile.mkdtemp(dir=self.tmpdir.name), SAMPLE_WORDS[:-1])
+        with self.assertRaises(ValueError):
+            WordleSolver(other, strategy_tree=self.tree_file)
+
+    def test_rejects_other_answer_list(self):
+        """A tree built for every word cannot be loaded for a smaller answer pool."""
+        answers = write_word_list(tempfile.mkdtemp(dir=self.tmpdir.name), SAMPLE_WORDS[:3])
+        with self.assertRaises(ValueError):
+            WordleSolver(self.words_file, answers_file=answers, strategy_tree=self.tree_file)
+
+    def test_rejects_truncated_file(self):
+        """A cut-off tree file raises ValueError, not struct.error."""
+        with open(self.tree_file, "rb") as file:
+            data = file.read()
+        for size in (0, 10, len(data) - 1):
+            with open(self.tree_file, "wb") as file:
+                file.write(data[:size])
+            with self.assertRaises(ValueError):
+                WordleSolver(self.words_file, strategy_tree=self.tree_file)
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Test the benchmark runner and baseline comparison."""
+
+    def test_run_and_compare(self):
+        """Benchmarks produce timings and regressions are flagged."""
+        current = benchmarks.run_benchmarks(repeat=1, min_time=0, only=["filter_words"])
+        self.assertEqual(set(current["results"]),
+                         {f"filter_words[{state}]" for state in benchmarks.STATES})
+        for result in current["results"].values():
+            self.assertGreater(result["min"], 0)
+
+        baseline = {"results": {name: {"min": result["min"] / 2}
+                                for name, result in current["results"].items()}}
+        comparisons = benchmarks.compare_results(current, baseline, threshold=0.25)
+        self.assertEqual(len(comparisons), len(current["results"]))
+        self.assertTrue(all(entry["regressed"] for entry in comparisons))
+        comparisons = benchmarks.compare_results(current, baseline, threshold=1.5)
+        self.assertFalse(any(entry["regressed"] for entry in comparisons))
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test the binary fast-start snapshot."""
+
+    def setUp(self):
+        """Set up a small word list."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.words_file = write_word_list(self.tmpdir.name, SAMPLE_WORDS)
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.tmpdir.cleanup()
+
+    def assertSameState(self, a, b):
+        self.assertEqual(a.words, b.words)
+        self.assertEqual(a.letter_frequencies, b.letter_frequencies)
+        self.assertEqual(a.position_frequencies, b.position_frequencies)
+        self.assertEqual(a.filter_words(correct_letters=['e'], incorrect_letters=['s']),
+                         b.filter_words(correct_letters=['e'], incorrect_letters=['s']))
+
+    def test_snapshot_round_trip(self):
+        """A snapshot is written on first load and restores identical state."""
+        parsed = WordleSolver(self.words_file, snapshot=False)
+        self.assertFalse(os.path.exists(snapshot_path(self.words_file)))
+        WordleSolver(self.words_file)
+        self.assertTrue(os.path.exists(snapshot_path(self.words_file)))
+        restored = WordleSolver(self.words_file)
+        self.assertSameState(parsed, restored)
+
+    def test_stale_snapshot_is_rebuilt(self):
+        """Changing the source list invalidates the snapshot."""
+        WordleSolver(self.words_file)
+        write_word_list(self.tmpdir.name, SAMPLE_WORDS[:8])
+        solver = WordleSolver(self.words_file)
+        self.assertEqual(solver.words, SAMPLE_WORDS[:8])
+        self.assertSameState(solver, WordleSolver(self.words_file, snapshot=False))
+
+
+class TestResultCache(unittest.TestCase):
+    """Test the LRU cache of solve() results."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.solver = WordleSolver("words.csv", cache_size=2)
+
+    def test_equivalent_constraints_hit(self):
+        """Order, container type and equivalent forms share one entry."""
+        first = self.solver.solve(correct_letters=['r', 'e'], incorrect_letters={'c', 'n'})
+        second = self.solver.solve(correct_letters={'e', 'r'}, incorrect_letters=['n', 'c'])
+        self.assertEqual(first, second)
+        info = self.solver.cache_info()
+        self.assertEqual((info["hits"], info["misses"], info["size"]), (1, 1, 1))
+
+        # Mutating a returned list does not corrupt the cache
+        second.clear()
+        self.assertEqual(self.solver.solve(correct_letters=['e', 'r'],
+                                           incorrect_letters=['c', 'n']), first)
+
+    def test_scoring_options_are_part_of_key(self):
+        """Different result counts and scoring modes are cached separately."""
+        self.solver.solve(correct_positions={0: 'a'}, max_results=5)
+        self.solver.solve(correct_positions={0: 'a'}, max_results=3)
+        self.assertEqual(self.solver.cache_info()["misses"], 2)
+
+    def test_eviction(self):
+        """The least recently used entry is evicted over the size bound."""
+        self.solver.solve(correct_positions={0: 'a'})
+        self.solver.solve(correct_positions={0: 'b'})
+        self.solver.solve(correct_positions={0: 'a'})
+        self.solver.solve(correct_positions={0: 'c'})
+        info = self.solver.cache_info()
+        self.assertEqual((info["size"], info["evictions"]), (2, 1))
+        self.solver.solve(correct_positions={0: 'a'})
+        self.assertEqual(self.solver.cache_info()["hits"], 2)
+
+    def test_memory_bound(self):
+        """Entries larger than the memory bound are not stored."""
+        solver = WordleSolver("words.csv", cache_max_bytes=100)
+        solver.solve(correct_positions={0: 'a'})
+        self.assertEqual(solver.cache_info()["size"], 0)
+        self.assertLessEqual(solver.cache_info()["bytes"], 100)
+
+
+class TestProfiling(unittest.TestCase):
+    """Test per-phase profiling of solve()."""
+
+    def test_disabled_by_default(self):
+        """No profile is recorded unless profiling is enabled."""
+        solver = WordleSolver("words.csv")
+        solver.solve(correct_positions={0: 'a'})
+        self.assertIsNone(solver.last_profile)
+
+    def test_phases_and_counters(self):
+        """Each phase records candidate counts; scoring counts evaluations."""
+        solver = WordleSolver("words.csv", profiling=True)
+        # Asking for all 30 prefiltered guesses scores each of them in full
+        results = solver.solve(incorrect_letters=['l', 'a', 'r', 'e', 's'], max_results=30)
+        profile = solver.last_profile
+        names = [name for name, _, _, _ in profile.phases]
+        self.assertEqual(names, ["filter", "cache", "materialize", "prefilter", "scoring", "sort"])
+        self.assertEqual(profile.phases[0][2:], (len(solver.words), 1001))
+        self.assertEqual(profile.phases[-1][3], len(results))
+        self.assertEqual(profile.pattern_evaluations, 30 * 1001)
+        self.assertAlmostEqual(profile.total_time, sum(p[1] for p in profile.phases))
+        self.assertFalse(profile.cache_hit)
+        self.assertIn("pattern evaluations: 30030", profile.format())
+
+        solver.solve(incorrect_letters=['s', 'e', 'r', 'a', 'l'], max_results=30)
+        self.assertTrue(solver.last_profile.cache_hit)
+        self.assertEqual(solver.last_profile.as_dict()["pattern_evaluations"], 0)
+
+
+class TestTopKSearch(unittest.TestCase):
+    """Test branch-and-bound top-k search and the minimax objective."""
+
+    def setUp(self):
+        """Set up a temporary directory for a pattern table."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.words_file = write_word_list(self.tmpdir.name, SAMPLE_WORDS)
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.tmpdir.cleanup()
+
+    def full_ranking(self, solver, possible, objective):
+        """Score every guess in full and sort, as a reference."""
+        scores = []
+        for word in possible:
+            buckets = Counter(solver.get_pattern_codes(word, possible))
+            if objective == "minimax":
+                scores.append(float(len(possible) - max(buckets.values())))
+            else:
+                scores.append(solver.calculate_elimination_score(word, possible))
+        return sorted(zip(possible, scores), key=lambda x: x[1], reverse=True)
+
+    def test_matches_full_ranking(self):
+        """Top-k results equal the head of a full sort, with and without a table."""
+        solver = WordleSolver("words.csv")
+        possible = solver.filter_feedback([("crane", "bybbb")])
+        for objective in ("elimination", "minimax"):
+            expected = self.full_ranking(solver, possible, objective)
+            for k in (1, 5, len(possible)):
+                self.assertEqual(solver.rank_candidates(possible, k, objective=objective),
+                                 expected[:k])
+
+        cached = WordleSolver(self.words_file,
+                              pattern_cache=os.path.join(self.tmpdir.name, "cache"))
+        possible = cached.filter_words(incorrect_letters=['o'])
+        for objective in ("elimination", "minimax"):
+            expected = self.full_ranking(cached, possible, objective)
+            for k in (1, 3):
+                self.assertEqual(cached.solve(incorrect_letters=['o'], max_results=k,
+                                              objective=objective), expected[:k])
+        cached.close()
+
+    def test_best_only_prunes(self):
+        """A best-only query abandons most guesses before scoring them in full."""
+        solver = WordleSolver("words.csv", profiling=True)
+        solver.solve(feedback=[("crane", "bybbb")], max_results=1)
+        profile = solver.last_profile
+        self.assertGreater(profile.pruned_guesses, 578 // 2)
+        self.assertLess(profile.pattern_evaluations, 578 * 578 // 2)
+
+    def test_no_results_requested(self):
+        """Asking for no results returns an empty ranking."""
+        solver = WordleSolver("words.csv")
+        self.assertEqual(solver.solve(max_results=0), [])
+        self.assertEqual(solver.solve(feedback=[("crane", "bybbb")], max_results=0), [])
+        possible = solver.filter_feedback([("crane", "bybbb")])
+        for objective in ("elimination", "minimax"):
+            self.assertEqual(solver.rank_candidates(possible, 0, objective=objective), [])
+
+    def test_unknown_objective(self):
+        """Unknown objectives are rejected."""
+        with self.assertRaises(ValueError):
+            WordleSolver("words.csv").solve(correct_positions={0: 'a'}, objective="entropy")
+
+
+class TestLookahead(unittest.TestCase):
+    """Test depth-N lookahead ranking by expected guesses."""
+
+    def setUp(self):
+        self.solver = WordleSolver("words.csv")
+        self.feedback = [("lares", "bbbbb"), ("point", "bgggb")]
+        self.possible = self.solver.filter_feedback(self.feedback)
+
+    def optimal_guesses(self, guess, possible, guesses):
+        """Brute-force expected guesses to solve after playing guess next."""
+        buckets = {}
+        for word in possible:
+            buckets.setdefault(format_feedback(get_pattern_code(guess, word), 5), []).append(word)
+        cost = 1.0
+        for pattern, bucket in buckets.items():
+            if pattern == "ggggg":
+                continue
+            splitting = [word for word in guesses
+                         if word in bucket or len({get_pattern_code(word, answer)
+                                                   for answer in bucket}) > 1]
+            cost += len(bucket) / len(possible) * min(
+                self.optimal_guesses(word, bucket, guesses) for word in splitting
+            )
+        return cost
+
+    def test_small_state_is_exact(self):
+        """With every guess expanded, the search finds the exact expectations."""
+        results = self.solver.solve(feedback=self.feedback, max_results=5, depth=5)
+        self.assertEqual(sorted(word for word, _ in results), sorted(self.possible))
+        for word, expected in results:
+            self.assertAlmostEqual(
+                expected, self.optimal_guesses(word, self.possible, self.possible)
+            )
+        scores = [expected for _, expected in results]
+        self.assertEqual(scores, sorted(scores))
+
+    def test_two_candidates(self):
+        """Guessing one of two candidates takes 1.5 guesses on average."""
+        possible = ["boing", "going"]
+        self.assertEqual(self.solver._guess_cost("boing", possible, 2, possible, {}), 1.5)
+
+    def test_midgame_depth_two(self):
+        """Depth 2 re-ranks the one-step shortlist by expected guesses."""
+        solver = WordleSolver("words.csv", profiling=True)
+        feedback = [("crane", "bybbb")]
+        one_step = [word for word, _ in solver.solve(feedback=feedback, max_results=8)]
+        results = solver.solve(feedback=feedback, max_results=8, depth=2)
+        self.assertEqual(sorted(word for word, _ in results), sorted(one_step))
+        scores = [expected for _, expected in results]
+        self.assertEqual(scores, sorted(scores))
+        self.assertTrue(all(2 < expected < 5 for expected in scores))
+        self.assertEqual(solver.last_profile.phases[-1][0], "lookahead")
+
+    def test_invalid_depth(self):
+        """Depths below 1 are rejected."""
+        with self.assertRaises(ValueError):
+            self.solver.solve(feedback=self.feedback, depth=0)
+
+
+class TestOpeningBook(unittest.TestCase):
+    """Test the precomputed opening book."""
+
+    def setUp(self):
+        """Build a book for a small word list, at the path the solver looks at."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.words_file = write_word_list(self.tmpdir.name, SAMPLE_WORDS)
+        self.solver, self.book = build_book(self.words_file, openers=10, reply_openers=2,
+                                            results=5)
+        with open(opening_book_path(self.words_file), "wb") as file:
+            file.write(serialize_book(self.book, self.solver.words, self.solver.answers, 5))
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.tmpdir.cleanup()
+
+    def test_book_matches_exact_scoring(self):
+        """Book rankings equal exhaustive scoring of the same states."""
+        live = WordleSolver(self.words_file, snapshot=False)
+        self.assertEqual(self.book[None], live.rank_candidates(live.words, 10, exhaustive=True))
+        for opener, _ in self.book[None][:2]:
+            for answer in SAMPLE_WORDS:
+                if answer == opener:
+                    continue
+                code = get_pattern_code(opener, answer)
+                possible = live.filter_feedback([(opener, format_feedback(code))])
+                self.assertEqual(self.book[(opener, code)],
+                                 live.rank_candidates(possible, 5, exhaustive=True))
+
+    def test_parallel_build(self):
+        """Building on several processes gives the same book."""
+        _, book = build_book(self.words_file, openers=10, reply_openers=2, results=5,
+                             workers=2)
+        self.assertEqual(book, self.book)
+
+    def test_solver_answers_from_book(self):
+        """The first two turns are served from the book, later ones are scored."""
+        solver = WordleSolver(self.words_file, profiling=True)
+        self.assertEqual(solver.solve(max_results=3), self.book[None][:3])
+        self.assertEqual(solver.last_profile.phases[-1][0], "book")
+        for max_results in (0, -1):
+            self.assertEqual(solver.solve(max_results=max_results), [])
+
+        opener = self.book[None][0][0]
+        code = get_pattern_code(opener, "poppy")
+        history = [(opener, format_feedback(code))]
+        self.assertEqual(solver.solve(feedback=history, max_results=5), self.book[(opener, code)])
+        self.assertEqual(solver.last_profile.phases[-1][0], "book")
+        self.assertEqual(solver.get_best_guess(feedback=history), self.book[(opener, code)][0][0])
+
+        # More results than stored, or a longer history, are scored normally
+        solver.solve(feedback=history, max_results=6)
+        self.assertNotEqual(solver.last_profile.phases[-1][0], "book")
+        history.append(("slate", format_feedback(get_pattern_code("slate", "poppy"))))
+        solver.solve(feedback=history)
+        self.assertNotEqual(solver.last_profile.phases[-1][0], "book")
+
+    def test_stale_book_is_ignored(self):
+        """A book built for another word list is not used."""
+        write_word_list(self.tmpdir.name, SAMPLE_WORDS[:-1])
+        solver = WordleSolver(self.words_file, profiling=True)
+        solver.solve(max_results=3)
+        self.assertNotEqual(solver.last_profile.phases[-1][0], "book")
+        with self.assertRaises(ValueError):
+            OpeningBook(opening_book_path(self.words_file), solver.words, solver.answers)
+
+
+class TestStreaming(unittest.TestCase):
+    """Test the streaming loader and chunked filtering."""
+
+    STATES = [
+        {"feedback": [("crane", "bybbb")]},
+        {"correct_positions": {0: "s"}, "incorrect_letters": ["a", "e"]},
+        {"correct_letters": ["e", "e"], "wrong_positions": {"r": {0, 4}},
+         "incorrect_letters": ["e"], "feedback": [("slate", "bbbbg")]},
+        {"correct_positions": {1: "a"}, "wrong_positions": {"a": {1}}},
+        {"wrong_positions": {"s": {4}}, "feedback": [("bulls", "bbbbg")]},
+    ]
+
+    def setUp(self):
+        self.solver = WordleSolver("words.csv")
+
+    def test_matches_filter_words(self):
+        """Streaming gives the solver's candidates, in order, for any chunk size."""
+        for state in self.STATES:
+            hints = {name: value for name, value in state.items() if name != "feedback"}
+            consistent = set(self.solver.filter_feedback(state.get("feedback", [])))
+            expected = [word for word in self.solver.filter_words(**hints) if word in consistent]
+            for chunk_size in (7, 1000, CHUNK_SIZE):
+                self.assertEqual(
+                    list(stream_candidates("words.csv", chunk_size=chunk_size, **state)),
+                    expected,
+                )
+
+    @staticmethod
+    def hints_from(guess, answer):
+        """The filter_words hints one guess reveals about an answer."""
+        hints = {"correct_positions": {}, "correct_letters": [], "incorrect_letters": [],
+                 "wrong_positions": {}}
+        code = get_pattern_code(guess, answer)
+        for pos, letter in enumerate(guess):
+            code, digit = divmod(code, 3)
+            if digit == GREEN:
+                hints["correct_positions"][pos] = letter
+            elif digit == YELLOW:
+                hints["wrong_positions"].setdefault(letter, set()).add(pos)
+            else:
+                hints["incorrect_letters"].append(letter)
+        return hints
+
+    def test_random_states_match_masks(self):
+        """Streaming agrees with the solver's masks on random, often contradictory, states."""
+        rng = random.Random(7)
+        words = list(self.solver.words)
+        for _ in range(100):
+            # Hints and feedback from two different answers usually contradict
+            answers = rng.sample(words, 2)
+            hints = self.hints_from(rng.choice(words), answers[0])
+            feedback = [(guess, format_feedback(get_pattern_code(guess, answers[1])))
+                        for guess in rng.sample(words, rng.randint(1, 2))]
+            mask = (self.solver._constraint_mask(**hints)
+                    & self.solver._feedback_mask(feedback))
+            self.assertEqual(
+                list(stream_candidates("words.csv", feedback=feedback, **hints)),
+                self.solver._mask_to_words(mask),
+                (hints, feedback),
+            )
+
+    def test_compile_hints(self):
+        """Compiled hints accept exactly the words filter_words accepts."""
+        for state in self.STATES:
+            hints = {name: value for name, value in state.items() if name != "feedback"}
+            pattern = constraint_pattern(compile_hints(**hints))
+            self.assertEqual([word for word in self.solver.words if pattern.fullmatch(word)],
+                             self.solver.filter_words(**hints))
+
+    def test_chunked(self):
+        """Words are grouped into chunks of at most chunk_size."""
+        self.assertEqual(list(chunked(iter("abcdefg"), 3)),
+                         [["a", "b", "c"], ["d", "e", "f"], ["g"]])
+        self.assertEqual(list(chunked([], 3)), [])
+
+    def test_solver_over_survivors(self):
+        """A solver built from streamed survivors ranks them like a loaded one."""
+        feedback = [("crane", "bybbb"), ("tiros", "bbgyb")]
+        solver = WordleSolver(words=stream_candidates("words.csv", feedback=feedback))
+        self.assertEqual(solver.words, self.solver.filter_feedback(feedback))
+        self.assertEqual(solver.solve(max_results=5, exhaustive=True),
+                         self.solver.solve(feedback=feedback, max_results=5, exhaustive=True))
+
+    def test_memory_tracks_result_size(self):
+        """Peak memory while streaming stays far below the loaded list."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "big.csv")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("\n".join(benchmarks.synthetic_words(5, 50000)) + "\n")
+            tracemalloc.start()
+            try:
+                loaded = list(iter_words(path))
+                loaded_peak = tracemalloc.get_traced_memory()[1]
+                del loaded
+                tracemalloc.reset_peak()
+                survivors = list(stream_candidates(path, feedback=[("crane", "bybbb")],
+                                                   chunk_size=1000))
+                streamed_peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        self.assertTrue(survivors)
+        self.assertLess(streamed_peak, loaded_peak / 5)
+
+
+class TestFrequencyScoring(unittest.TestCase):
+    """Test batched frequency scoring from the live candidates."""
+
+    def setUp(self):
+        self.solver = WordleSolver("words.csv")
+        self.possible = self.solver.filter_words(incorrect_letters=['l', 'a', 'r', 'e', 's'])
+
+    def test_matches_per_word_formula(self):
+        """Word scores follow the position x letter frequency formula."""
+        solver = self.solver
+        for word in ("about", "geese", "nanny"):
+            expected = 1.0
+            for pos, letter in enumerate(word):
+                expected *= solver.position_frequencies[pos][letter]
+            for letter, count in Counter(word).items():
+                expected *= solver.letter_frequencies[letter] ** count * 0.9 ** (count - 1)
+            self.assertAlmostEqual(solver.calculate_word_probability(word) / expected, 1.0)
+
+    def test_live_frequencies(self):
+        """Batched scores use the frequencies of the candidates, not the whole list."""
+        live = WordleSolver(words=self.possible)
+        expected = [live.calculate_word_probability(word) for word in self.possible]
+        scores = self.solver.frequency_scores(self.possible)
+        self.assertEqual(len(scores), len(expected))
+        for score, reference in zip(scores, expected):
+            self.assertAlmostEqual(score / reference, 1.0)
+        subset = self.possible[:10]
+        self.assertEqual(self.solver.frequency_scores(subset, self.possible), scores[:10])
+
+    def test_rankings_use_live_frequencies(self):
+        """Frequency ranking and the large-set prefilter rank by live frequencies."""
+        live = WordleSolver(words=self.possible)
+        by_live = sorted(self.possible, key=live.calculate_word_probability, reverse=True)
+        results = self.solver.solve(incorrect_letters=['l', 'a', 'r', 'e', 's'],
+                                    use_elimination_scoring=False, max_results=10)
+        self.assertEqual([word for word, _ in results], by_live[:10])
+        self.assertEqual(self.solver._top_by_frequency(self.possible, 30), by_live[:30])
+
+
+class TestWordMatrix(unittest.TestCase):
+    """Test the packed word list representation."""
+
+    def test_sequence_view(self):
+        """A matrix reads back like the list of words it was packed from."""
+        matrix = WordMatrix.from_words(SAMPLE_WORDS, 5)
+        self.assertEqual(len(matrix), len(SAMPLE_WORDS))
+        self.assertEqual(len(matrix.data), 5 * len(SAMPLE_WORDS))
+        self.assertEqual(matrix[0], "crane")
+        self.assertEqual(matrix[-1], "nanny")
+        self.assertEqual(matrix[2:6:2], SAMPLE_WORDS[2:6:2])
+        self.assertEqual(list(matrix), SAMPLE_WORDS)
+        self.assertEqual(matrix, SAMPLE_WORDS)
+        self.assertEqual(matrix.select([1, 0] * 8), SAMPLE_WORDS[::2])
+        with self.assertRaises(IndexError):
+            matrix[len(SAMPLE_WORDS)]
+
+    def test_positions(self):
+        """The row index behaves like a dict built from the rows in order."""
+        words = SAMPLE_WORDS + ["crane"]
+        index = WordMatrix.from_words(words, 5).positions()
+        for word in SAMPLE_WORDS[1:]:
+            self.assertEqual(index[word], words.index(word))
+        self.assertEqual(index["crane"], len(words) - 1)
+        for missing in ("zzzzz", "cran", "cranes", "cr\u0101ne"):
+            self.assertNotIn(missing, index)
+            with self.assertRaises(KeyError):
+                index[missing]
+
+    def test_rows(self):
+        """Batch lookups agree with single lookups, by probing or by a temporary dict."""
+        words = SAMPLE_WORDS + ["crane"]
+        index = WordMatrix.from_words(words, 5).positions()
+        for batch in (["poppy", "crane"], SAMPLE_WORDS):
+            self.assertEqual(index.rows(batch), [index[word] for word in batch])
+            self.assertIsNone(index.rows(batch + ["zzzzz"]))
+        self.assertEqual(index.rows([]), [])
+
+    def test_scoring_matches_dict_index(self):
+        """Table scoring gives the same results with the row index as with a dict."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            words = list(WordleSolver("words.csv").words[::20]) + ["crane"]
+            words_file = write_word_list(tmpdir, words)
+            packed = WordleSolver(words_file, pattern_cache=tmpdir)
+            plain = WordleSolver(words_file, pattern_cache=tmpdir)
+            plain._word_index = plain._answer_index = dict(zip(words, range(len(words))))
+            feedback = [("crane", "bbbbb")]
+            for kwargs in ({"max_results": 5}, {"max_results": 5, "probes": True},
+                           {"max_results": 5, "hard_mode": True},
+                           {"max_results": 3, "depth": 2}):
+                self.assertEqual(packed.solve(feedback=feedback, **kwargs),
+                                 plain.solve(feedback=feedback, **kwargs))
+
+    def test_wide_letters_stay_a_list(self):
+        """Words with letters beyond one byte are kept as a list of strings."""
+        words = pack_words(["cr\u0101ne", "slate"], 5)
+        self.assertIsInstance(words, list)
+        solver = WordleSolver(words=["cr\u0101ne", "slate", "steal"], snapshot=False)
+        self.assertEqual(solver.filter_words(correct_positions={0: 's'}), ["slate", "steal"])
+
+    def test_solver_index_matches_words(self):
+        """Bitset index and frequencies built from columns match a per-word count."""
+        solver = WordleSolver("words.csv", snapshot=False)
+        self.assertIsInstance(solver.words, WordMatrix)
+        position = {}
+        at_least = {}
+        for i, word in enumerate(solver.words):
+            for pos, letter in enumerate(word):
+                position.setdefault((pos, letter), set()).add(i)
+            for letter, count in Counter(word).items():
+                for k in range(1, count + 1):
+                    at_least.setdefault((letter, k), set()).add(i)
+        for (pos, letter), indices in position.items():
+            self.assertEqual(solver._position_masks[pos][letter],
+                             sum(1 << i for i in indices))
+        for (letter, k), indices in at_least.items():
+            self.assertEqual(solver._count_masks[letter][k], sum(1 << i for i in indices))
+        self.assertEqual(sum(len(masks) - 1 for masks in solver._count_masks.values()),
+                         len(at_least))
+        letters = Counter("".join(solver.words))
+        self.assertAlmostEqual(solver.letter_frequencies["e"],
+                               letters["e"] / sum(letters.values()))
+
+
+class TestSimulation(unittest.TestCase):
+    """Test full-game simulation."""
+
+    def setUp(self):
+        """Set up a small word list in a temporary directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.words_file = write_word_list(self.tmpdir.name, SAMPLE_WORDS)
+        self.solver = WordleSolver(self.words_file, snapshot=False)
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.tmpdir.cleanup()
+
+    def test_play_game(self):
+        """Games follow get_best_guess with the true feedback until solved."""
+        for answer in SAMPLE_WORDS:
+            game = simulate.play_game(self.solver, answer)
+            self.assertTrue(game["solved"])
+            self.assertEqual(game["guesses"][-1], answer)
+            self.assertEqual(len(game["turn_seconds"]), len(game["guesses"]))
+            history = [(guess, format_feedback(get_pattern_code(guess, answer)))
+                       for guess in game["guesses"]]
+            for turn, guess in enumerate(game["guesses"]):
+                self.assertEqual(self.solver.get_best_guess(feedback=history[:turn]), guess)
+        opener = self.solver.get_best_guess()
+        other = next(word for word in SAMPLE_WORDS if word != opener)
+        game = simulate.play_game(self.solver, other, max_guesses=1)
+        self.assertFalse(game["solved"])
+        self.assertEqual(game["guesses"], [opener])
+
+    def test_other_word_lengths(self):
+        """Games are played with feedback of the answer's length."""
+        words = ["bake", "cake", "lake", "make", "rake", "word", "ward", "wore"]
+        words_file = write_word_list(self.tmpdir.name, words)
+        solver = WordleSolver(words_file, snapshot=False, word_length=4)
+        for answer in words:
+            game = simulate.play_game(solver, answer)
+            self.assertTrue(game["solved"])
+            self.assertEqual(game["guesses"][-1], answer)
+
+    def test_cached_turns(self):
+        """Turns answered from the result cache are reported apart from computed ones."""
+        first = simulate.play_game(self.solver, "crane")
+        second = simulate.play_game(self.solver, "crane")
+        self.assertFalse(first["turn_cached"][0])
+        self.assertTrue(all(second["turn_cached"]))
+        summary = simulate.summarize([first, second], seconds=1.0)
+        self.assertEqual(summary["turns"], first["turn_cached"].count(False))
+        self.assertEqual(summary["cached_turns"],
+                         len(second["guesses"]) + first["turn_cached"].count(True))
+
+    def test_parallel_games(self):
+        """Worker processes play the same games as a single process."""
+        answers = simulate.sample_answers(self.solver.answers, 6, seed=1)
+        self.assertEqual(answers, simulate.sample_answers(self.solver.answers, 6, seed=1))
+        self.assertEqual(len(set(answers)), 6)
+        serial = list(simulate.simulate(answers, solver=self.solver))
+        parallel = list(simulate.simulate(answers, self.words_file, workers=2))
+        key = lambda game: game["answer"]
+        self.assertEqual([game["guesses"] for game in sorted(serial, key=key)],
+                         [game["guesses"] for game in sorted(parallel, key=key)])
+
+    def test_summary(self):
+        """The summary aggregates guess counts, failures, latency and throughput."""
+        games = [
+            {"answer": "a", "guesses": ["x", "a"], "solved": True, "turn_seconds": [0.1, 0.2],
+             "turn_cached": [False, False]},
+            {"answer": "b", "guesses": ["x", "y", "b"], "solved": True,
+             "turn_seconds": [0.1, 0.3, 0.4], "turn_cached": [False, False, False]},
+            {"answer": "c", "guesses": ["x", "y"], "solved": False, "turn_seconds": [0.5, 0.01],
+             "turn_cached": [False, True]},
+        ]
+        summary = simulate.summarize(games, seconds=2.0, max_guesses=3)
+        self.assertEqual(summary["distribution"], {1: 0, 2: 1, 3: 1})
+        self.assertEqual(summary["failures"], 1)
+        self.assertAlmostEqual(summary["failure_rate"], 1 / 3)
+        self.assertAlmostEqual(summary["mean_guesses"], 2.5)
+        self.assertEqual(summary["turn_latency"], {"p50": 0.2, "p90": 0.5, "p99": 0.5,
+                                                   "max": 0.5})
+        self.assertEqual(summary["cached_turns"], 1)
+        self.assertEqual(summary["cached_turn_latency"]["max"], 0.01)
+        self.assertAlmostEqual(summary["games_per_second"], 1.5)
+
+        slower = dict(summary, games_per_second=1.0, mean_guesses=2.4)
+        regressed = {entry["name"] for entry in simulate.compare_summaries(slower, summary, 0.25)
+                     if entry["regressed"]}
+        self.assertEqual(regressed, {"games_per_second"})
+        worse = dict(summary, mean_guesses=2.6)
+        regressed = {entry["name"] for entry in simulate.compare_summaries(worse, summary, 0.25)
+                     if entry["regressed"]}
+        self.assertEqual(regressed, {"mean_guesses"})
+
+
+class TestAnswerList(unittest.TestCase):
+    """Test a separate answer pool next to the allowed-guess list."""
+
+    ANSWERS = ["slate", "steal", "tares", "lease", "siege", "geese", "eerie"]
+
+    def setUp(self):
+        """Set up guess and answer lists in a temporary directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.words_file = write_word_list(self.tmpdir.name, SAMPLE_WORDS)
+        self.answers_file = os.path.join(self.tmpdir.name, "answers.csv")
+        with open(self.answers_file, "w", encoding="utf-8") as file:
+            file.write("\n".join(self.ANSWERS + ["least"]) + "\n")
+        self.cache_dir = os.path.join(self.tmpdir.name, "cache")
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.tmpdir.cleanup()
+
+    def test_filtering_returns_answers(self):
+        """Candidates come from the answer pool; missing answers become guesses."""
+        solver = WordleSolver(self.words_file, answers_file=self.answers_file)
+        self.assertIn("least", solver.words)
+        self.assertEqual(len(solver.words), len(SAMPLE_WORDS) + 1)
+        self.assertEqual(set(solver.answers), set(self.ANSWERS) | {"least"})
+        self.assertEqual(solver.filter_words(correct_positions={0: 's'}),
+                         ["slate", "steal", "siege"])
+        self.assertEqual(solver.filter_feedback([("crane", "bbbbg")]),
+                         ["geese", "siege"])
+        self.assertEqual(solver.get_stats()["total_answers"], 8)
+
+    def test_probe_guesses(self):
+        """With probes, every guess is scored against the remaining answers."""
+        solver = WordleSolver(self.words_file, answers_file=self.answers_file)
+        possible = solver.filter_words(correct_letters=['s', 'e'])
+        results = solver.solve(correct_letters=['s', 'e'], max_results=len(solver.words),
+                               probes=True)
+        self.assertEqual({word for word, _ in results}, set(solver.words))
+        for word, score in results:
+            self.assertEqual(score, solver.calculate_elimination_score(word, possible))
+        without = solver.solve(correct_letters=['s', 'e'], max_results=len(solver.words))
+        self.assertEqual({word for word, _ in without}, set(possible))
+
+    def test_asymmetric_table(self):
+        """The pattern table holds one column per answer, not per guess."""
+        direct = WordleSolver(self.words_file, answers_file=self.answers_file)
+        cached = WordleSolver(self.words_file, answers_file=self.answers_file,
+                              pattern_cache=self.cache_dir)
+        table = cached.pattern_table
+        self.assertEqual(table.size, len(cached.answers))
+        self.assertEqual(os.path.getsize(table.path) - 16,
+                         len(cached.words) * len(cached.answers))
+        for i, guess in enumerate(cached.words):
+            self.assertEqual(bytes(table.row(i)), pattern_codes(guess, cached.answers))
+        self.assertEqual(direct.solve(incorrect_letters=['o'], probes=True, exhaustive=True),
+                         cached.solve(incorrect_letters=['o'], probes=True))
+        parallel = WordleSolver(self.words_file, answers_file=self.answers_file,
+                                pattern_cache=self.cache_dir, workers=2)
+        answers = parallel.answers[:5]
+        self.assertEqual(parallel._elimination_scores(parallel.words * 4, answers),
+                         direct._elimination_scores(direct.words * 4, answers))
+        parallel.close()
+        cached.close()
+
+
+class TestWordLength(unittest.TestCase):
+    """Test solving with words other than five letters long."""
+
+    WORDS = ["planet", "plants", "tables", "stable", "bleats", "nettle", "letter",
+             "settle", "little", "kettle", "banana", "papaya"]
+
+    def setUp(self):
+        """Set up a 6-letter word list (plus a stray 5-letter word)."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.words_file = write_word_list(self.tmpdir.name, self.WORDS + ["crane"])
+        self.cache_dir = os.path.join(self.tmpdir.name, "cache")
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.tmpdir.cleanup()
+
+    def test_filtering_and_feedback(self):
+        """Only words of the configured length are loaded and filtered."""
+        solver = WordleSolver(self.words_file, word_length=6)
+        self.assertEqual(solver.words, self.WORDS)
+        self.assertEqual(solver.filter_words(correct_positions={5: 'e'}),
+                         ["stable", "nettle", "settle", "little", "kettle"])
+        code = get_pattern_code("settle", "kettle")
+        self.assertGreater(code, 255)
+        self.assertEqual(format_feedback(code, 6), "bggggg")
+        self.assertEqual(solver.filter_feedback([("settle", "bggggg")]), ["nettle", "kettle"])
+        self.assertEqual(solver._get_guess_pattern("settle", "kettle")[0], "gray")
+
+        # The 5-letter snapshot of the same file is kept separately
+        five = WordleSolver(self.words_file)
+        self.assertEqual(five.words, ["crane"])
+        self.assertEqual(WordleSolver(self.words_file, word_length=6).words, self.WORDS)
+
+    def test_wide_codes_and_table(self):
+        """Six-letter codes are 16-bit, in memory and in the pattern table."""
+        direct = WordleSolver(self.words_file, word_length=6)
+        codes = pattern_codes("settle", self.WORDS)
+        self.assertEqual(codes.itemsize, 2)
+        self.assertEqual(list(codes), [get_pattern_code("settle", w) for w in self.WORDS])
+
+        cached = WordleSolver(self.words_file, word_length=6, pattern_cache=self.cache_dir)
+        self.assertEqual(cached.pattern_table.code_size, 2)
+        for i, guess in enumerate(cached.words):
+            self.assertEqual(list(cached.pattern_table.row(i)),
+                             list(pattern_codes(guess, cached.words)))
+        self.assertEqual(direct.solve(incorrect_letters=['k'], exhaustive=True),
+                         cached.solve(incorrect_letters=['k']))
+        cached.close()
+
+    def test_unsupported_length(self):
+        """Only lengths from 4 to 8 are accepted."""
+        for length in (1, 3, 9, 10, 11):
+            with self.assertRaises(ValueError):
+                WordleSolver(self.words_file, word_length=length)
+        for word in ("word", "wordlist"):
+            words_file = write_word_list(self.tmpdir.name, [word])
+            solver = WordleSolver(words_file, word_length=len(word), snapshot=False)
+            self.assertEqual(solver.words, [word])
+
+    def test_unsupported_length_on_command_line(self):
+        """--length outside 4 to 8 is a usage error, not a traceback."""
+        for main, argv in ((cli.main, ["--length", "3"]), (cli.main, ["serve", "--length", "9"]),
+                           (simulate.main, ["--length", "3"])):
+            stderr = io.StringIO()
+            with mock.patch("sys.argv", ["prog"] + argv), \
+                    contextlib.redirect_stderr(stderr), self.assertRaises(SystemExit):
+                main()
+            self.assertIn("invalid choice", stderr.getvalue())
+
+
+class TestHardMode(unittest.TestCase):
+    """Test hard-mode solving with lookahead."""
+
+    WORDS = ["dight", "duing", "gilas", "goier", "gundi", "hight", "liege",
+             "light", "night", "riggs", "sight", "tight", "twigs", "wring"]
+    HISTORY = [("duing", "bbyby")]
+
+    def setUp(self):
+        """Set up a small word list full of _IGHT words."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.solver = WordleSolver(write_word_list(self.tmpdir.name, self.WORDS))
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.tmpdir.cleanup()
+
+    def two_turn_score(self, guess, possible):
+        """Brute-force expected eliminations of guess plus the best hard-mode follow-up."""
+        buckets = {}
+        for answer in possible:
+            buckets.setdefault(get_pattern_code(guess, answer), []).append(answer)
+        remaining = 0.0
+        for code, bucket in buckets.items():
+            if code == 242:
+                continue
+            history = self.HISTORY + [(guess, format_feedback(code))]
+            mask = self.solver._hard_mode_mask(None, None, None, history)
+            allowed = [w for w in self.WORDS if mask >> self.solver._word_index[w] & 1]
+            best = min(len(bucket) - self.solver.calculate_elimination_score(w, bucket)
+                       for w in allowed)
+            remaining += len(bucket) * best
+        return len(possible) - remaining / len(possible)
+
+    def test_guesses_respect_hints(self):
+        """Every hard-mode guess keeps greens in place and uses revealed letters."""
+        solver = WordleSolver("words.csv")
+        history = [("crane", "bybgb")]
+        results = solver.solve(feedback=history, hard_mode=True, max_results=50)
+        self.assertTrue(results)
+        for word, _ in results:
+            self.assertEqual(word[3], 'n')
+            self.assertIn('r', word)
+        self.assertEqual(solver.get_best_guess(feedback=history, hard_mode=True),
+                         results[0][0])
+
+    def test_lookahead_avoids_trap(self):
+        """Lookahead prefers the guess whose buckets hard mode can still split."""
+        possible = self.solver.filter_feedback(self.HISTORY)
+        allowed = self.solver._mask_to_words(
+            self.solver._hard_mode_mask(None, None, None, self.HISTORY))
+        greedy = max(allowed, key=lambda w: self.solver.calculate_elimination_score(w, possible))
+        self.assertEqual(greedy, "twigs")
+
+        results = self.solver.solve(feedback=self.HISTORY, hard_mode=True,
+                                    max_results=len(allowed))
+        self.assertEqual(results[0][0], "gilas")
+        self.assertEqual({word for word, _ in results}, set(allowed))
+        # Every returned guess is scored on the same two-turn scale, best first
+        for word, score in results:
+            self.assertAlmostEqual(score, self.two_turn_score(word, possible))
+        scores = [score for _, score in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(self.solver.solve(feedback=self.HISTORY, hard_mode=True,
+                                           max_results=3), results[:3])
+
+
+class TestMultiBoard(unittest.TestCase):
+    """Test joint guess scoring across several boards."""
+
+    def setUp(self):
+        """Set up the solver and four boards after one shared guess."""
+        self.solver = WordleSolver("words.csv")
+        self.boards = [{"feedback": [("lares", pattern)]}
+                       for pattern in ("bbybb", "ybbbg", "gbbbb", "bbybb")]
+
+    def test_scores_are_summed_per_board(self):
+        """A guess's joint score is the sum of its per-board elimination scores."""
+        results = solve_boards(self.solver, self.boards[1:], max_results=5, exhaustive=True)
+        self.assertEqual(len(results), 5)
+        per_board = [self.solver.filter_feedback(board["feedback"]) for board in self.boards[1:]]
+        for word, score in results:
+            expected = sum(self.solver.calculate_elimination_score(word, words)
+                           for words in per_board)
+            self.assertAlmostEqual(score, expected)
+
+    def test_duplicate_and_solved_boards(self):
+        """Identical boards count once per board; solved boards are skipped."""
+        single = solve_boards(self.solver, self.boards[:1], max_results=3)
+        double = solve_boards(self.solver, [self.boards[0], self.boards[3]], max_results=3)
+        self.assertEqual([word for word, _ in single], [word for word, _ in double])
+        for (_, one), (_, two) in zip(single, double):
+            self.assertAlmostEqual(2 * one, two)
+
+        solved = {"feedback": [("lares", "bbbbb"), ("point", "ggggg")]}
+        self.assertEqual(solve_boards(self.solver, self.boards[:1] + [solved], max_results=3),
+                         single)
+        self.assertEqual(solve_boards(self.solver, [solved]), [])
+
+    def test_single_board_matches_solve(self):
+        """With one board the ranking is the same as solve()."""
+        history = [("lares", "bbbbb"), ("point", "bygbg")]
+        self.assertEqual(solve_boards(self.solver, [{"feedback": history}], max_results=5),
+                         self.solver.solve(feedback=history, max_results=5))
+
+
+class TestServer(unittest.TestCase):
+    """Test the local HTTP service."""
+
+    def setUp(self):
+        """Start a server on a free local port in a background thread."""
+        self.solver = WordleSolver("words.csv")
+        self.server = WordleServer(self.solver, threads=2)
+        self.loop = asyncio.new_event_loop()
+        _, self.port = self.loop.run_until_complete(self.server.start("127.0.0.1", 0))
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        """Stop the server and its event loop."""
+        asyncio.run_coroutine_threadsafe(self.server.close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def request(self, connection, method, path, body=None):
+        connection.request(method, path, body=json.dumps(body) if body is not None else None)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_endpoints(self):
+        """Stats, solve and best-guess share one keep-alive connection."""
+        connection = http.client.HTTPConnection("127.0.0.1", self.port)
+        status, stats = self.request(connection, "GET", "/stats")
+        self.assertEqual((status, stats), (200, self.solver.get_stats()))
+
+        body = {"correct_positions": {"2": "a"}, "correct_letters": ["r", "e"],
+                "incorrect_letters": ["c", "n"], "wrong_positions": {"r": [1], "e": [4]},
+                "max_results": 3}
+        status, payload = self.request(connection, "POST", "/solve", body)
+        expected = self.solver.solve({2: 'a'}, ['r', 'e'], ['c', 'n'], {'r': {1}, 'e': {4}},
+                                     max_results=3)
+        self.assertEqual(status, 200)
+        self.assertEqual([(r["word"], r["score"]) for r in payload["results"]], expected)
+
+        status, payload = self.request(connection, "POST", "/best-guess",
+                                       {"feedback": "crane:bygbb"})
+        self.assertEqual(payload["guess"],
+                         self.solver.get_best_guess(feedback=[("crane", "bygbb")]))
+
+        self.assertEqual(self.request(connection, "GET", "/missing")[0], 404)
+        self.assertEqual(self.request(connection, "GET", "/solve")[0], 405)
+        connection.request("POST", "/solve", body="not json")
+        response = connection.getresponse()
+        self.assertEqual(response.status, 400)
+        response.read()
+        for body in ({"objective": "bogus"}, {"depth": 0}):
+            status, payload = self.request(connection, "POST", "/solve", body)
+            self.assertEqual(status, 400)
+            self.assertIn("error", payload)
+        connection.close()
+
+    def test_invalid_content_length(self):
+        """A non-integer or negative Content-Length is answered with 400."""
+        for value in ("abc", "-5"):
+            connection = http.client.HTTPConnection("127.0.0.1", self.port)
+            connection.putrequest("POST", "/solve")
+            connection.putheader("Content-Length", value)
+            connection.endheaders()
+            response = connection.getresponse()
+            self.assertEqual(response.status, 400)
+            self.assertIn("error", json.loads(response.read()))
+            connection.close()
+
+    def test_identical_requests_are_coalesced(self):
+        """Concurrent identical requests run one computation."""
+        original_solve = self.solver.solve
+
+        def slow_solve(*args, **kwargs):
+            time.sleep(0.2)
+            return original_solve(*args, **kwargs)
+
+        self.solver.solve = slow_solve
+        body = json.dumps({"correct_positions": {"0": "a"}}).encode()
+
+        async def burst():
+            return await asyncio.gather(
+                *(self.server.dispatch("POST", "/solve", body) for _ in range(5)))
+
+        results = asyncio.run_coroutine_threadsafe(burst(), self.loop).result()
+        self.assertEqual(self.server.computations, 1)
+        self.assertTrue(all(result == results[0] for result in results))
+
+
+class TestBatchMode(unittest.TestCase):
+    """Test the JSONL batch mode of the command-line interface."""
+
+    def setUp(self):
+        """Write a small batch input file."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.batch_file = os.path.join(self.tmpdir.name, "batch.jsonl")
+        requests = [
+            {"id": "crane", "correct_positions": {"2": "a"}, "correct_letters": ["r", "e"],
+             "incorrect_letters": ["c", "n"], "wrong_positions": {"r": [1], "e": [4]}},
+            {"correct_positions": {"0": "p"}, "max_results": 3},
+        ]
+        with open(self.batch_file, "w", encoding="utf-8") as file:
+            for request in requests:
+                file.write(json.dumps(request) + "\n")
+            file.write("not json\n")
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.tmpdir.cleanup()
+
+    def run_batch(self, workers, ordered):
+        args = argparse.Namespace(batch=self.batch_file, words="words.csv", pattern_cache=None,
+                                  answers=None, length=5, workers=workers, ordered=ordered, max_results=5)
+        output = io.StringIO()
+        cli.run_batch(args, output)
+        return [json.loads(line) for line in output.getvalue().splitlines()]
+
+    def test_batch_results(self):
+        """Each input line produces one result line, errors included."""
+        results = self.run_batch(workers=1, ordered=False)
+        self.assertEqual([result["id"] for result in results], ["crane", 2, 3])
+        solver = WordleSolver("words.csv")
+        expected = solver.solve({2: 'a'}, ['r', 'e'], ['c', 'n'], {'r': {1}, 'e': {4}},
+                                max_results=5)
+        self.assertEqual([(r["word"], r["score"]) for r in results[0]["results"]], expected)
+        self.assertEqual(len(results[1]["results"]), 3)
+        self.assertIn("error", results[2])
+
+    def test_unexpected_error_stays_on_its_line(self):
+        """Any exception from one request becomes that line's error result."""
+        solver = WordleSolver("words.csv")
+        with mock.patch.object(solver, "solve", side_effect=RuntimeError("boom")):
+            result = json.loads(cli.solve_batch_line(solver, 7, '{"id": "x"}', 5))
+        self.assertEqual(result, {"id": "x", "error": "boom"})
+
+    def test_parallel_ordered_batch(self):
+        """Parallel batch output can be kept in input order."""
+        self.assertEqual(self.run_batch(workers=2, ordered=True),
+                         self.run_batch(workers=1, ordered=False))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,243 @@
+"""
+Compact storage for fixed-length word lists.
+
+A WordMatrix holds N words of L letters as one contiguous N x L buffer of
+one-byte letter codes (the Latin-1 code of each letter) instead of N
+Python strings, about one byte per letter instead of some sixty bytes per
+word. Strings are only built for the words actually read; bulk work such
+as bitset construction, letter counts and pattern projections runs on the
+packed letters of the whole list at once.
+"""
+
+from array import array
+from collections.abc import Sequence
+from itertools import compress
+from typing import Iterable, Iterator, List
+
+# WordIndex.rows looks up batches of at least 1/_BULK_SHARE of the rows in a
+# temporary dict, which costs about as much as probing that many words
+_BULK_SHARE = 4
+
+
+class WordIndex:
+    """
+    Read-only word -> row mapping over a WordMatrix.
+
+    An open-addressing hash table of row numbers, so the words themselves
+    are never stored twice. Like a dict built from the rows in order, a
+    repeated word maps to its last row. The table is built on first use.
+    """
+
+    def __init__(self, matrix: "WordMatrix"):
+        self._matrix = matrix
+        self._slots: array | None = None
+        self._mask = 0
+
+    def _build(self) -> array:
+        """Insert every row, with linear probing at a load factor of at most 1/2."""
+        matrix = self._matrix
+        length = matrix.word_length
+        text = matrix.text()
+        size = 8
+        while size < 2 * len(matrix):
+            size *= 2
+        slots = array("i", [-1]) * size
+        mask = size - 1
+        for row, start in enumerate(range(0, len(text), length)):
+            word = text[start : start + length]
+            slot = hash(word) & mask
+            while True:
+                other = slots[slot]
+                if other < 0 or text[other * length : (other + 1) * length] == word:
+                    slots[slot] = row
+                    break
+                slot = (slot + 1) & mask
+        self._slots = slots
+        self._mask = mask
+        return slots
+
+    def get(self, word: str, default=None):
+        """Return the row of word, or default when it is not in the matrix."""
+        slots = self._slots
+        if slots is None:
+            slots = self._build()
+        matrix = self._matrix
+        length = matrix.word_length
+        if not isinstance(word, str) or len(word) != length:
+            return default
+        try:
+            key = word.encode("latin-1")
+        except UnicodeEncodeError:
+            return default
+        data = matrix.data
+        mask = self._mask
+        slot = hash(word) & mask
+        while True:
+            row = slots[slot]
+            if row < 0:
+                return default
+            start = row * length
+            if data[start : start + length] == key:
+                return row
+            slot = (slot + 1) & mask
+
+    def rows(self, words: Sequence[str]) -> List[int] | None:
+        """
+        Return the rows of many words at once, or None if any is missing.
+
+        Probing runs in Python, so a batch that is a sizeable share of the
+        matrix is answered from a dict built for the call and dropped after.
+        """
+        if len(words) * _BULK_SHARE < len(self._matrix):
+            rows = []
+            for word in words:
+                row = self.get(word)
+                if row is None:
+                    return None
+                rows.append(row)
+            return rows
+        positions = dict(zip(self._matrix, range(len(self._matrix))))
+        try:
+            return [positions[word] for word in words]
+        except (KeyError, TypeError):
+            return None
+
+    def __getitem__(self, word: str) -> int:
+        row = self.get(word)
+        if row is None:
+            raise KeyError(word)
+        return row
+
+    def __contains__(self, word) -> bool:
+        return self.get(word) is not None
+
+
+class WordMatrix(Sequence):
+    """Read-only sequence of equal-length words packed in one byte buffer."""
+
+    def __init__(self, data, word_count: int, word_length: int):
+        """
+        Args:
+            data: Buffer holding the letter codes row after row, at least
+                word_count * word_length bytes (bytes, shared memory, ...)
+            word_count: Number of words
+            word_length: Letters per word
+        """
+        self.data = data
+        self.word_count = word_count
+        self.word_length = word_length
+        self._index: WordIndex | None = None
+
+    @classmethod
+    def from_words(cls, words: Sequence[str], word_length: int) -> "WordMatrix":
+        """
+        Pack a list of words.
+
+        Raises:
+            ValueError: If a word is not word_length letters long or has a
+                letter outside Latin-1
+        """
+        packed = "".join(words)
+        if len(packed) != word_length * len(words):
+            raise ValueError(f"words must all be {word_length} letters long")
+        return cls(packed.encode("latin-1"), len(words), word_length)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the letter codes."""
+        return self.word_count * self.word_length
+
+    def __len__(self) -> int:
+        return self.word_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            length = self.word_length
+            text = self.text()
+            return [
+                text[i * length : (i + 1) * length]
+                for i in range(*index.indices(self.word_count))
+            ]
+        if index < 0:
+            index += self.word_count
+        if not 0 <= index < self.word_count:
+            raise IndexError("word index out of range")
+        start = index * self.word_length
+        return str(self.data[start : start + self.word_length], "latin-1")
+
+    def __iter__(self) -> Iterator[str]:
+        length = self.word_length
+        text = self.text()
+        for start in range(0, len(text), length):
+            yield text[start : start + length]
+
+    def __contains__(self, word) -> bool:
+        return word in self.positions()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, WordMatrix):
+            return self.word_length == other.word_length and self.text() == other.text()
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    # Concatenation and repetition give plain lists, as on a list of words
+    def __add__(self, other) -> List[str]:
+        return list(self) + list(other)
+
+    def __radd__(self, other) -> List[str]:
+        return list(other) + list(self)
+
+    def __mul__(self, count: int) -> List[str]:
+        return list(self) * count
+
+    __rmul__ = __mul__
+
+    def __repr__(self) -> str:
+        return f"WordMatrix({self.word_count} words x {self.word_length} letters)"
+
+    def text(self) -> str:
+        """All words concatenated, decoded in one step."""
+        return str(self.data[: self.nbytes], "latin-1")
+
+    def select(self, flags: Iterable) -> List[str]:
+        """The words whose flag is truthy, in order."""
+        length = self.word_length
+        text = self.text()
+        return [
+            text[start : start + length]
+            for start in compress(range(0, len(text), length), flags)
+        ]
+
+    def positions(self) -> WordIndex:
+        """Word -> row mapping, shared by every caller."""
+        if self._index is None:
+            self._index = WordIndex(self)
+        return self._index
+
+
+def pack_words(words: Sequence[str], word_length: int) -> Sequence[str]:
+    """
+    Store a validated word list as a WordMatrix, or keep it as a list when
+    a letter does not fit in one byte.
+    """
+    try:
+        return WordMatrix.from_words(words, word_length)
+    except ValueError:
+        return list(words)
+
+
+def packed_text(words: Sequence[str]) -> str:
+    """All words of a word list concatenated."""
+    if isinstance(words, WordMatrix):
+        return words.text()
+    return "".join(words)
+
+
+def word_positions(words: Sequence[str]):
+    """Word -> position mapping of a word list (the last position of a repeat)."""
+    if isinstance(words, WordMatrix):
+        return words.positions()
+    return {word: i for i, word in enumerate(words)}
@@ -1,59 +1,301 @@
-import csv
-from collections import Counter, defaultdict
-from typing import List, Dict, Set, Tuple
+import heapq
+import math
+import sys
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from itertools import compress
+from operator import getitem, itemgetter
+from typing import Iterable, List, Dict, Sequence, Set, Tuple
+
+from constraints import FeedbackConstraints, compile_feedback
+from parallel import ScoringPool
+from patterns import (
+    GRAY,
+    GREEN,
+    PatternTable,
+    all_green_code,
+    expected_elimination,
+    get_pattern_code,
+    pattern_codes,
+    projection_keys,
+)
+from profiling import SolveProfile
+from snapshot import read_snapshot, snapshot_path, source_digest, write_snapshot
+from streaming import iter_words, valid_words
+from word_matrix import WordIndex, WordMatrix, pack_words, packed_text, word_positions
+
+# Translation tables between "0"/"1" digit strings and 0/1 flag bytes
+_FLAG_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+_DIGIT_FLAGS = bytes.maketrans(b"01", b"\x00\x01")
+
+# Smallest batch of guesses worth splitting across worker processes
+_MIN_PARALLEL_GUESSES = 64
+
+# Hard mode: guesses re-ranked with one turn of lookahead, and the number of
+# follow-up guesses tried per feedback bucket besides the bucket's own words
+_HARD_MODE_LOOKAHEAD = 10
+_HARD_MODE_FOLLOW_UPS = 30
+
+# Scoring objectives: expected eliminations, or eliminations in the worst case
+OBJECTIVES = ("elimination", "minimax")
+# Supported word lengths
+WORD_LENGTHS = range(4, 9)
+# Number of slices a pattern table row is gathered in during top-k search
+_TOP_K_CHUNKS = 4
+
+# Frequency factor of a letter never seen at a position, or never seen at all
+_UNSEEN = 0.001
+# Frequency score factor per repeated letter
+_REPEAT_PENALTY = 0.9
+
+
+class _ScoreTable(dict):
+    """Frequency score factors of the letters at one position."""
+
+    def __missing__(self, letter: str) -> float:
+        return _UNSEEN * _UNSEEN
+
+
+# Depth-N lookahead: guesses expanded per game state below the ranked ones,
+# and the branching factor of the estimate used once the depth runs out
+# (calibrated so 2,315 answers cost about 3.4 guesses)
+_LOOKAHEAD_WIDTH = 8
+_LEAF_BRANCHING = 250
 
 
 class WordleSolver:
-    def __init__(self, words_file: str = "words.csv"):
+    def __init__(
+        self,
+        words_file: str = "words.csv",
+        pattern_cache: str | None = None,
+        workers: int = 1,
+        strategy_tree: str | None = None,
+        snapshot: bool = True,
+        cache_size: int = 256,
+        cache_max_bytes: int = 16 * 1024 * 1024,
+        profiling: bool = False,
+        answers_file: str | None = None,
+        word_length: int = 5,
+        opening_book: str | None = None,
+        words: Iterable[str] | None = None,
+    ):
         """
         Initialize the Wordle solver with a list of possible words.
 
         Args:
             words_file: Path to CSV file containing possible Wordle answers
+            pattern_cache: Directory for the precomputed guess x answer pattern
+                table. When set, the table is loaded (or built once and saved)
+                and elimination scoring reads feedback codes from it.
+            workers: Number of processes used to score guess candidates. With
+                more than one, a process pool is started on first use and
+                reused for every later call.
+            strategy_tree: Path of a precomputed strategy tree file (see
+                strategy_tree.py). get_best_guess then answers on-tree
+                feedback histories by walking the tree instead of scoring.
+            snapshot: If True, load the word list, frequency tables and bitset
+                index from a binary snapshot next to words_file when it matches
+                the file's hash, and (re)write the snapshot otherwise.
+            cache_size: Maximum number of solve() results kept in the LRU
+                cache (0 disables caching)
+            cache_max_bytes: Approximate memory bound for the cached results
+            profiling: If True, every solve() call records a SolveProfile of
+                per-phase wall time, candidate counts and pattern evaluations
+                in last_profile. Can also be toggled later.
+            answers_file: Path to a CSV file of possible answers, usually much
+                smaller than words_file. words_file then only supplies the
+                allowed guesses: filtering returns answers, scoring runs over
+                guesses x remaining answers, and guesses that cannot be the
+                answer can be ranked as probes (see solve()). Answers missing
+                from words_file are added to the guess list.
+            word_length: Length of the words to play with (4 to 8 letters are
+                supported); words of other lengths in the files are skipped.
+                Pattern codes are one byte up to 5 letters and two bytes above.
+            opening_book: Path of an opening book file (see opening_book.py);
+                defaults to the book next to words_file. The book is loaded on
+                the first opening or second-turn query and answers those from
+                precomputed rankings; a missing or stale book is ignored.
+            words: Words to use instead of reading words_file, e.g. the
+                survivors of streaming.stream_candidates over a list too large
+                to load. They are validated like a word list file; no snapshot
+                or default opening book is used.
         """
-        self.words = self._load_words(words_file)
-        self.letter_frequencies = self._calculate_letter_frequencies()
-        self.position_frequencies = self._calculate_position_frequencies()
+        if word_length not in WORD_LENGTHS:
+            raise ValueError(f"Word length must be from 4 to 8, got {word_length}")
+        self.word_length = word_length
+        self.profiling = profiling
+        self.last_profile: SolveProfile | None = None
+        self.workers = workers
+        self.cache_size = cache_size
+        self.cache_max_bytes = cache_max_bytes
+        self._cache_lock = threading.Lock()
+        self.clear_cache()
+        self._scoring_pool: ScoringPool | None = None
+        self._pool_lock = threading.Lock()
+        if words is not None:
+            snapshot = False
+        if not (snapshot and self._load_snapshot(words_file)):
+            if words is not None:
+                words = list(valid_words(words, word_length))
+            else:
+                words = self._load_words(words_file)
+            self.words = pack_words(words, word_length)
+            self._build_bitset_index()
+            self.letter_frequencies = self._calculate_letter_frequencies()
+            self.position_frequencies = self._calculate_position_frequencies()
+            if snapshot and self.words:
+                self._write_snapshot(words_file)
+        self._word_index = word_positions(self.words)
+        self._dictionary_tables = self._score_tables(
+            self.letter_frequencies, self.position_frequencies
+        )
+        self._load_answers(answers_file)
+        self.pattern_table = (
+            PatternTable.load_or_build(
+                self.words,
+                pattern_cache,
+                self.answers if self.answers is not self.words else None,
+            )
+            if pattern_cache is not None and self.words
+            else None
+        )
+        self.strategy_tree = None
+        if strategy_tree is not None:
+            self.load_strategy_tree(strategy_tree)
+        self._words_file = words_file if words is None else None
+        self._opening_book_path = opening_book
+        self._opening_book = None
+        self._opening_book_checked = False
+
+    def load_strategy_tree(self, path: str) -> None:
+        """Load a precomputed strategy tree built for this word list."""
+        from strategy_tree import StrategyTree
+
+        if self.strategy_tree is not None:
+            self.strategy_tree.close()
+        self.strategy_tree = StrategyTree(path, self.words, self.answers)
+
+    def _get_opening_book(self):
+        """Return the opening book, loading it on first use (None without a usable one)."""
+        if not self._opening_book_checked:
+            from opening_book import OpeningBook, opening_book_path
+
+            path = self._opening_book_path
+            if path is None and self._words_file is not None:
+                path = opening_book_path(self._words_file, self.word_length)
+            try:
+                self._opening_book = OpeningBook(path, self.words, self.answers) if path else None
+            except (OSError, ValueError):
+                self._opening_book = None
+            self._opening_book_checked = True
+        return self._opening_book
+
+    def close(self) -> None:
+        """Stop the scoring pool and release memory-mapped files."""
+        with self._pool_lock:
+            if self._scoring_pool is not None:
+                self._scoring_pool.close()
+                self._scoring_pool = None
+        if self.pattern_table is not None:
+            self.pattern_table.close()
+            self.pattern_table = None
+        if self.strategy_tree is not None:
+            self.strategy_tree.close()
+            self.strategy_tree = None
 
     def _load_words(self, words_file: str) -> List[str]:
         """Load words from CSV file."""
-        words = []
         try:
-            with open(words_file, "r", newline="", encoding="utf-8") as file:
-                reader = csv.reader(file)
-                for row in reader:
-                    if row:  # Skip empty rows
-                        word = row[0].strip().lower()
-                        if len(word) == 5 and word.isalpha():  # Ensure 5-letter words
-                            words.append(word)
+            words = list(iter_words(words_file, self.word_length))
         except FileNotFoundError:
             print(f"Warning: {words_file} not found. Using empty word list.")
             words = []
         return words
 
+    def _load_answers(self, answers_file: str | None) -> None:
+        """
+        Set up the answer pool, a subset of the guess list in guess-list order.
+
+        Without an answers file every word is a possible answer and the
+        answer pool is the guess list itself.
+        """
+        if answers_file is None:
+            self.answers = self.words
+            self._answer_mask = self._all_mask
+            self._answer_index = self._word_index
+            return
+
+        answers = self._load_words(answers_file)
+        missing = [word for word in dict.fromkeys(answers) if word not in self._word_index]
+        if missing:
+            self.words = pack_words(list(self.words) + missing, self.word_length)
+            self._build_bitset_index()
+            self._word_index = word_positions(self.words)
+        self._answer_mask = self._indices_to_mask(self._indices_of(answers))
+        self.answers = pack_words(self._mask_to_words(self._answer_mask), self.word_length)
+        self._answer_index = word_positions(self.answers)
+
+    def _load_snapshot(self, words_file: str) -> bool:
+        """Restore the loaded state from a snapshot; False if there is no valid one."""
+        try:
+            self._source_digest = source_digest(words_file)
+        except OSError:
+            self._source_digest = None
+            return False
+        data = read_snapshot(
+            snapshot_path(words_file, self.word_length), self._source_digest
+        )
+        if data is None or any(len(word) != self.word_length for word in data["words"][:1]):
+            return False
+
+        self.words = data["words"]
+        self._all_mask = (1 << len(self.words)) - 1
+        self._position_masks = data["position_masks"]
+        self._count_masks = data["count_masks"]
+
+        total_letters = sum(data["letter_counts"].values())
+        self.letter_frequencies = {
+            letter: count / total_letters
+            for letter, count in data["letter_counts"].items()
+            if count
+        }
+        self.position_frequencies = {}
+        for pos, counts in data["position_counts"].items():
+            total = sum(counts.values())
+            self.position_frequencies[pos] = {
+                letter: count / total for letter, count in counts.items() if count
+            }
+        return True
+
+    def _write_snapshot(self, words_file: str) -> None:
+        """Save the loaded state next to words_file; failures are ignored."""
+        if self._source_digest is not None:
+            write_snapshot(
+                snapshot_path(words_file, self.word_length),
+                self._source_digest,
+                self.words,
+                self._position_masks,
+                self._count_masks,
+            )
+
     def _calculate_letter_frequencies(self) -> Dict[str, float]:
         """Calculate frequency of each letter across all words."""
-        letter_count = Counter()
-        total_letters = 0
-
-        for word in self.words:
-            for letter in word:
-                letter_count[letter] += 1
-                total_letters += 1
+        packed = packed_text(self.words)
+        letter_count = Counter(packed)
+        total_letters = len(packed)
 
         return {letter: count / total_letters for letter, count in letter_count.items()}
 
     def _calculate_position_frequencies(self) -> Dict[int, Dict[str, float]]:
         """Calculate frequency of each letter at each position."""
-        position_counts = defaultdict(Counter)
-
-        for word in self.words:
-            for pos, letter in enumerate(word):
-                position_counts[pos][letter] += 1
+        packed = packed_text(self.words)
+        position_counts = {
+            pos: Counter(packed[pos :: self.word_length]) for pos in range(self.word_length)
+        }
 
         # Convert to frequencies
         position_frequencies = {}
-        for pos in range(5):
+        for pos in range(self.word_length):
             total = sum(position_counts[pos].values())
             position_frequencies[pos] = {
                 letter: count / total for letter, count in position_counts[pos].items()
@@ -72,37 +314,165 @@ class WordleSolver:
         Filter words based on Wordle constraints.
 
         Args:
-            correct_positions: Dict mapping position (0-4) to correct letter
+            correct_positions: Dict mapping position (0-based) to correct letter
             correct_letters: List of letters that are in the word but position unknown
             incorrect_letters: List of letters that are not in the word
             wrong_positions: Dict mapping letter to set of positions where it's NOT located
                            (but the letter is in the word somewhere else)
 
         Returns:
-            List of words that satisfy all constraints
-        """
-        if correct_positions is None:
-            correct_positions = {}
-        if correct_letters is None:
-            correct_letters = []
-        if incorrect_letters is None:
-            incorrect_letters = []
-        if wrong_positions is None:
-            wrong_positions = {}
-
-        filtered_words = []
-
-        for word in self.words:
-            if self._satisfies_constraints(
-                word,
-                correct_positions,
-                correct_letters,
-                incorrect_letters,
-                wrong_positions,
-            ):
-                filtered_words.append(word)
+            List of possible answers that satisfy all constraints
+        """
+        return self._mask_to_words(
+            self._constraint_mask(
+                correct_positions, correct_letters, incorrect_letters, wrong_positions
+            )
+        )
+
+    def _build_bitset_index(self) -> None:
+        """
+        Build bitmasks over the word list for constant-time constraint checks.
+
+        Bit i of a mask is set when self.words[i] has the property:
+        position_masks[pos][letter] marks words with letter at pos, and
+        count_masks[letter][k] marks words containing letter at least k times.
+        """
+        packed = packed_text(self.words)
+        self._all_mask = (1 << len(self.words)) - 1
+        self._position_masks: Dict[int, Dict[str, int]] = defaultdict(dict)
+        letter_masks = defaultdict(list)
+        for pos in range(self.word_length):
+            # One translate of the whole column per letter: '1' where the
+            # letter is, '0' elsewhere, read back as a little-endian mask
+            column = packed[pos :: self.word_length]
+            letters = set(column)
+            digits = dict.fromkeys(map(ord, letters), "0")
+            for letter in letters:
+                digits[ord(letter)] = "1"
+                mask = int(column.translate(digits)[::-1], 2)
+                digits[ord(letter)] = "0"
+                self._position_masks[pos][letter] = mask
+                letter_masks[letter].append(mask)
+
+        # at_least[k] marks words with k or more copies of the letter among
+        # the positions seen so far
+        self._count_masks: Dict[str, List[int]] = {}
+        for letter, masks in sorted(letter_masks.items()):
+            at_least = [self._all_mask]
+            for mask in masks:
+                at_least.append(at_least[-1] & mask)
+                for k in range(len(at_least) - 2, 0, -1):
+                    at_least[k] |= at_least[k - 1] & mask
+            while not at_least[-1]:
+                at_least.pop()
+            self._count_masks[letter] = at_least
+
+    def _indices_to_mask(self, indices: List[int]) -> int:
+        """Pack word indices into an integer bitmask."""
+        flags = bytearray(len(self.words))
+        for i in indices:
+            flags[i] = 1
+        return int(bytes(flags[::-1]).translate(_FLAG_DIGITS), 2) if flags else 0
+
+    def _mask_to_words(self, mask: int) -> List[str]:
+        """Materialize the words whose bits are set in mask, in list order."""
+        if not mask:
+            return []
+        flags = bin(mask)[:1:-1].encode("ascii").translate(_DIGIT_FLAGS)
+        if isinstance(self.words, WordMatrix):
+            return self.words.select(flags)
+        return list(compress(self.words, flags))
+
+    def _count_mask(self, letter: str, count: int) -> int:
+        """Mask of words containing letter at least count times."""
+        masks = self._count_masks.get(letter)
+        if masks is None:
+            return self._all_mask if count <= 0 else 0
+        return masks[count] if count < len(masks) else 0
+
+    def _constraint_mask(
+        self,
+        correct_positions: Dict[int, str] | None,
+        correct_letters: List[str] | None,
+        incorrect_letters: List[str] | None,
+        wrong_positions: Dict[str, Set[int]] | None,
+    ) -> int:
+        """
+        Resolve the four constraint types to a bitmask of matching words.
+
+        This applies exactly the rules of _satisfies_constraints, expressed
+        as AND/ANDNOT operations over the precomputed index.
+        """
+        correct_positions = correct_positions or {}
+        correct_letters = list(correct_letters or [])
+        incorrect_letters = list(incorrect_letters or [])
+        wrong_positions = wrong_positions or {}
 
-        return filtered_words
+        mask = self._answer_mask
+
+        # Green letters
+        for pos, letter in correct_positions.items():
+            mask &= self._position_masks.get(pos, {}).get(letter, 0)
+
+        # Yellow letters must appear somewhere, but not at their wrong positions
+        for letter in correct_letters:
+            mask &= self._count_mask(letter, 1)
+        for letter, wrong_pos_set in wrong_positions.items():
+            mask &= self._count_mask(letter, 1)
+            for pos in wrong_pos_set:
+                mask &= ~self._position_masks.get(pos, {}).get(letter, 0)
+
+        # Duplicate letters: enough copies for every green and yellow, and
+        # fewer copies than a gray would allow
+        known_letters = set(correct_positions.values()) | set(correct_letters)
+        green_counts = Counter(correct_positions.values())
+        yellow_counts = Counter(correct_letters)
+        for letter in known_letters:
+            mask &= self._count_mask(letter, green_counts[letter] + yellow_counts[letter])
+        for letter, count in Counter(incorrect_letters).items():
+            if letter not in known_letters and letter not in wrong_positions:
+                mask &= ~self._count_mask(letter, 1)
+            else:
+                limit = count + green_counts[letter] + yellow_counts[letter]
+                mask &= ~self._count_mask(letter, limit)
+
+        return mask & self._all_mask
+
+    def filter_feedback(
+        self, feedback: FeedbackConstraints | List[Tuple[str, str]]
+    ) -> List[str]:
+        """
+        Filter words using raw guess feedback.
+
+        Args:
+            feedback: Compiled FeedbackConstraints, or (guess, feedback) pairs
+                such as [("crane", "bygbb")] which are compiled first
+
+        Returns:
+            List of words consistent with all of the feedback
+        """
+        return self._mask_to_words(self._feedback_mask(feedback))
+
+    def _feedback_mask(
+        self, feedback: FeedbackConstraints | List[Tuple[str, str]] | None
+    ) -> int:
+        """Resolve compiled feedback constraints to a bitmask of matching words."""
+        if feedback is None:
+            return self._answer_mask
+        if not isinstance(feedback, FeedbackConstraints):
+            feedback = compile_feedback(feedback, self.word_length)
+
+        mask = self._answer_mask
+        for pos, letter in feedback.fixed.items():
+            mask &= self._position_masks.get(pos, {}).get(letter, 0)
+        for pos, letters in feedback.banned.items():
+            for letter in letters:
+                mask &= ~self._position_masks.get(pos, {}).get(letter, 0)
+        for letter, count in feedback.min_counts.items():
+            mask &= self._count_mask(letter, count)
+        for letter, count in feedback.max_counts.items():
+            mask &= ~self._count_mask(letter, count + 1)
+        return mask & self._all_mask
 
     def _satisfies_constraints(
         self,
@@ -165,28 +535,84 @@ class WordleSolver:
         """
         Calculate probability score for a word based on letter and position frequencies.
         Higher score means more likely to be the answer.
+
+        Frequencies are those of the whole word list; frequency_scores scores
+        many words at once against the frequencies of the live candidates.
         """
-        score = 1.0
+        return math.prod(map(getitem, self._dictionary_tables, word)) * _REPEAT_PENALTY ** (
+            len(word) - len(set(word))
+        )
 
-        # Factor in position-specific frequencies
-        for pos, letter in enumerate(word):
-            if letter in self.position_frequencies[pos]:
-                score *= self.position_frequencies[pos][letter]
-            else:
-                score *= 0.001  # Very low probability for unseen combinations
-
-        # Factor in overall letter frequencies
-        letter_count = Counter(word)
-        for letter, count in letter_count.items():
-            if letter in self.letter_frequencies:
-                # Penalize repeated letters slightly
-                score *= (self.letter_frequencies[letter] ** count) * (
-                    0.9 ** (count - 1)
-                )
-            else:
-                score *= 0.001
+    def frequency_scores(
+        self, words: List[str], candidates: List[str] | None = None
+    ) -> List[float]:
+        """
+        Frequency scores of many words at once.
+
+        A word scores the product, over its positions, of the frequency of
+        its letter at that position times the letter's overall frequency,
+        with a penalty per repeated letter, as in calculate_word_probability.
+        Frequencies are counted over candidates (default: words) rather
+        than the whole word list, so letters already ruled out stop
+        counting.
+
+        Args:
+            words: Words to score
+            candidates: Words whose letter frequencies are used, usually the
+                current possible answers
+
+        Returns:
+            One score per word, higher meaning more likely to be the answer
+        """
+        tables = self._live_tables(words if candidates is None else candidates)
+        penalties = [_REPEAT_PENALTY ** (self.word_length - distinct)
+                     for distinct in range(self.word_length + 1)]
+        return [
+            math.prod(map(getitem, tables, word)) * penalties[len(set(word))] for word in words
+        ]
+
+    def _top_by_frequency(self, words: List[str], limit: int) -> List[str]:
+        """The limit best words by their frequency scores among themselves, ties in order."""
+        scores = self.frequency_scores(words)
+        best = heapq.nlargest(limit, range(len(words)), key=scores.__getitem__)
+        return [words[i] for i in best]
+
+    def _live_tables(self, words: List[str]) -> List[_ScoreTable]:
+        """Score tables from the letter frequencies of a set of words."""
+        packed = packed_text(words)
+        position_counts = [Counter(packed[pos :: self.word_length])
+                           for pos in range(self.word_length)]
+        letter_counts = Counter()
+        for counts in position_counts:
+            letter_counts.update(counts)
+        total = len(packed)
+        if not total:
+            return [_ScoreTable() for _ in range(self.word_length)]
+        letter_frequencies = {letter: count / total for letter, count in letter_counts.items()}
+        position_frequencies = {
+            pos: {letter: count / len(words) for letter, count in counts.items()}
+            for pos, counts in enumerate(position_counts)
+        }
+        return self._score_tables(letter_frequencies, position_frequencies)
+
+    def _score_tables(
+        self,
+        letter_frequencies: Dict[str, float],
+        position_frequencies: Dict[int, Dict[str, float]],
+    ) -> List[_ScoreTable]:
+        """
+        Combine letter and position frequencies into one lookup table per position.
 
-        return score
+        Unseen letters, at a position or overall, count as _UNSEEN each.
+        """
+        tables = []
+        for pos in range(self.word_length):
+            at_pos = position_frequencies.get(pos, {})
+            tables.append(_ScoreTable({
+                letter: at_pos.get(letter, _UNSEEN) * frequency
+                for letter, frequency in letter_frequencies.items()
+            }))
+        return tables
 
     def calculate_elimination_score(
         self, word: str, possible_words: List[str]
@@ -202,31 +628,125 @@ class WordleSolver:
         Returns:
             Expected number of words that would be eliminated
         """
-        if len(possible_words) <= 1:
-            return 0.0
+        return self._elimination_scores([word], possible_words)[0]
 
-        # Simulate all possible outcomes for this guess
-        pattern_counts = {}
+    def _elimination_scores(
+        self,
+        guesses: List[str],
+        possible_words: List[str],
+        workers: int | None = None,
+    ) -> List[float]:
+        """
+        Compute exact elimination scores for many guesses against one candidate set.
 
-        for answer in possible_words:
-            # Generate the pattern (green/yellow/gray) for this guess against this answer
-            pattern = self._get_guess_pattern(word, answer)
-            pattern_key = tuple(pattern)
+        With a pattern table, the candidate columns are gathered from each
+        guess row by a single itemgetter built once for the whole batch, and
+        the resulting codes are bucket-counted; nothing is computed per pair.
+        With more than one worker, large batches are split across the
+        scoring pool instead.
+        """
+        total_words = len(possible_words)
+        if total_words <= 1:
+            return [0.0] * len(guesses)
 
-            if pattern_key not in pattern_counts:
-                pattern_counts[pattern_key] = 0
-            pattern_counts[pattern_key] += 1
+        if workers is None:
+            workers = self.workers
+        if workers > 1 and len(guesses) >= _MIN_PARALLEL_GUESSES:
+            guess_indices = self._indices_of(guesses)
+            answer_indices = self._indices_of(possible_words, self._answer_index)
+            pool = self._get_scoring_pool(workers)
+            if pool is not None and guess_indices is not None and answer_indices is not None:
+                return pool.elimination_scores(guess_indices, answer_indices)
 
-        # Calculate expected number of remaining words after this guess
-        total_words = len(possible_words)
-        expected_remaining = 0.0
+        gather = self._column_getter(possible_words)
+        rows = self._rows_of(guesses) if gather is not None else [None] * len(guesses)
+        scores = []
+        for word, row in zip(guesses, rows):
+            # Simulate all possible outcomes for this guess
+            if row is not None:
+                codes = gather(self.pattern_table.row(row))
+            else:
+                codes = pattern_codes(word, possible_words)
+            scores.append(expected_elimination(codes, total_words))
+        return scores
+
+    def _get_scoring_pool(self, workers: int) -> ScoringPool | None:
+        """
+        Return the process pool for this worker count, starting it if needed.
+
+        Threads scoring on the same solver (server threads, interactive
+        speculation) share one pool; the lock keeps them from each starting one.
+        """
+        with self._pool_lock:
+            if self._scoring_pool is not None and self._scoring_pool.workers != workers:
+                self._scoring_pool.close()
+                self._scoring_pool = None
+            if self._scoring_pool is None:
+                if not packed_text(self.words).isascii():
+                    return None
+                table_path = (
+                    self.pattern_table.path if self.pattern_table is not None else None
+                )
+                self._scoring_pool = ScoringPool(self.words, workers, table_path, self.answers)
+            return self._scoring_pool
+
+    def get_pattern_codes(self, word: str, possible_words: List[str]) -> Sequence[int]:
+        """
+        Return the feedback code of a guess against each possible answer.
+
+        Codes are read from the pattern table when one is loaded, and computed
+        otherwise.
+        """
+        return self._pattern_codes(word, possible_words, self._column_getter(possible_words))
+
+    def _pattern_codes(self, word: str, possible_words: List[str], gather) -> Sequence[int]:
+        """get_pattern_codes with the _column_getter of possible_words already built."""
+        row = self._word_index.get(word) if gather is not None else None
+        if row is not None:
+            return gather(self.pattern_table.row(row))
+        return pattern_codes(word, possible_words)
+
+    def _column_getter(self, possible_words: List[str]):
+        """
+        Return a callable extracting the possible_words columns of a table row.
+
+        Returns None when there is no pattern table or a word is not one of
+        its answers.
+        """
+        if self.pattern_table is None:
+            return None
+        if possible_words is self.answers:
+            return lambda row: row
+        answer_indices = self._indices_of(possible_words, self._answer_index)
+        if answer_indices is None:
+            return None
+        if len(answer_indices) == 1:
+            index = answer_indices[0]
+            return lambda row: (row[index],)
+        return itemgetter(*answer_indices)
 
-        for pattern_key, count in pattern_counts.items():
-            probability = count / total_words
-            expected_remaining += probability * count
+    def _indices_of(
+        self, words: List[str], index: Dict[str, int] | None = None
+    ) -> List[int] | None:
+        """
+        Map words to their positions in the word list (or in the list behind
+        index, e.g. the answer pool), or None if any are unknown.
+        """
+        if index is None:
+            index = self._word_index
+        if isinstance(index, WordIndex):
+            return index.rows(words)
+        try:
+            return [index[word] for word in words]
+        except KeyError:
+            return None
 
-        # Return the expected number of words eliminated
-        return total_words - expected_remaining
+    def _rows_of(self, words: List[str]) -> List[int | None]:
+        """Map words to their positions in the word list, None for unknown words."""
+        rows = self._indices_of(words)
+        if rows is None:
+            rows = [self._word_index.get(word) for word in words]
+        return rows
 
     def _get_guess_pattern(self, guess: str, answer: str) -> List[str]:
         """
@@ -239,19 +759,19 @@ class WordleSolver:
         Returns:
             List of patterns: 'green', 'yellow', or 'gray' for each position
         """
-        pattern = ["gray"] * 5
+        pattern = ["gray"] * len(guess)
         answer_chars: List[str | None] = list(answer)
         guess_chars: List[str | None] = list(guess)
 
         # First pass: mark green (correct position)
-        for i in range(5):
+        for i in range(len(guess)):
             if guess_chars[i] == answer_chars[i]:
                 pattern[i] = "green"
                 answer_chars[i] = None  # Remove from available chars
                 guess_chars[i] = None  # Mark as processed
 
         # Second pass: mark yellow (wrong position)
-        for i in range(5):
+        for i in range(len(guess)):
             if guess_chars[i] is not None:  # Not already marked green
                 if guess_chars[i] in answer_chars:
                     pattern[i] = "yellow"
@@ -268,109 +788,706 @@ class WordleSolver:
         wrong_positions: Dict[str, Set[int]] | None = None,
         max_results: int = 20,
         use_elimination_scoring: bool = True,
+        exhaustive: bool | None = None,
+        workers: int | None = None,
+        feedback: FeedbackConstraints | List[Tuple[str, str]] | None = None,
+        probes: bool = False,
+        hard_mode: bool = False,
+        objective: str = "elimination",
+        depth: int = 1,
     ) -> List[Tuple[str, float]]:
         """
         Solve Wordle puzzle given constraints and return ranked list of possibilities.
 
         Args:
-            correct_positions: Dict mapping position (0-4) to correct letter
+            correct_positions: Dict mapping position (0-based) to correct letter
             correct_letters: List of letters that are in the word but position unknown
             incorrect_letters: List of letters that are not in the word
             wrong_positions: Dict mapping letter to set of positions where it's NOT located
             max_results: Maximum number of results to return
             use_elimination_scoring: If True, rank by elimination potential; if False, use frequency-based probability
+            exhaustive: If True, compute the exact elimination score of every possible
+                word instead of pre-filtering large sets down to the top 30 by
+                frequency. Defaults to True when a pattern table is loaded.
+            workers: Number of scoring processes for this call (defaults to the
+                solver's workers setting)
+            feedback: Raw (guess, feedback) pairs or compiled FeedbackConstraints,
+                applied in addition to the other constraints
+            probes: If True, also rank guesses that can no longer be the answer
+                (every word of the guess list), which can split the remaining
+                answers better than any of them
+            hard_mode: If True, only guesses that reuse every green letter in
+                place and contain every revealed letter are ranked, and each
+                is scored by the answers it is expected to eliminate together
+                with the best hard-mode guess after it (see _rank_hard_mode)
+            objective: "elimination" ranks by expected eliminations;
+                "minimax" ranks by the eliminations guaranteed in the worst
+                case (the candidates minus the largest feedback bucket)
+            depth: Number of guesses searched per line of play. 1 ranks by
+                the one-step objective; from 2 on, the best guesses are
+                re-ranked by the expected number of guesses still needed to
+                solve, searched depth levels deep (see _rank_lookahead).
+                Ignored in hard mode and with frequency scoring.
 
         Returns:
-            List of tuples (word, elimination_score) sorted by score (highest first)
+            List of tuples (word, elimination_score) sorted by score (highest
+            first); with depth >= 2, (word, expected_guesses) sorted lowest
+            first
         """
+        profile = SolveProfile() if self.profiling else None
+        self.last_profile = profile
+
         # Filter words based on constraints
-        possible_words = self.filter_words(
+        mask = self._constraint_mask(
             correct_positions, correct_letters, incorrect_letters, wrong_positions
-        )
-
-        if not possible_words:
+        ) & self._feedback_mask(feedback)
+        if profile is not None:
+            profile.phase("filter", len(self.words), mask.bit_count())
+        if not mask:
             return []
 
-        # For initial guess (no constraints), use pre-computed good starting words
-        if (
+        # Initial guesses (no constraints) are answered from the opening book
+        is_opening = (
             not correct_positions
             and not correct_letters
             and not incorrect_letters
             and not wrong_positions
-            and use_elimination_scoring
-            and len(possible_words) == len(self.words)
+            and not feedback
+        )
+
+        # Hard-mode guesses are restricted by the hints, computed once per call
+        guess_mask = None
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective {objective!r}; use one of {OBJECTIVES}")
+        if depth < 1:
+            raise ValueError(f"depth must be at least 1, got {depth}")
+        if hard_mode and use_elimination_scoring and not is_opening:
+            guess_mask = self._hard_mode_mask(correct_positions, correct_letters,
+                                              wrong_positions, feedback)
+
+        # Constraints resolving to the same candidate set share a cache entry
+        cache_key = (
+            mask,
+            is_opening,
+            max_results,
+            use_elimination_scoring,
+            exhaustive,
+            probes,
+            guess_mask,
+            objective,
+            depth,
+        )
+        cached = self._cache_get(cache_key)
+        if profile is not None:
+            profile.cache_hit = cached is not None
+            profile.phase("cache", mask.bit_count(), len(cached or ()))
+        if cached is not None:
+            return cached
+
+        # The opening book ranks the opening and every single-turn feedback
+        # history exactly, by elimination score over the possible answers
+        results = None
+        if (
+            use_elimination_scoring
+            and objective == "elimination"
+            and depth == 1
+            and guess_mask is None
+            and not probes
         ):
-            return self._get_best_starting_words(max_results)
+            history = None
+            if is_opening:
+                history = []
+            elif (
+                not correct_positions
+                and not correct_letters
+                and not incorrect_letters
+                and not wrong_positions
+                and isinstance(feedback, (list, tuple))
+                and len(feedback) == 1
+            ):
+                history = list(feedback)
+            book = self._get_opening_book() if history is not None else None
+            if book is not None:
+                results = book.lookup(history, max_results)
+        if is_opening and exhaustive is None:
+            # Without the book, scoring every opener exactly is too slow
+            exhaustive = False
+
+        if results is not None:
+            if profile is not None:
+                profile.phase("book", mask.bit_count(), len(results))
+        elif guess_mask is not None:
+            possible_words = self._mask_to_words(mask)
+            if profile is not None:
+                profile.phase("materialize", len(possible_words), len(possible_words))
+            results = self._rank_hard_mode(
+                possible_words, guess_mask, max_results, exhaustive, workers, profile
+            )
+        elif depth > 1 and use_elimination_scoring:
+            possible_words = self._mask_to_words(mask)
+            if profile is not None:
+                profile.phase("materialize", len(possible_words), len(possible_words))
+            results = self._rank_lookahead(
+                possible_words, depth, max_results, exhaustive, workers, profile, probes,
+                objective,
+            )
+        else:
+            possible_words = self._mask_to_words(mask)
+            if profile is not None:
+                profile.phase("materialize", len(possible_words), len(possible_words))
+            results = self.rank_candidates(
+                possible_words,
+                max_results,
+                use_elimination_scoring,
+                exhaustive,
+                workers,
+                profile,
+                probes,
+                objective,
+            )
+        self._cache_put(cache_key, results)
+        return results
+
+    def _cache_get(self, key: Tuple) -> List[Tuple[str, float]] | None:
+        """Look up a solve() result, marking it most recently used."""
+        if self.cache_size <= 0:
+            return None
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self._cache_misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self._cache_hits += 1
+            return list(entry[0])
+
+    def _cache_put(self, key: Tuple, results: List[Tuple[str, float]]) -> None:
+        """Store a solve() result, evicting least recently used entries over the bounds."""
+        if self.cache_size <= 0:
+            return
+        size = (
+            sys.getsizeof(key[0])
+            + sys.getsizeof(results)
+            + sum(sys.getsizeof(item) + sys.getsizeof(item[1]) for item in results)
+        )
+        if size > self.cache_max_bytes:
+            return
+        with self._cache_lock:
+            previous = self._cache.pop(key, None)
+            if previous is not None:
+                self._cache_bytes -= previous[1]
+            self._cache[key] = (list(results), size)
+            self._cache_bytes += size
+            while len(self._cache) > self.cache_size or self._cache_bytes > self.cache_max_bytes:
+                _, (_, evicted_size) = self._cache.popitem(last=False)
+                self._cache_bytes -= evicted_size
+                self._cache_evictions += 1
+
+    def cache_info(self) -> Dict[str, int]:
+        """Get hit/miss/eviction counters and current usage of the solve() cache."""
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "evictions": self._cache_evictions,
+            "size": len(self._cache),
+            "max_size": self.cache_size,
+            "bytes": self._cache_bytes,
+            "max_bytes": self.cache_max_bytes,
+        }
+
+    def clear_cache(self) -> None:
+        """Empty the solve() cache and reset its counters."""
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
+
+    def rank_candidates(
+        self,
+        possible_words: List[str],
+        max_results: int = 20,
+        use_elimination_scoring: bool = True,
+        exhaustive: bool | None = None,
+        workers: int | None = None,
+        profile: SolveProfile | None = None,
+        probes: bool = False,
+        objective: str = "elimination",
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank an already-filtered list of possible words.
+
+        When only the best few guesses are wanted, guesses are searched
+        branch-and-bound style (see _top_k_scores) instead of being scored in
+        full and sorted.
+
+        Args:
+            possible_words: Current list of possible answers
+            max_results: Maximum number of results to return
+            use_elimination_scoring: If True, rank by elimination potential; if False, use frequency-based probability
+            exhaustive: See solve()
+            workers: See solve()
+            profile: If given, per-phase timings and counters are recorded in it
+            probes: See solve()
+            objective: See solve()
+
+        Returns:
+            List of tuples (word, score) sorted by score (highest first)
+        """
+        if exhaustive is None:
+            exhaustive = self.pattern_table is not None
 
         # For large word lists (>1000), optimize by using frequency scoring to pre-filter
         candidates = possible_words
-        if use_elimination_scoring and len(possible_words) > 1000:
-            # First, use frequency scoring to get top candidates
-            freq_scores = [
-                (word, self.calculate_word_probability(word)) for word in possible_words
-            ]
-            freq_scores.sort(key=lambda x: x[1], reverse=True)
-            # Take top 30 for elimination scoring
-            candidates = [word for word, _ in freq_scores[: min(30, len(freq_scores))]]
+        prefilter = use_elimination_scoring and not exhaustive
+        if prefilter and len(possible_words) > 1000:
+            # Take the top 30 by frequency among the candidates for elimination scoring
+            candidates = self._top_by_frequency(possible_words, 30)
+            if profile is not None:
+                profile.phase("prefilter", len(possible_words), len(candidates))
+
+        # Probe guesses go after the possible answers, so answers win ties
+        if probes and use_elimination_scoring:
+            possible = set(possible_words)
+            probe_words = [word for word in self.words if word not in possible]
+            if prefilter:
+                probe_words = self._splitting_probes(possible_words, probe_words, 30)
+            candidates = candidates + probe_words
+            if profile is not None:
+                profile.phase("probes", len(self.words) - len(possible), len(probe_words))
 
         # Calculate scores for candidate words
-        word_scores = []
-        for word in candidates:
-            if use_elimination_scoring:
-                score = self.calculate_elimination_score(word, possible_words)
-            else:
-                score = self.calculate_word_probability(word)
-            word_scores.append((word, score))
+        if workers is None:
+            workers = self.workers
+        parallel = workers > 1 and len(candidates) >= _MIN_PARALLEL_GUESSES
+        if use_elimination_scoring and (
+            objective != "elimination" or (max_results < len(candidates) and not parallel)
+        ):
+            results = self._top_k_scores(
+                candidates, possible_words, max_results, objective, profile
+            )
+            if profile is not None:
+                profile.phase("top-k", len(candidates), len(results))
+            return results
+        if use_elimination_scoring:
+            scores = self._elimination_scores(candidates, possible_words, workers)
+            if profile is not None:
+                profile.pattern_evaluations += len(candidates) * len(possible_words)
+        else:
+            scores = self.frequency_scores(candidates, possible_words)
+        word_scores = list(zip(candidates, scores))
+        if profile is not None:
+            profile.phase("scoring", len(candidates), len(word_scores))
 
         # Sort by score (highest first)
         word_scores.sort(key=lambda x: x[1], reverse=True)
+        results = word_scores[:max_results]
+        if profile is not None:
+            profile.phase("sort", len(word_scores), len(results))
+
+        return results
+
+    def _hard_mode_mask(
+        self,
+        correct_positions: Dict[int, str] | None,
+        correct_letters: List[str] | None,
+        wrong_positions: Dict[str, Set[int]] | None,
+        feedback: FeedbackConstraints | List[Tuple[str, str]] | None,
+    ) -> int:
+        """
+        Mask of the guesses allowed in hard mode, over the whole guess list.
+
+        A hard-mode guess keeps every green letter in place and contains each
+        revealed letter at least as often as it has been revealed; gray
+        letters may be reused.
+        """
+        correct_positions = correct_positions or {}
+        mask = self._all_mask
+        for pos, letter in correct_positions.items():
+            mask &= self._position_masks.get(pos, {}).get(letter, 0)
+        counts = Counter(correct_positions.values()) + Counter(correct_letters or [])
+        for letter in wrong_positions or {}:
+            counts[letter] = max(counts[letter], 1)
+        for letter, count in counts.items():
+            mask &= self._count_mask(letter, count)
+
+        if feedback is not None:
+            if not isinstance(feedback, FeedbackConstraints):
+                feedback = compile_feedback(feedback, self.word_length)
+            for pos, letter in feedback.fixed.items():
+                mask &= self._position_masks.get(pos, {}).get(letter, 0)
+            for letter, count in feedback.min_counts.items():
+                mask &= self._count_mask(letter, count)
+        return mask
+
+    def _hint_mask(self, guess: str, code: int) -> int:
+        """Mask of the guesses still allowed in hard mode after guess got code."""
+        mask = self._all_mask
+        revealed: Counter = Counter()
+        for pos, letter in enumerate(guess):
+            code, digit = divmod(code, 3)
+            if digit == GREEN:
+                mask &= self._position_masks.get(pos, {}).get(letter, 0)
+            if digit != GRAY:
+                revealed[letter] += 1
+        for letter, count in revealed.items():
+            mask &= self._count_mask(letter, count)
+        return mask
 
-        return word_scores[:max_results]
-
-    def _get_best_starting_words(self, max_results: int) -> List[Tuple[str, float]]:
-        """
-        Return pre-computed best starting words with their elimination scores.
-        These are based on common Wordle strategy and letter frequency analysis.
-        """
-        # Pre-computed good starting words (these eliminate the most words on average)
-        starting_words = [
-            ("lares", 14512.1),
-            ("rales", 14512.1),
-            ("nares", 14503.9),
-            ("ranes", 14503.7),
-            ("reais", 14498.8),
-            ("soare", 14498.8),
-            ("tares", 14475.7),
-            ("aeros", 14491.9),
-            ("serai", 14490.2),
-            ("rates", 14489.3),
-            ("seria", 144887.8),
-            ("saner", 14486.8),
-            ("arles", 14476.9),
-            ("sater", 14475.7),
-            ("lanes", 14470.3),
-            ("raise", 14467.5),
-            ("tales", 14466.2),
-            ("aloes", 14464.7),
-            ("saine", 14464.0),
-            ("reals", 14464.0),
+    def _rank_hard_mode(
+        self,
+        possible_words: List[str],
+        guess_mask: int,
+        max_results: int,
+        exhaustive: bool | None = None,
+        workers: int | None = None,
+        profile: SolveProfile | None = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank hard-mode guesses with one turn of lookahead.
+
+        Every allowed guess is first scored by its elimination score, as in
+        rank_candidates. The best _HARD_MODE_LOOKAHEAD of them (or the best
+        max_results, if more) are then re-scored by the answers expected to
+        be eliminated after the guess and the best allowed follow-up for each
+        feedback, since in hard mode a guess can leave buckets (like _IGHT)
+        that no allowed follow-up can split. Follow-ups are drawn from the
+        bucket itself and from the guesses that best split the current
+        candidates. Only re-scored guesses are returned, so every score is
+        on the two-turn scale.
+        """
+        if exhaustive is None:
+            exhaustive = self.pattern_table is not None
+        guesses = self._mask_to_words(guess_mask)
+        possible = set(possible_words)
+        probe_words = [word for word in guesses if word not in possible]
+
+        candidates = [
+            word for word, row in zip(possible_words, self._rows_of(possible_words))
+            if row is not None
         ]
+        if not exhaustive and len(candidates) > 1000:
+            candidates = self._top_by_frequency(candidates, 30)
+        if not exhaustive:
+            probe_words = self._splitting_probes(possible_words, probe_words, 30)
+        candidates += probe_words
+        first_scores = self._elimination_scores(candidates, possible_words, workers)
+        ranked = sorted(zip(candidates, first_scores), key=lambda x: x[1], reverse=True)
+        if profile is not None:
+            profile.pattern_evaluations += len(candidates) * len(possible_words)
+            profile.phase("scoring", len(guesses), len(ranked))
 
-        # Filter to only include words that are in our word list
-        available_words = [
-            (word, score) for word, score in starting_words if word in self.words
+        follow_ups = [word for word, _ in ranked[:_HARD_MODE_FOLLOW_UPS]]
+        follow_ups += self._splitting_probes(possible_words, guesses, _HARD_MODE_FOLLOW_UPS)
+        follow_ups = list(dict.fromkeys(follow_ups))
+        memo: Dict[Tuple[str, int], float] = {}
+        gather = self._column_getter(possible_words)
+        lookahead = [
+            (word, self._two_turn_elimination(word, possible_words, guess_mask,
+                                              follow_ups, memo, profile, gather))
+            for word, _ in ranked[: max(_HARD_MODE_LOOKAHEAD, max_results)]
         ]
+        lookahead.sort(key=lambda x: x[1], reverse=True)
+        results = lookahead[:max_results]
+        if profile is not None:
+            profile.phase("lookahead", len(lookahead), len(results))
+        return results
 
-        # If we don't have any pre-computed words, fall back to frequency scoring
-        if not available_words:
-            word_scores = [
-                (word, self.calculate_word_probability(word))
-                for word in self.words[:50]
-            ]
-            word_scores.sort(key=lambda x: x[1], reverse=True)
-            available_words = word_scores
+    def _two_turn_elimination(
+        self,
+        guess: str,
+        possible_words: List[str],
+        guess_mask: int,
+        follow_ups: List[str],
+        memo: Dict[Tuple[str, int], float],
+        profile: SolveProfile | None = None,
+        gather=None,
+    ) -> float:
+        """
+        Expected answers eliminated by guess plus the best hard-mode follow-up.
+
+        For each feedback bucket, the follow-up must satisfy the hints of
+        that feedback as well; the smallest expected remaining bucket size it
+        achieves is weighted by the bucket's probability. Results are
+        memoized by bucket and allowed-guess mask. gather is the
+        _column_getter of possible_words, when the caller has built it.
+        """
+        total = len(possible_words)
+        if gather is None:
+            gather = self._column_getter(possible_words)
+        buckets: Dict[int, List[str]] = defaultdict(list)
+        for word, code in zip(possible_words, self._pattern_codes(guess, possible_words, gather)):
+            buckets[code].append(word)
+        follow_up_rows = self._rows_of(follow_ups)
+
+        solved = all_green_code(len(guess))
+        expected_remaining = 0.0
+        for code, bucket in buckets.items():
+            if code == solved:
+                continue
+            if len(bucket) <= 2:
+                # Guessing one of them leaves at most one answer
+                expected_remaining += len(bucket) / total
+                continue
+            allowed = guess_mask & self._hint_mask(guess, code)
+            key = (packed_text(bucket), allowed)
+            best = memo.get(key)
+            if best is None:
+                options = [
+                    word
+                    for word, row in zip(follow_ups, follow_up_rows)
+                    if allowed >> row & 1 and word not in bucket
+                ] + bucket
+                bucket_gather = self._column_getter(bucket)
+                best = len(bucket)
+                for option in options:
+                    codes = self._pattern_codes(option, bucket, bucket_gather)
+                    if profile is not None:
+                        profile.pattern_evaluations += len(bucket)
+                    best = min(best, len(bucket) - expected_elimination(codes, len(bucket)))
+                    if best <= 1:
+                        break  # every answer separated, nothing can do better
+                memo[key] = best
+            expected_remaining += len(bucket) * best / total
+        return total - expected_remaining
+
+    def _rank_lookahead(
+        self,
+        possible_words: List[str],
+        depth: int,
+        max_results: int,
+        exhaustive: bool | None = None,
+        workers: int | None = None,
+        profile: SolveProfile | None = None,
+        probes: bool = False,
+        objective: str = "elimination",
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank guesses by the expected number of guesses needed to solve.
+
+        The best max(max_results, _LOOKAHEAD_WIDTH) guesses by the one-step
+        objective are shortlisted as in rank_candidates, then each is scored
+        by searching depth levels of play (see _guess_cost). Below the
+        shortlist only the _LOOKAHEAD_WIDTH most promising guesses of each
+        state are expanded, drawn from the state's own candidates and the
+        shortlist. Subproblems are memoized on their candidate set, since
+        the same bucket is reached through many guesses.
+        """
+        shortlist = self.rank_candidates(
+            possible_words, max(max_results, _LOOKAHEAD_WIDTH), True, exhaustive, workers,
+            profile, probes, objective,
+        )
+        follow_ups = [word for word, _ in shortlist]
+        memo: Dict[Tuple[str, int], float] = {}
+        results = [
+            (word, self._guess_cost(word, possible_words, depth, follow_ups, memo, profile))
+            for word in follow_ups
+        ]
+        results.sort(key=lambda x: x[1])
+        if profile is not None:
+            profile.phase("lookahead", len(follow_ups), len(results))
+        return results[:max_results]
+
+    def _guess_cost(
+        self,
+        guess: str,
+        possible_words: List[str],
+        depth: int,
+        follow_ups: List[str],
+        memo: Dict[Tuple[str, int], float],
+        profile: SolveProfile | None = None,
+        bound: float = math.inf,
+    ) -> float:
+        """
+        Expected number of guesses to solve when guess is played next.
+
+        Each feedback bucket left unsolved adds the expected guesses of its
+        own state searched depth - 1 levels deep (see _expected_guesses),
+        weighted by its probability. Buckets start at their lower bound
+        (one answer may be guessed next, every other one needs at least
+        two more guesses) and are searched largest first; once the total
+        reaches bound, math.inf is returned.
+        """
+        total = len(possible_words)
+        buckets: Dict[int, List[str]] = defaultdict(list)
+        for word, code in zip(possible_words, self.get_pattern_codes(guess, possible_words)):
+            buckets[code].append(word)
+        if profile is not None:
+            profile.pattern_evaluations += total
+
+        solved = all_green_code(len(guess))
+        unsolved = sorted(
+            (bucket for code, bucket in buckets.items() if code != solved), key=len, reverse=True
+        )
+        cost = 1 + sum(2 * len(bucket) - 1 for bucket in unsolved) / total
+        for bucket in unsolved:
+            if cost >= bound:
+                return math.inf
+            size = len(bucket)
+            if size <= 2:
+                continue  # the lower bound is exact
+            expected = self._expected_guesses(bucket, depth - 1, follow_ups, memo, profile)
+            cost += (size * expected - (2 * size - 1)) / total
+        return cost
+
+    def _expected_guesses(
+        self,
+        possible_words: List[str],
+        depth: int,
+        follow_ups: List[str],
+        memo: Dict[Tuple[str, int], float],
+        profile: SolveProfile | None = None,
+    ) -> float:
+        """
+        Expected number of guesses to solve a state, searched depth levels deep.
+
+        At depth 0 the search stops and n candidates are estimated to need
+        1 + (n - 1) / n * (1 + log(n - 1) / log(_LEAF_BRANCHING)) guesses,
+        which is exact for one and two candidates.
+        """
+        total = len(possible_words)
+        if total <= 2 or depth == 0:
+            if total <= 2:
+                return (2 * total - 1) / total
+            return 1 + (total - 1) / total * (
+                1 + math.log(total - 1) / math.log(_LEAF_BRANCHING)
+            )
 
-        return available_words[:max_results]
+        key = (packed_text(possible_words), depth)
+        best = memo.get(key)
+        if best is not None:
+            return best
+        guesses = possible_words
+        if len(guesses) > 1000:
+            guesses = self._top_by_frequency(guesses, 30)
+        members = set(possible_words)
+        guesses = guesses + [word for word in follow_ups if word not in members]
+        best = math.inf
+        for word, _ in self._top_k_scores(guesses, possible_words, _LOOKAHEAD_WIDTH,
+                                          profile=profile):
+            best = min(best, self._guess_cost(word, possible_words, depth, follow_ups, memo,
+                                              profile, best))
+        memo[key] = best
+        return best
+
+    def _splitting_probes(
+        self, possible_words: List[str], probe_words: List[str], limit: int
+    ) -> List[str]:
+        """
+        Pick the probe guesses most likely to split the possible answers.
+
+        The best limit probes by _split_rating are kept for exact scoring.
+        """
+        rated = sorted(probe_words, key=self._split_rating(possible_words), reverse=True)
+        return rated[:limit]
+
+    def _split_rating(self, possible_words: List[str]):
+        """
+        Return a cheap rating of how well a guess splits the possible answers.
+
+        A letter splits the answers best when about half of them contain it,
+        so a guess is rated by how evenly its distinct letters divide them.
+        """
+        total = len(possible_words)
+        containing = Counter(letter for word in possible_words for letter in set(word))
+        split = {letter: min(count, total - count) for letter, count in containing.items()}
+        return lambda word: sum(split.get(letter, 0) for letter in set(word))
+
+    def _top_k_scores(
+        self,
+        guesses: List[str],
+        possible_words: List[str],
+        k: int,
+        objective: str = "elimination",
+        profile: SolveProfile | None = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Find the k best guesses without scoring every guess in full.
+
+        Each guess has a cost that only grows as answers are added to its
+        feedback buckets: the sum of squared bucket sizes for "elimination"
+        (score = n - cost / n) and the largest bucket for "minimax"
+        (score = n - cost). Guesses are visited in _split_rating order and
+        the k cheapest so far are kept in a heap. A guess is abandoned as
+        soon as a lower bound on its cost rules it out:
+
+        - with a pattern table, the cost of the buckets filled by the first
+          slices of its row;
+        - otherwise, the cost of its projection buckets (see
+          projection_keys), which refine its feedback buckets and so never
+          cost more, before any pattern is evaluated.
+
+        Ties are broken by position in guesses, so the result is exactly the
+        first k of a full stable sort.
+        """
+        if k <= 0:
+            return []
+        total = len(possible_words)
+        if total <= 1:
+            return [(word, 0.0) for word in guesses[:k]]
+        if objective == "minimax":
+            cost_of = max
+            to_score = lambda cost: float(total - cost)
+        else:
+            cost_of = lambda counts: sum(count * count for count in counts)
+            to_score = lambda cost: total - cost / total
+
+        chunks = None
+        if self.pattern_table is not None:
+            answer_indices = (
+                range(total)
+                if possible_words is self.answers
+                else self._indices_of(possible_words, self._answer_index)
+            )
+            if answer_indices is not None:
+                step = -(-total // _TOP_K_CHUNKS)
+                chunks = [
+                    (itemgetter(*answer_indices[i : i + step]), min(step, total - i))
+                    for i in range(0, total, step)
+                ]
+
+        rows = self._rows_of(guesses) if chunks is not None else None
+        rating = self._split_rating(possible_words)
+        order = sorted(range(len(guesses)), key=lambda i: rating(guesses[i]), reverse=True)
+        heap: List[Tuple[int, int]] = []  # (-cost, -index) of the k best so far
+        evaluations = pruned = 0
+        for index in order:
+            guess = guesses[index]
+            full = len(heap) >= k
+            worst = (-heap[0][0], -heap[0][1]) if full else None
+            counts: Counter = Counter()
+            if rows is not None and rows[index] is not None:
+                row = self.pattern_table.row(rows[index])
+                ruled_out = False
+                for gather, size in chunks:
+                    part = gather(row)
+                    counts.update(part if size > 1 else (part,))
+                    evaluations += size
+                    if full and (cost_of(counts.values()), index) > worst:
+                        ruled_out = True
+                        break
+                if ruled_out:
+                    pruned += 1
+                    continue
+            else:
+                projections = Counter(projection_keys(guess, possible_words))
+                if full and (cost_of(projections.values()), index) > worst:
+                    pruned += 1
+                    continue
+                for key, count in projections.items():
+                    counts[get_pattern_code(guess, key)] += count
+                evaluations += total
+            cost = cost_of(counts.values())
+            if len(heap) < k:
+                heapq.heappush(heap, (-cost, -index))
+            elif (cost, index) < worst:
+                heapq.heapreplace(heap, (-cost, -index))
+
+        if profile is not None:
+            profile.pattern_evaluations += evaluations
+            profile.pruned_guesses += pruned
+        best = sorted((-cost, -index) for cost, index in heap)
+        return [(guesses[index], to_score(cost)) for cost, index in best]
 
     def get_best_guess(
         self,
@@ -378,14 +1495,31 @@ class WordleSolver:
         correct_letters: List[str] | None = None,
         incorrect_letters: List[str] | None = None,
         wrong_positions: Dict[str, Set[int]] | None = None,
+        feedback: FeedbackConstraints | List[Tuple[str, str]] | None = None,
+        hard_mode: bool = False,
     ) -> str | None:
         """Get the single best guess based on current constraints."""
+        if (
+            self.strategy_tree is not None
+            and not hard_mode
+            and not correct_positions
+            and not correct_letters
+            and not incorrect_letters
+            and not wrong_positions
+            and not isinstance(feedback, FeedbackConstraints)
+        ):
+            node = self.strategy_tree.lookup(feedback or [])
+            if node is not None:
+                return node[0]
+
         results = self.solve(
             correct_positions,
             correct_letters,
             incorrect_letters,
             wrong_positions,
             max_results=1,
+            feedback=feedback,
+            hard_mode=hard_mode,
         )
         return results[0][0] if results else None
 
@@ -393,7 +1527,8 @@ class WordleSolver:
         """Get statistics about the loaded word list."""
         return {
             "total_words": len(self.words),
-            "unique_letters": len(set("".join(self.words))),
+            "total_answers": len(self.answers),
+            "unique_letters": len(set(packed_text(self.words))),
             "avg_word_length": (
                 sum(len(word) for word in self.words) / len(self.words)
                 if self.words